@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.idle_slot
+    ********************
+
+    Benchmark of the time a slot of the execution engine sits idle between
+    two jobs, i.e., from the exit of a job to the start of the next one
+
+    A stub executable (a shell script sleeping for a fixed duration) is run
+    num_jobs times on num_procs slots through task.pipeline.run(), as the
+    simulate stage of the execute phase (task.trace.submit() and
+    task.trace.report()), so that the ideal wall time is
+    num_jobs / num_procs * duration. The difference with the measured wall
+    time, spread over the jobs of a slot, is the idle time per slot refill
+    (including the fork/exec of the stub itself).
+
+    For reference, the same jobs can be run with a polling queue (checking
+    the jobs and sleeping in between, as the engine did before asyncio)::
+
+        python benchmarks/idle_slot.py -n 200 -nprocs 4 -d 0.02
+        python benchmarks/idle_slot.py -n 200 -nprocs 4 -d 0.02 -poll 0.05
+"""
+import os
+import sys
+
+# Run from a source checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+__author__ = "Damar Wicaksono"
+
+
+def get_args():
+    """Get the command line arguments of the benchmark
+
+    :return: the parsed arguments, with the attributes num_jobs, num_procs,
+        duration, and poll
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure the idle time of a slot between two jobs"
+    )
+
+    parser.add_argument(
+        "-n", "--num_jobs",
+        type=int,
+        help="The number of stub jobs",
+        default=200
+    )
+
+    parser.add_argument(
+        "-nprocs", "--num_processors",
+        type=int,
+        dest="num_procs",
+        help="The number of slots (simultaneous jobs)",
+        default=4
+    )
+
+    parser.add_argument(
+        "-d", "--duration",
+        type=float,
+        help="The duration of a stub job, in seconds",
+        default=0.02
+    )
+
+    parser.add_argument(
+        "-poll", "--poll_interval",
+        type=float,
+        dest="poll",
+        help="Run the jobs with a polling queue with the given interval, in "
+             "seconds, instead of the execution engine",
+        default=None
+    )
+
+    return parser.parse_args()
+
+
+def make_stub(dirname: str, duration: float) -> str:
+    """Write the stub executable, it ignores its arguments
+
+    :param dirname: the directory of the stub
+    :param duration: the duration of a stub job, in seconds
+    :return: the fullname of the stub
+    """
+    stub_fullname = os.path.join(dirname, "stub_trace")
+    with open(stub_fullname, "wt") as stub_file:
+        stub_file.write("#!/bin/sh\nsleep {}\n" .format(duration))
+    os.chmod(stub_fullname, 0o755)
+
+    return stub_fullname
+
+
+def run_stage(commands: list, log_files: list, run_dirnames: list,
+              info_filename: str, num_procs: int) -> dict:
+    """Make the pipeline stage running the stub jobs like TRACE jobs
+
+    :param commands: the list of shell commands
+    :param log_files: the list of log fullnames
+    :param run_dirnames: the list of working directories
+    :param info_filename: the info file the outcome of the jobs is appended to
+    :param num_procs: the maximum number of simultaneous jobs
+    :return: the stage specification, see task.pipeline.run()
+    """
+    from trace_simexp.task import trace
+
+    return {
+        "name": "simulate",
+        "num_procs": num_procs,
+        "start": lambda i: trace.submit(commands[i], log_files[i],
+                                        run_dirnames[i]),
+        "finish": lambda i, returncode: trace.report(
+            commands[i], returncode, log_files[i], info_filename),
+        "timeout": trace.TIMEOUT
+    }
+
+
+def run_polling(commands: list, log_files: list, run_dirnames: list,
+                num_procs: int, interval: float):
+    """Run the jobs from a queue polled every interval seconds
+
+    :param commands: the list of shell commands
+    :param log_files: the list of log fullnames
+    :param run_dirnames: the list of working directories
+    :param num_procs: the maximum number of simultaneous jobs
+    :param interval: the time between two checks of the jobs, in seconds
+    """
+    import subprocess
+    import time
+
+    pending = list(range(len(commands)))
+    running = dict()
+
+    while pending or running:
+        while pending and len(running) < num_procs:
+            i = pending.pop(0)
+            log_file = open(log_files[i], "wt")
+            running[i] = (subprocess.Popen(commands[i], stdout=log_file,
+                                           cwd=run_dirnames[i]),
+                          log_file)
+
+        finished = [i for i in running if running[i][0].poll() is not None]
+        for i in finished:
+            running.pop(i)[1].close()
+
+        if not finished:
+            time.sleep(interval)
+
+
+def main():
+    """Run the benchmark and print the idle time per slot refill"""
+    import tempfile
+    import time
+
+    from trace_simexp.task import pipeline
+    from trace_simexp.task import trace
+
+    args = get_args()
+
+    with tempfile.TemporaryDirectory() as work_dirname:
+        stub_fullname = make_stub(work_dirname, args.duration)
+        commands = trace.make_commands(
+            stub_fullname, ["run_{}" .format(i) for i in range(args.num_jobs)])
+        log_files = [os.path.join(work_dirname, "{}.log" .format(i))
+                     for i in range(args.num_jobs)]
+        run_dirnames = [work_dirname] * args.num_jobs
+        info_filename = os.path.join(work_dirname, "exec.info")
+
+        start = time.perf_counter()
+        if args.poll is None:
+            engine = "asyncio engine"
+            pipeline.run(args.num_jobs, [run_stage(
+                commands, log_files, run_dirnames, info_filename,
+                args.num_procs)])
+        else:
+            engine = "polling queue ({} s)" .format(args.poll)
+            run_polling(commands, log_files, run_dirnames, args.num_procs,
+                        args.poll)
+        wall_time = time.perf_counter() - start
+
+    ideal_time = args.num_jobs / args.num_procs * args.duration
+    idle_time = (wall_time - ideal_time) * args.num_procs / args.num_jobs
+
+    print("{} jobs of {} s on {} slots, {}"
+          .format(args.num_jobs, args.duration, args.num_procs, engine))
+    print("Wall time        : {:.3f} s (ideal {:.3f} s)"
+          .format(wall_time, ideal_time))
+    print("Idle per refill  : {:.1f} ms" .format(idle_time * 1000))
+
+
+if __name__ == "__main__":
+    main()
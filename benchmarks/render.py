@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.render
+    *****************
+
+    Benchmark of the rendering of the perturbed TRACE input decks, from the
+    compiled template and the perturbed values of the samples to the text of
+    each deck
+
+    The template compiled by tracin.create_template() (literal chunks and key
+    slots, see tracin_util.render) is compared with the baseline rendering by
+    string.Template, substituting a mapping of the keys for every sample as
+    the prepro phase did before. The perturbed values are computed once
+    (tracin_util.plan) and shared by both, so that only the rendering is
+    timed. The rows of the design matrix are cycled up to num_decks decks and
+    the rendered decks of both are checked to be identical::
+
+        python benchmarks/render.py -n 2000
+"""
+import os
+import sys
+
+# Run from a source checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+__author__ = "Damar Wicaksono"
+
+# The default input files, those of the FEBA test 216 in the source checkout
+SIMULATION_DIRNAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "simulation")
+
+
+def get_args():
+    """Get the command line arguments of the benchmark
+
+    :return: the parsed arguments, with the attributes base_tracin,
+        params_list, design_matrix, num_decks, and repeat
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure the rendering time of the perturbed input decks"
+    )
+
+    parser.add_argument(
+        "-tracin", "--base_tracin",
+        type=argparse.FileType("rt"),
+        help="The base TRACE input deck",
+        default=os.path.join(SIMULATION_DIRNAME, "febaTrans216.inp")
+    )
+
+    parser.add_argument(
+        "-parlist", "--params_list",
+        type=argparse.FileType("rt"),
+        help="The list of parameters to be perturbed",
+        default=os.path.join(SIMULATION_DIRNAME, "feba216Vars27.inp")
+    )
+
+    parser.add_argument(
+        "-dm", "--design_matrix",
+        type=str,
+        help="The design matrix (csv or npy), its rows are cycled",
+        default=os.path.join(SIMULATION_DIRNAME, "lhs_200_27.csv")
+    )
+
+    parser.add_argument(
+        "-n", "--num_decks",
+        type=int,
+        help="The number of decks to render",
+        default=2000
+    )
+
+    parser.add_argument(
+        "-r", "--repeat",
+        type=int,
+        help="The number of timed repetitions, the best one is reported",
+        default=3
+    )
+
+    return parser.parse_args()
+
+
+def make_baseline(template: dict):
+    """Make the string.Template of a compiled template
+
+    The literal "$" of the chunks are escaped again and the keys are put back
+    as "${key}" placeholders, so that both render the same text.
+
+    :param template: (dict) the compiled template, see tracin_util.render
+    :return: (string.Template) the baseline template
+    """
+    import string
+
+    parts = [template["chunks"][0].replace("$", "$$")]
+    for key, chunk in zip(template["keys"], template["chunks"][1:]):
+        parts.append("${{{}}}" .format(key))
+        parts.append(chunk.replace("$", "$$"))
+
+    return string.Template("".join(parts))
+
+
+def render_baseline(baseline, keys: list, values: list) -> list:
+    """Render the decks by substituting a mapping of the keys for each sample
+
+    :param baseline: (string.Template) the baseline template
+    :param keys: (list, str) the template keys, in the order of the values
+    :param values: (list of list, str) the perturbed values, one row per deck
+    :return: (list, str) the rendered decks
+    """
+    return [baseline.substitute(dict(zip(keys, row))) for row in values]
+
+
+def render_compiled(template: dict, keys: list, values: list) -> list:
+    """Render the decks by filling the slots of the compiled template
+
+    :param template: (dict) the compiled template, see tracin_util.render
+    :param keys: (list, str) the template keys, in the order of the values
+    :param values: (list of list, str) the perturbed values, one row per deck
+    :return: (list, str) the rendered decks
+    """
+    from trace_simexp.tracin_util import render
+
+    slots = render.get_slots(template, keys)
+    parts = render.create_buffer(template)
+
+    return [render.fill(template, slots, row, parts) for row in values]
+
+
+def time_best(function, repeat: int, *args) -> tuple:
+    """Time a function over several repetitions
+
+    :param function: the function to time
+    :param repeat: the number of repetitions
+    :param args: the arguments of the function
+    :return: the best wall time, in seconds, and the result of the function
+    """
+    import time
+
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time, result
+
+
+def main():
+    """Run the benchmark and print the rendering time of both templates"""
+    import numpy as np
+
+    from trace_simexp import prepro
+    from trace_simexp import tracin
+    from trace_simexp import design_matrix
+    from trace_simexp.cmdln_args import common
+    from trace_simexp.tracin_util import plan
+
+    args = get_args()
+
+    _, tracin_base_contents = common.get_fullname_and_contents(
+        args.base_tracin)
+    _, params_list_contents = common.get_fullname_and_contents(
+        args.params_list)
+    dm_contents = design_matrix.read(os.path.abspath(args.design_matrix))
+
+    params_dict = prepro.read_params(params_list_contents,
+                                     tracin_base_contents)
+    template = tracin.create_template(params_dict, tracin_base_contents)
+    baseline = make_baseline(template)
+
+    # The perturbed values of the decks, shared by both renderings
+    perturb_plan = plan.create(params_dict)
+    keys = plan.get_keys(perturb_plan)
+    rows = np.resize(np.arange(dm_contents.shape[0]), args.num_decks)
+    values = plan.evaluate(perturb_plan,
+                           np.asarray(dm_contents)[rows]).tolist()
+
+    baseline_time, baseline_decks = time_best(
+        render_baseline, args.repeat, baseline, keys, values)
+    compiled_time, compiled_decks = time_best(
+        render_compiled, args.repeat, template, keys, values)
+
+    if baseline_decks != compiled_decks:
+        raise ValueError("The rendered decks differ from the baseline!")
+
+    print("{} decks of {} keys, {} samples of {}"
+          .format(args.num_decks, len(keys), dm_contents.shape[0],
+                  os.path.basename(args.design_matrix)))
+    print("string.Template  : {:.3f} s" .format(baseline_time))
+    print("Compiled template: {:.3f} s (x{:.1f})"
+          .format(compiled_time, baseline_time / compiled_time))
+    print("Rendered decks identical")
+
+
+if __name__ == "__main__":
+    main()
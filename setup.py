@@ -34,9 +34,13 @@ setup(
             "Development Status :: 3 - Alpha",
             "Intended Audience :: Developer",
             "License :: OSI Approved :: MIT License",
-            "Programming Language :: Python :: 3.5"
+            "Programming Language :: Python :: 3.7"
       ],
 
+      # Asynchronous generators are used in the execution engine and
+      # scipy.stats.qmc (SciPy v1.7) requires Python v3.7
+      python_requires=">=3.7",
+
       # Manually entered package name
       packages=["trace_simexp"],
 
@@ -45,11 +49,17 @@ setup(
         "console_scripts": [
               "trace_simexp=trace_simexp.cmdln_interface:main",
               "trace_simexp_prepro=trace_simexp.cmdln_interface:cli_prepro",
+              "trace_simexp_extend=trace_simexp.cmdln_interface:cli_extend",
               "trace_simexp_execute=trace_simexp.cmdln_interface:cli_execute",
               "trace_simexp_postpro=trace_simexp.cmdln_interface:cli_postpro",
-              "trace_simexp_reset=trace_simexp.cmdln_interface:cli_reset"
+              "trace_simexp_analyze=trace_simexp.cmdln_interface:cli_analyze",
+              "trace_simexp_reset=trace_simexp.cmdln_interface:cli_reset",
+              "trace_simexp_dm2npy=trace_simexp.cmdln_interface:cli_dm2npy"
         ]
       },
 
-      zip_safe=False, install_requires=['numpy', 'scipy']
+      zip_safe=False, install_requires=['numpy', 'scipy>=1.7'],
+
+      # The result store is an HDF5 file if h5py is available
+      extras_require={'hdf5': ['h5py']}
 )
@@ -15,9 +15,14 @@ from . import prepro
 from . import execute
 from . import postpro
 from . import reset
+from . import extend
+from . import analyze
 from . import cmdln_args
 from . import info_file
 from . import util
+from . import design_matrix
+from . import result_store
+from . import qoi
 from . import template
 from . import tracin_util
 from ._version import __version__
@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.analyze
+    ********************
+
+    Main module to compute the uncertainty and sensitivity statistics of the
+    results of a simulation campaign, over all samples at once
+
+    The time series in the result store are analyzed on a common time grid:
+    the mean, the standard deviation, and the quantiles over the samples, as
+    well as the sensitivity indices of each output at each time against the
+    parameters of the design matrix. The quantities of interest (QoI), if
+    any, are analyzed likewise.
+
+    The sensitivity indices are the Pearson and the Spearman (rank)
+    correlation coefficients, and the first-order (main effect) Sobol'
+    indices estimated from the given samples by binning each parameter. The
+    latter needs no dedicated design (e.g., Saltelli's), the samples of any
+    space-filling design matrix will do. If the design matrix was generated
+    as Morris trajectories (see design_matrix.morris_trajectories()), the
+    statistics of the elementary effects of each parameter are computed as
+    well.
+"""
+import numpy as np
+
+__author__ = "Damar Wicaksono"
+
+
+def get_input() -> dict:
+    """Get the command line arguments, read the info files, and construct dict
+
+    :return: All the inputs required for the analysis in a dictionary
+
+    +-------------------+-----------------------------------------------------+
+    | Key               | Value                                               |
+    +===================+=====================================================+
+    | base_dir          | (str) The base directory of the simulation campaign |
+    +-------------------+-----------------------------------------------------+
+    | case_name         | (str) The name of the base TRACE input deck         |
+    +-------------------+-----------------------------------------------------+
+    | params_list_name  | (str) The name of the list of parameters file       |
+    +-------------------+-----------------------------------------------------+
+    | dm_name           | (str) The name of the design matrix file            |
+    +-------------------+-----------------------------------------------------+
+    | xtv_vars_name     | (str) The name of the list of TRACE graphics        |
+    |                   | variable file                                       |
+    +-------------------+-----------------------------------------------------+
+    | store_fullname    | (str) The fullname of the result store              |
+    +-------------------+-----------------------------------------------------+
+    | qoi_fullname      | (str or None) The fullname of the QoI matrix        |
+    +-------------------+-----------------------------------------------------+
+    | dm_fullname       | (str) The fullname of the design matrix             |
+    +-------------------+-----------------------------------------------------+
+    | dm_contents       | (array) The design matrix, samples x parameters     |
+    +-------------------+-----------------------------------------------------+
+    | params_dict       | (list, dict) The list of perturbed parameters       |
+    +-------------------+-----------------------------------------------------+
+    | param_names       | (list, str) The name of each parameter, see         |
+    |                   | make_param_names()                                  |
+    +-------------------+-----------------------------------------------------+
+    | quantiles         | (list, float) The probabilities of the quantiles    |
+    +-------------------+-----------------------------------------------------+
+    | num_bins          | (int or None) The number of bins of the first-order |
+    |                   | indices, None for the square root of the samples    |
+    +-------------------+-----------------------------------------------------+
+    | doe_method        | (str or None) The method the design matrix was      |
+    |                   | generated with, None if it was not generated        |
+    +-------------------+-----------------------------------------------------+
+    """
+    import os
+
+    from . import cmdln_args
+    from . import design_matrix
+    from . import prepro
+    from . import result_store
+    from .info_file import execute, postpro
+    from .info_file import prepro as prepro_info
+
+    # Read the command line arguments
+    postpro_info_fullname, postpro_info_contents, \
+        quantiles, num_bins = cmdln_args.analyze.get()
+
+    # Read the info file of each phase, back to the pre-processing phase
+    exec_info_fullname, base_dir, case_name, params_list_name, \
+        dm_name, xtv_vars_name, _ = postpro.read(postpro_info_contents)
+    store_fullname, qoi_fullname = \
+        postpro.read_outputs(postpro_info_contents)
+    with open(exec_info_fullname, "rt") as exec_info_file:
+        prepro_info_fullname = execute.read(
+            exec_info_file.read().splitlines())[0]
+    with open(prepro_info_fullname, "rt") as prepro_info_file:
+        tracin_base_fullname, params_list_fullname, dm_fullname, _ = \
+            prepro_info.read_fullnames(prepro_info_file.read().splitlines())
+
+    inputs = {
+        "base_dir": base_dir,
+        "case_name": case_name,
+        "params_list_name": params_list_name,
+        "dm_name": dm_name,
+        "xtv_vars_name": xtv_vars_name
+    }
+    if store_fullname is None:
+        store_fullname = result_store.make_filename(inputs)
+
+    # An extended (or generated) design matrix is in the design matrix dir.
+    campaign_dm_fullname = os.path.join(
+        base_dir, case_name, "{}-{}" .format(params_list_name, dm_name),
+        "{}.npy" .format(dm_name))
+    if os.path.isfile(campaign_dm_fullname):
+        dm_fullname = campaign_dm_fullname
+
+    # Read the list of parameters, with the nominal values from the deck
+    with open(tracin_base_fullname, "rt") as tracin_file:
+        tracin_base_contents = tracin_file.read().splitlines()
+    with open(params_list_fullname, "rt") as params_list_file:
+        params_list_contents = params_list_file.read().splitlines()
+    params_dict = prepro.read_params(params_list_contents,
+                                     tracin_base_contents)
+
+    dm_contents = design_matrix.read(dm_fullname)
+    doe_spec = design_matrix.read_spec(dm_fullname)
+    if dm_contents.shape[1] != len(params_dict):
+        raise ValueError("The design matrix {} has {} columns for {} "
+                         "parameters" .format(dm_fullname,
+                                              dm_contents.shape[1],
+                                              len(params_dict)))
+
+    inputs.update({
+        "store_fullname": store_fullname,
+        "qoi_fullname": qoi_fullname,
+        "dm_fullname": dm_fullname,
+        "dm_contents": dm_contents,
+        "params_dict": params_dict,
+        "param_names": make_param_names(params_dict),
+        "quantiles": quantiles,
+        "num_bins": num_bins,
+        "doe_method": doe_spec["method"] if doe_spec is not None else None
+    })
+
+    return inputs
+
+
+def make_param_names(params_dict: list) -> list:
+    """Create a short name for each parameter, in the design matrix order
+
+    :param params_dict: (list, dict) the list of perturbed parameters
+    :return: (list, str) the names, "<enum>-<data_type>-<var_num>" followed
+        by "-<var_name>" if the parameter has one
+    """
+    names = list()
+
+    for param in params_dict:
+        name = "{}-{}-{}" .format(param["enum"], param["data_type"],
+                                  param["var_num"])
+        if param.get("var_name"):
+            name = "{}-{}" .format(name, param["var_name"])
+        names.append(name)
+
+    return names
+
+
+def make_filename(inputs: dict, suffix: str, ext: str) -> str:
+    """Create the fullname of an output of the analysis
+
+    The outputs are located in the design matrix directory, next to the
+    result store, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/<case_name>-<xtv_vars_name>-
+    <suffix>.<ext>"
+
+    :param inputs: the inputs of the analysis in dictionary
+    :param suffix: the suffix of the output, e.g., "analysis"
+    :param ext: the extension of the output
+    :return: the fullname of the output
+    """
+    import os
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "{}-{}-{}.{}" .format(inputs["case_name"],
+                                              inputs["xtv_vars_name"],
+                                              suffix, ext))
+
+
+def get_rows(dm_contents: np.ndarray, samples) -> np.ndarray:
+    """Get the rows of the design matrix of the samples
+
+    :param dm_contents: (array) the design matrix
+    :param samples: (array, int) the samples, starting from 1
+    :return: (array) the rows of the samples, samples x parameters
+    """
+    samples = np.asarray(samples, dtype=np.int64)
+
+    if np.any(samples < 1) or np.any(samples > dm_contents.shape[0]):
+        raise ValueError("The samples are not in the design matrix "
+                         "(1 to {})" .format(dm_contents.shape[0]))
+
+    return np.asarray(dm_contents[samples - 1, :], dtype=np.float64)
+
+
+def get_common_time(store: dict) -> np.ndarray:
+    """Get the time grid common to all the samples of the result store
+
+    The grid is the time of the sample with the most time points, within
+    the time range simulated by all the samples.
+
+    :param store: the result store in a dictionary, see result_store.collect()
+    :return: (array) the common time grid
+    """
+    num_times = store["num_times"]
+    if len(num_times) == 0 or np.any(num_times == 0):
+        raise ValueError("A sample of the result store has no time point")
+
+    rows = np.arange(len(num_times))
+    start = np.max(store["time"][:, 0])
+    end = np.min(store["time"][rows, num_times - 1])
+
+    time = store["time"][np.argmax(num_times), :num_times.max()]
+    time = time[(time >= start) & (time <= end)]
+    if time.size == 0:
+        raise ValueError("The samples of the result store have no time in "
+                         "common")
+
+    return time
+
+
+def interpolate(store: dict, time: np.ndarray) -> np.ndarray:
+    """Interpolate the values of all the samples on the common time grid
+
+    :param store: the result store in a dictionary, see result_store.collect()
+    :param time: (array) the common time grid
+    :return: (array) the values, samples x variables x time
+    """
+    num_samples, num_vars, _ = store["values"].shape
+    values = np.empty((num_samples, num_vars, len(time)))
+
+    for i, num in enumerate(store["num_times"]):
+        sample_time = store["time"][i, :num]
+        if num == len(time) and np.array_equal(sample_time, time):
+            # Already on the common time grid
+            values[i] = store["values"][i, :, :num]
+            continue
+        for j in range(num_vars):
+            values[i, j] = np.interp(time, sample_time,
+                                     store["values"][i, j, :num])
+
+    return values
+
+
+def get_bands(outputs: np.ndarray, quantiles: list) -> dict:
+    """Compute the statistics of the outputs over the samples
+
+    The samples without value (NaN) are left out.
+
+    :param outputs: (array) the outputs, samples x ...
+    :param quantiles: (list, float) the probabilities of the quantiles
+    :return: the statistics in a dictionary with keys "count", "mean",
+        "std", and "quantiles" (quantiles x ...)
+    """
+    import warnings
+
+    with warnings.catch_warnings():
+        # An output without any value is NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return {
+            "count": np.count_nonzero(~np.isnan(outputs), axis=0),
+            "mean": np.nanmean(outputs, axis=0),
+            "std": np.nanstd(outputs, axis=0, ddof=1),
+            "quantiles": np.nanquantile(outputs, quantiles, axis=0)
+        }
+
+
+def correlate(inputs: np.ndarray, outputs: np.ndarray) -> np.ndarray:
+    """Compute the Pearson correlation coefficients between inputs and outputs
+
+    :param inputs: (array) the inputs, samples x parameters, without NaN
+    :param outputs: (array) the outputs, samples x outputs, without NaN
+    :return: (array) the coefficients, parameters x outputs. NaN for a
+        constant input or output.
+    """
+    inputs = inputs - inputs.mean(axis=0)
+    outputs = outputs - outputs.mean(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (inputs.T @ outputs) / np.outer(
+            np.sqrt(np.sum(inputs**2, axis=0)),
+            np.sqrt(np.sum(outputs**2, axis=0)))
+
+
+def first_order(inputs: np.ndarray, outputs: np.ndarray,
+                num_bins: int) -> np.ndarray:
+    """Estimate the first-order Sobol' indices from the given samples
+
+    For each parameter, the samples are sorted by its value and split into
+    bins of (nearly) equal count. The index is the variance of the mean
+    output over the bins (the variance of the conditional expectation) over
+    the total variance of the output.
+
+    The estimate is biased and depends on the number of bins. The sampling
+    noise of the bin means adds about num_bins / num_samples to every index
+    (a non-influential parameter gets that much instead of 0), while too few
+    bins smooth the conditional expectation and underestimate the index of
+    a parameter with a non-monotonic effect. Increasing the number of
+    samples reduces both.
+
+    :param inputs: (array) the inputs, samples x parameters, without NaN
+    :param outputs: (array) the outputs, samples x outputs, without NaN
+    :param num_bins: the number of bins
+    :return: (array) the indices, parameters x outputs. NaN for a constant
+        output.
+    """
+    num_samples = inputs.shape[0]
+    num_bins = min(num_bins, num_samples)
+    starts = np.array([chunk[0] for chunk in
+                       np.array_split(np.arange(num_samples), num_bins)])
+    counts = np.diff(np.append(starts, num_samples))[:, np.newaxis]
+
+    centered = outputs - outputs.mean(axis=0)
+    total = np.sum(centered**2, axis=0)
+
+    indices = np.empty((inputs.shape[1], outputs.shape[1]))
+    for k in range(inputs.shape[1]):
+        order = np.argsort(inputs[:, k], kind="stable")
+        sums = np.add.reduceat(centered[order], starts, axis=0)
+        indices[k] = np.sum(sums**2 / counts, axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return indices / total
+
+
+def get_indices(inputs: np.ndarray, outputs: np.ndarray,
+                num_bins: int=None) -> dict:
+    """Compute the sensitivity indices of the outputs against the inputs
+
+    The outputs without NaN are computed all at once, the samples without
+    value (NaN) of the other outputs are left out output by output.
+
+    :param inputs: (array) the inputs, samples x parameters
+    :param outputs: (array) the outputs, samples x outputs
+    :param num_bins: the number of bins of the first-order indices, if None
+        the square root of the number of samples
+    :return: the indices in a dictionary with keys "pearson", "spearman",
+        and "first_order", each parameters x outputs
+    """
+    from scipy.stats import rankdata
+
+    def compute(x: np.ndarray, y: np.ndarray) -> list:
+        bins = num_bins
+        if bins is None:
+            bins = max(2, int(round(np.sqrt(x.shape[0]))))
+        return [correlate(x, y),
+                correlate(rankdata(x, axis=0), rankdata(y, axis=0)),
+                first_order(x, y, bins)]
+
+    keys = ["pearson", "spearman", "first_order"]
+    indices = {key: np.full((inputs.shape[1], outputs.shape[1]), np.nan)
+               for key in keys}
+
+    valid = ~np.isnan(outputs)
+    complete = valid.all(axis=0)
+    if np.any(complete):
+        for key, value in zip(keys, compute(inputs, outputs[:, complete])):
+            indices[key][:, complete] = value
+    for j in np.flatnonzero(~complete):
+        rows = valid[:, j]
+        if np.count_nonzero(rows) < 3:
+            continue
+        for key, value in zip(keys, compute(inputs[rows],
+                                            outputs[rows, j:j+1])):
+            indices[key][:, j] = value[:, 0]
+
+    return indices
+
+
+def elementary_effects(dm_contents: np.ndarray, samples,
+                       outputs: np.ndarray) -> dict:
+    """Compute the statistics of the Morris elementary effects
+
+    The design matrix consists of trajectories of dimension + 1 samples, each
+    moving a single parameter from a sample to the next one, see
+    design_matrix.morris_trajectories(). The elementary effect of the moved
+    parameter is the difference of the outputs of the two samples over the
+    move (in the unit hypercube). A move of which a sample has not been
+    analyzed (or an output has no value) is left out.
+
+    :param dm_contents: (array) the Morris design matrix
+    :param samples: (array, int) the analyzed samples, starting from 1
+    :param outputs: (array) the outputs of the samples, samples x outputs
+    :return: the statistics in a dictionary with keys "morris_mu" (the mean),
+        "morris_mu_star" (the mean of the absolute values), and
+        "morris_sigma" (the standard deviation) of the elementary effects,
+        each parameters x outputs. NaN for a parameter without (enough)
+        elementary effects.
+    """
+    import warnings
+
+    num_params = dm_contents.shape[1]
+    size = num_params + 1
+    rows = {sample: i for i, sample in
+            enumerate(np.asarray(samples, dtype=np.int64).tolist())}
+
+    # The moves between two analyzed samples of the same trajectory
+    moves = np.array([sample for sample in sorted(rows)
+                      if (sample - 1) % size != num_params and
+                      sample + 1 in rows], dtype=np.int64)
+
+    keys = ["morris_mu", "morris_mu_star", "morris_sigma"]
+    statistics = {key: np.full((num_params, outputs.shape[1]), np.nan)
+                  for key in keys}
+    if moves.size == 0:
+        return statistics
+
+    steps = get_rows(dm_contents, moves + 1) - get_rows(dm_contents, moves)
+    if np.any(np.count_nonzero(steps, axis=1) != 1):
+        raise ValueError("The design matrix does not consist of Morris "
+                         "trajectories, a move changes more than one "
+                         "parameter")
+    params = np.argmax(np.abs(steps), axis=1)
+    deltas = steps[np.arange(moves.size), params]
+
+    first = np.array([rows[sample] for sample in moves])
+    second = np.array([rows[sample + 1] for sample in moves])
+    effects = (outputs[second] - outputs[first]) / deltas[:, np.newaxis]
+
+    with warnings.catch_warnings():
+        # A parameter without any elementary effect is NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for k in range(num_params):
+            param_effects = effects[params == k]
+            statistics["morris_mu"][k] = np.nanmean(param_effects, axis=0)
+            statistics["morris_mu_star"][k] = np.nanmean(
+                np.abs(param_effects), axis=0)
+            statistics["morris_sigma"][k] = np.nanstd(param_effects, axis=0,
+                                                      ddof=1)
+
+    return statistics
+
+
+def analyze_store(inputs: dict) -> str:
+    """Compute the time-dependent statistics and sensitivity indices
+
+    The results are written in an npz file with the following arrays:
+    "time" (time), "xtv_vars" (variables), "param_names" (parameters),
+    "samples", "quantile_levels", "count", "mean" and "std" (variables x
+    time), "quantiles" (quantiles x variables x time), and "pearson",
+    "spearman", and "first_order" (parameters x variables x time). For a
+    Morris design, "morris_mu", "morris_mu_star", and "morris_sigma"
+    (parameters x variables x time) as well, see elementary_effects().
+
+    :param inputs: the inputs of the analysis in dictionary
+    :return: the fullname of the results
+    """
+    import os
+    from . import result_store
+
+    store = result_store.read(inputs["store_fullname"])
+    time = get_common_time(store)
+    values = interpolate(store, time)
+    num_samples, num_vars, num_times = values.shape
+
+    bands = get_bands(values, inputs["quantiles"])
+    indices = get_indices(get_rows(inputs["dm_contents"], store["samples"]),
+                          values.reshape(num_samples, num_vars * num_times),
+                          inputs["num_bins"])
+    if inputs["doe_method"] == "morris":
+        indices.update(elementary_effects(
+            inputs["dm_contents"], store["samples"],
+            values.reshape(num_samples, num_vars * num_times)))
+
+    results = {
+        "time": time,
+        "xtv_vars": store["xtv_vars"],
+        "param_names": np.array(inputs["param_names"], dtype=str),
+        "samples": store["samples"],
+        "quantile_levels": np.array(inputs["quantiles"])
+    }
+    results.update(bands)
+    for key, value in indices.items():
+        results[key] = value.reshape(-1, num_vars, num_times)
+
+    analysis_fullname = make_filename(inputs, "analysis", "npz")
+    tmp_fullname = "{}.{}.tmp" .format(analysis_fullname, os.getpid())
+    with open(tmp_fullname, "wb") as analysis_file:
+        np.savez(analysis_file, **results)
+    os.replace(tmp_fullname, analysis_fullname)
+
+    return analysis_fullname
+
+
+def analyze_qoi(inputs: dict) -> tuple:
+    """Compute the statistics and sensitivity indices of the QoIs
+
+    Two csv files are written next to the QoI matrix: the statistics of each
+    QoI ("<qoi matrix>-summary.csv") and the sensitivity indices of each QoI
+    against each parameter ("<qoi matrix>-sensitivity.csv"), including the
+    statistics of the elementary effects for a Morris design.
+
+    :param inputs: the inputs of the analysis in dictionary
+    :return: a tuple of the fullnames of the summary and the sensitivity
+    """
+    from . import qoi
+
+    samples, qoi_names, qois = qoi.read(inputs["qoi_fullname"])
+    bands = get_bands(qois, inputs["quantiles"])
+    indices = get_indices(get_rows(inputs["dm_contents"], samples), qois,
+                          inputs["num_bins"])
+    keys = ["pearson", "spearman", "first_order"]
+    if inputs["doe_method"] == "morris":
+        indices.update(elementary_effects(inputs["dm_contents"], samples,
+                                          qois))
+        keys += ["morris_mu", "morris_mu_star", "morris_sigma"]
+
+    base_fullname = inputs["qoi_fullname"].rsplit(".", 1)[0]
+    summary_fullname = "{}-summary.csv" .format(base_fullname)
+    with open(summary_fullname, "wt") as summary_file:
+        summary_file.writelines("{}\n" .format(",".join(
+            ["qoi", "count", "mean", "std"] +
+            ["q{:g}" .format(q) for q in inputs["quantiles"]])))
+        for j, name in enumerate(qoi_names):
+            summary_file.writelines("{}\n" .format(",".join(
+                [name, "{:d}" .format(bands["count"][j])] +
+                ["{:.10g}" .format(value) for value in
+                 [bands["mean"][j], bands["std"][j]] +
+                 bands["quantiles"][:, j].tolist()])))
+
+    sensitivity_fullname = "{}-sensitivity.csv" .format(base_fullname)
+    with open(sensitivity_fullname, "wt") as sensitivity_file:
+        sensitivity_file.writelines("{}\n" .format(",".join(
+            ["qoi", "parameter"] + keys)))
+        for j, name in enumerate(qoi_names):
+            for k, param_name in enumerate(inputs["param_names"]):
+                sensitivity_file.writelines("{}\n" .format(",".join(
+                    [name, param_name] +
+                    ["{:.6g}" .format(indices[key][k, j])
+                     for key in keys])))
+
+    return summary_fullname, sensitivity_fullname
@@ -10,5 +10,8 @@ from . import prepro
 from . import execute
 from . import postpro
 from . import reset
+from . import dm2npy
+from . import extend
+from . import analyze
 
 __author__ = "Damar Wicaksono"
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.cmdln_args.analyze
+    *******************************
+
+    Module to parse command line arguments used to analyze the results of a
+    simulation campaign
+"""
+from .._version import __version__
+
+__author__ = "Damar Wicaksono"
+
+
+def get() -> tuple:
+    """Get the command line arguments of the analysis
+
+    :return: tuple with the following values:
+        (str) the postpro info file, fullname
+        (list) the contents of the postpro info file
+        (list, float) the probabilities of the quantiles
+        (int or None) the number of bins of the first-order sensitivity
+        indices, None for the default
+    """
+    import argparse
+    from . import common
+
+    parser = argparse.ArgumentParser(
+        description="%(prog)s - Analyze: Compute the uncertainty and "
+                    "sensitivity statistics of the campaign results"
+    )
+
+    # The fullname of info_file from the post-processing phase
+    parser.add_argument(
+        "-postpro", "--postpro_info",
+        type=argparse.FileType("rt"),
+        help="The post-processing phase info file",
+        required=True
+    )
+
+    # The probabilities of the quantiles
+    parser.add_argument(
+        "-q", "--quantiles",
+        type=float,
+        nargs="+",
+        help="The probabilities of the quantiles, between 0 and 1",
+        required=False,
+        default=[0.05, 0.5, 0.95]
+    )
+
+    # The number of bins
+    parser.add_argument(
+        "-nbins", "--num_bins",
+        type=int,
+        help="The number of bins of the first-order sensitivity indices "
+             "(by default, the square root of the number of samples)",
+        required=False,
+        default=None
+    )
+
+    # Print the version
+    parser.add_argument(
+        "-V", "--version",
+        action="version",
+        version="%(prog)s (trace-simexp version {})" .format(__version__)
+    )
+
+    # Get the command line arguments
+    args = parser.parse_args()
+
+    # Check the validity of the quantiles and the number of bins
+    if any(q < 0.0 or q > 1.0 for q in args.quantiles):
+        raise ValueError("The probabilities of the quantiles must be "
+                         "between 0 and 1")
+    if args.num_bins is not None and args.num_bins < 2:
+        raise ValueError("The number of bins must be > 1")
+
+    # Read the contents of the post-processing phase info file
+    postpro_info_fullname, postpro_info_contents = \
+        common.get_fullname_and_contents(args.postpro_info)
+
+    return (postpro_info_fullname, postpro_info_contents,
+            args.quantiles, args.num_bins)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.cmdln_args.dm2npy
+    ******************************
+
+    Module to parse command line arguments used to convert a csv design matrix
+    file into an npy file
+"""
+from .._version import __version__
+
+__author__ = "Damar Wicaksono"
+
+
+def get() -> tuple:
+    """Get the command line arguments of the design matrix conversion
+
+    :return: tuple with the following values:
+        (str) the csv design matrix fullname (path + filename)
+        (str or None) the npy design matrix fullname (path + filename)
+        (int) the number of rows read at a time
+    """
+    import argparse
+    from . import common
+    from ..design_matrix import CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(
+        description="%(prog)s - Convert a csv design matrix into an npy file"
+    )
+
+    # The csv design matrix filename
+    parser.add_argument(
+        "-dm", "--design_matrix",
+        type=str,
+        help="The csv design matrix filename",
+        required=True
+    )
+
+    # The npy design matrix filename
+    parser.add_argument(
+        "-o", "--output",
+        type=str,
+        help="The npy design matrix filename "
+             "(by default, the csv filename with the npy extension)",
+        required=False,
+        default=None
+    )
+
+    # The number of rows read at a time
+    parser.add_argument(
+        "-chunk", "--chunk_size",
+        type=int,
+        help="The number of rows read at a time",
+        required=False,
+        default=CHUNK_SIZE
+    )
+
+    # Print the version
+    parser.add_argument(
+        "-V", "--version",
+        action="version",
+        version="%(prog)s (trace-simexp version {})" .format(__version__)
+    )
+
+    # Get the command line arguments
+    args = parser.parse_args()
+
+    # Check the validity of the chunk size
+    if args.chunk_size <= 0:
+        raise ValueError("The chunk size must be > 0")
+
+    csv_fullname = common.expand_path(args.design_matrix)
+    if args.output is None:
+        npy_fullname = None
+    else:
+        npy_fullname = common.expand_path(args.output)
+
+    return csv_fullname, npy_fullname, args.chunk_size
@@ -19,9 +19,14 @@ def get():
         its a list of integer.
         (str) the pre-processing phase info file, fullname
         (int) the number of processors used
+        (int) the number of simultaneous xtv to dmx conversions
+        (int) the number of threads to clean up the run directories with
         (str) the scratch directory
         (str) the trace executable fullname, if not in the path
         (str) the xtv2dmx executable fullname, if not in the path
+        (bool) the flag whether to overwrite dirty run directories
+        (bool) the flag whether to resume from the journal
+        (str) the execute phase info filename
     """
     import argparse
     from . import common
@@ -47,6 +52,25 @@ def get():
         required=False
     )
 
+    # The number of simultaneous xtv to dmx conversions
+    parser.add_argument(
+        "-nconvs", "--num_converters",
+        type=int,
+        help="The number of simultaneous xtv to dmx conversions",
+        default=1,
+        required=False
+    )
+
+    # The number of threads to clean up dirty run directories with
+    parser.add_argument(
+        "-nthreads", "--num_threads",
+        type=int,
+        help="The number of threads to remove the files of dirty run "
+             "directories with",
+        default=1,
+        required=False
+    )
+
     # Select which samples to run
     parser.add_argument(
         "-ns", "--num_samples",
@@ -107,6 +131,15 @@ def get():
         required=False
     )
 
+    # The resume flag
+    parser.add_argument(
+        "-resume", "--resume",
+        action="store_true",
+        help="Skip the samples finished according to the journal",
+        default=False,
+        required=False
+    )
+
     # The info filename
     parser.add_argument(
         "-exec_info", "--exec_filename",
@@ -157,12 +190,17 @@ def get():
     # Check the validity of the number of processors
     if args.num_processors <= 0:
         raise ValueError("The number of processors must be > 0")
+    if args.num_converters <= 0:
+        raise ValueError("The number of converters must be > 0")
+    if args.num_threads <= 0:
+        raise ValueError("The number of threads must be > 0")
 
     # Execute phase info filename, expand to absolute path
     exec_filename = common.expand_path(args.exec_filename)
 
     # Return all the command line arguments
     return (samples, prepro_info_fullname, prepro_info_contents,
-            args.num_processors, scratch_directory,
+            args.num_processors, args.num_converters, args.num_threads,
+            scratch_directory,
             trace_executable, xtv2dmx_executable, args.overwrite,
-            exec_filename)
+            args.resume, exec_filename)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.cmdln_args.extend
+    ******************************
+
+    Module to parse command line arguments used to extend a simulation
+    campaign with new samples
+"""
+from .._version import __version__
+
+__author__ = "Damar Wicaksono"
+
+
+def get() -> tuple:
+    r"""Parse input arguments required to extend a campaign
+
+    :return: tuple with the following values:
+        (str) the prepro info file fullname of the campaign
+        (list, str) the contents of the prepro info file
+        (int or None) the number of new samples of a generated design matrix
+        (str or None) the fullname of the design matrix file with the new
+            samples as rows
+        (bool) the flag whether to overwrite directory structure
+        (int) the number of worker processes to write the input decks
+        (bool) the flag whether to defer the input decks to the execute phase
+        (str) a one line info of the extension
+        (str) the prepro info filename of the extension
+    """
+    import argparse
+    from . import common
+
+    parser = argparse.ArgumentParser(
+        description="%(prog)s - Extend: Add new samples to a campaign"
+    )
+
+    # The fullname of info_file from the pre-processing phase
+    parser.add_argument(
+        "-prepro", "--prepro_info",
+        type=argparse.FileType("rt"),
+        help="The pre-processing phase info file of the campaign",
+        required=True
+    )
+
+    # The new samples, either generated or read from a file
+    new_group = parser.add_mutually_exclusive_group(required=True)
+
+    # The number of new samples of a generated design matrix
+    new_group.add_argument(
+        "-n", "--num_new",
+        type=int,
+        help="The number of new samples to generate",
+    )
+
+    # The design matrix file with the new samples
+    new_group.add_argument(
+        "-dm", "--design_matrix",
+        type=str,
+        help="The design matrix filename with the new samples, csv or npy",
+    )
+
+    # The overwrite flag
+    parser.add_argument(
+        "-ow", "--overwrite",
+        action="store_true",
+        help="Overwrite existing directory structures",
+        default=False,
+        required=False
+    )
+
+    # The number of worker processes
+    parser.add_argument(
+        "-nworkers", "--num_workers",
+        type=int,
+        help="The number of processes to generate the input decks with",
+        default=1,
+        required=False
+    )
+
+    # The lazy flag
+    parser.add_argument(
+        "-lazy", "--lazy",
+        action="store_true",
+        help="Defer the input decks generation to the execute phase",
+        default=False,
+        required=False
+    )
+
+    # The tag message
+    parser.add_argument(
+        "-info", "--info",
+        type=str,
+        help="The tag message (by default, the one of the campaign)",
+        required=False
+    )
+
+    # The info filename
+    parser.add_argument(
+        "-prepro_info", "--prepro_filename",
+        type=str,
+        help="The pre-process info filename of the new samples "
+             "(by default, will be created in the current working directory)",
+        required=False,
+        default=None
+    )
+
+    # Print version
+    parser.add_argument(
+        "-V", "--version",
+        action="version",
+        version="%(prog)s (trace-simexp version {})".format(__version__)
+    )
+
+    # Get the command line arguments
+    args = parser.parse_args()
+
+    # Check the validity of the numbers
+    if args.num_new is not None and args.num_new <= 0:
+        raise ValueError("The number of new samples must be > 0")
+    if args.num_workers <= 0:
+        raise ValueError("The number of workers must be > 0")
+
+    # Read the pre-processing phase info file
+    prepro_info_fullname, prepro_info_contents = \
+        common.get_fullname_and_contents(args.prepro_info)
+
+    # The design matrix with the new samples, expand to absolute path
+    if args.design_matrix is not None:
+        dm_fullname = common.expand_path(args.design_matrix)
+    else:
+        dm_fullname = None
+
+    # Prepro phase info filename, expand to absolute path
+    prepro_filename = common.expand_path(args.prepro_filename)
+
+    return (prepro_info_fullname, prepro_info_contents,
+            args.num_new, dm_fullname,
+            args.overwrite, args.num_workers, args.lazy, args.info,
+            prepro_filename)
@@ -20,10 +20,17 @@ def get():
         (list) the contents of the list of TRACE variables file
         (str) the aptplot executable, fullname if not in the path
         (int) the number of processors used
+        (int) the number of threads to remove the out-of-date csv files with
         (bool/list) if not specified samples return True, otherwise
         it is a list of samples to be post-processed
         (str) the postpro info filename if specified, otherwise the 
         current working directory
+        (bool) the flag to follow the execute phase
+        (float) the time without progress of the execute phase after which
+        to stop following it, in seconds, None if not specified
+        (str) the QoI specification file, fullname, None if not specified
+        (list) the contents of the QoI specification file, None if not
+        specified
     """
     import argparse
     from . import common
@@ -48,6 +55,15 @@ def get():
         required=True
     )
 
+    # The specification of the quantities of interest
+    parser.add_argument(
+        "-qoi", "--qoi_spec",
+        type=argparse.FileType("rt"),
+        help="The quantities of interest specification file",
+        required=False,
+        default=None
+    )
+
     # The aptplot executable
     parser.add_argument(
         "-aptplot", "--aptplot_executable",
@@ -65,6 +81,15 @@ def get():
         required=False
     )
 
+    # The number of threads to remove out-of-date csv files with
+    parser.add_argument(
+        "-nthreads", "--num_threads",
+        type=int,
+        help="The number of threads to remove out-of-date csv files with",
+        default=1,
+        required=False
+    )
+
     # Select which samples to run
     parser.add_argument(
         "-ns", "--num_samples",
@@ -101,6 +126,26 @@ def get():
         required=False
     )
 
+    # Follow the execute phase
+    parser.add_argument(
+        "-follow", "--follow",
+        action="store_true",
+        help="Post-process each sample as soon as it is executed, "
+             "until all samples are done",
+        default=False,
+        required=False
+    )
+
+    # Stop following a stalled execute phase
+    parser.add_argument(
+        "-follow_timeout", "--follow_timeout",
+        type=float,
+        help="The time without progress of the execute phase (in seconds) "
+             "after which to stop following it (default: 9000)",
+        default=None,
+        required=False
+    )
+
     # The info filename
     parser.add_argument(
         "-postpro_info", "--postpro_filename",
@@ -133,12 +178,25 @@ def get():
     xtv_vars_fullname, xtv_vars_contents = \
         common.get_fullname_and_contents(args.xtv_variables)
 
+    # Read the contents of the QoI specification file
+    if args.qoi_spec is not None:
+        qoi_spec_fullname, qoi_spec_contents = \
+            common.get_fullname_and_contents(args.qoi_spec)
+    else:
+        qoi_spec_fullname, qoi_spec_contents = None, None
+
     # Check and get the executable for APTPLOT
     aptplot_executable = common.get_executable(args.aptplot_executable)
 
     # Check the validity of the number of processors
     if args.num_processors <= 0:
         raise ValueError("The number of processors must be > 0")
+    if args.num_threads <= 0:
+        raise ValueError("The number of threads must be > 0")
+
+    # Check the validity of the follow timeout
+    if args.follow_timeout is not None and args.follow_timeout <= 0:
+        raise ValueError("The follow timeout must be > 0")
 
     # Sample does not have to be explicitly specified, by default all will be
     # post-processed.
@@ -156,5 +214,7 @@ def get():
 
     return (exec_info_fullname, exec_info_contents,
             xtv_vars_fullname, xtv_vars_contents,
-            aptplot_executable, args.num_processors,
-            samples, args.overwrite, postpro_filename)
+            aptplot_executable, args.num_processors, args.num_threads,
+            samples, args.overwrite, postpro_filename,
+            args.follow, args.follow_timeout,
+            qoi_spec_fullname, qoi_spec_contents)
@@ -17,13 +17,20 @@ def get() -> tuple:
         (int or string) the specified samples, individual, range, or all
         (str) the base directory name of the simulation campaign
         (str) the base TRACE input deck fullname (path + filename)
-        (str) the design matrix fullname (path + filename)
+        (str) the design matrix fullname (path + filename), None if it is to
+            be generated
+        (np.ndarray) the design matrix, None if it is to be generated
+        (dict) the specification of the design matrix to be generated, None
+            if it is read from a file, see get_doe_spec()
         (str) the list of parameters fullname (path + filename)
         (bool) the flag whether to overwrite directory structure
+        (int) the number of worker processes to write the input decks
+        (bool) the flag whether to defer the input decks to the execute phase
         (str) a one line info of the simulation experiment campaign
     """
     import argparse
     from . import common
+    from .. import design_matrix
 
     parser = argparse.ArgumentParser(
         description="%(prog)s - Preprocess: Generate TRACE perturbed inputs"
@@ -73,12 +80,40 @@ def get() -> tuple:
         required=True
     )
 
+    # The design matrix, either a file or generated
+    dm_group = parser.add_mutually_exclusive_group(required=True)
+
     # The base design matrix filename
-    parser.add_argument(
+    dm_group.add_argument(
         "-dm", "--design_matrix",
-        type=argparse.FileType("rt"),
-        help="The design matrix filename",
-        required=True
+        type=str,
+        help="The design matrix filename, csv or npy",
+    )
+
+    # The design of experiment method to generate the design matrix
+    dm_group.add_argument(
+        "-doe", "--doe_method",
+        type=str,
+        choices=design_matrix.METHODS,
+        help="Generate the design matrix with the method",
+    )
+
+    # The number of samples of the generated design matrix
+    parser.add_argument(
+        "-doe_samples", "--doe_num_samples",
+        type=int,
+        help="The number of samples of the generated design matrix",
+        required=False
+    )
+
+    # The seed to generate the design matrix
+    parser.add_argument(
+        "-seed", "--seed",
+        type=int,
+        help="The seed to generate the design matrix "
+             "(by default, drawn at random and recorded)",
+        required=False,
+        default=None
     )
 
     # The list of parameter filename
@@ -98,6 +133,24 @@ def get() -> tuple:
         required=False
     )
 
+    # The number of worker processes
+    parser.add_argument(
+        "-nworkers", "--num_workers",
+        type=int,
+        help="The number of processes to generate the input decks with",
+        default=1,
+        required=False
+    )
+
+    # The lazy flag
+    parser.add_argument(
+        "-lazy", "--lazy",
+        action="store_true",
+        help="Defer the input decks generation to the execute phase",
+        default=False,
+        required=False
+    )
+
     # The tag message
     parser.add_argument(
         "-info", "--info",
@@ -134,16 +187,28 @@ def get() -> tuple:
     # Read Base TRACE input deck
     tracin_base_fullname, tracin_base_contents = \
         common.get_fullname_and_contents(args.base_tracin)
-    # Read Design matrix file
-    design_matrix_fullname, design_matrix_contents = \
-        common.get_fullname_and_contents(args.design_matrix, dsv=True)
     # Read List of parameters file
     params_list_fullname, params_list_contents = \
         common.get_fullname_and_contents(args.params_list)
 
+    if args.design_matrix is not None:
+        # Read Design matrix file
+        design_matrix_fullname = common.expand_path(args.design_matrix)
+        design_matrix_contents = design_matrix.read(design_matrix_fullname)
+        doe_spec = None
+        num_samples = design_matrix_contents.shape[0]
+        num_dimension = design_matrix_contents.shape[1]
+    else:
+        # The design matrix is generated later, in the campaign directory
+        design_matrix_fullname = None
+        design_matrix_contents = None
+        doe_spec = get_doe_spec(args.doe_method, args.doe_num_samples,
+                                count_params(params_list_contents),
+                                args.seed)
+        num_samples = doe_spec["num_samples"]
+        num_dimension = doe_spec["dimension"]
+
     # Available samples from the design matrix
-    num_samples = design_matrix_contents.shape[0]
-    num_dimension = design_matrix_contents.shape[1]
     avail_samples = list(range(1, num_samples + 1))
 
     # Sample has to be specified, otherwise all available in the design matrix
@@ -162,6 +227,10 @@ def get() -> tuple:
     # Check the validity of the design matrix dimension and list of params file
     check_dimension(params_list_contents, num_dimension)
 
+    # Check the validity of the number of workers
+    if args.num_workers <= 0:
+        raise ValueError("The number of workers must be > 0")
+
     # Base Directory Name, most probably supplied in a relative path
     base_dirname = common.expand_path(args.base_dirname)
 
@@ -170,23 +239,70 @@ def get() -> tuple:
 
     return (samples, base_dirname,
             tracin_base_fullname, tracin_base_contents,
-            design_matrix_fullname, design_matrix_contents,
+            design_matrix_fullname, design_matrix_contents, doe_spec,
             params_list_fullname, params_list_contents,
-            args.overwrite, args.info, prepro_filename)
+            args.overwrite, args.num_workers, args.lazy, args.info,
+            prepro_filename)
 
 
-def check_dimension(params_list_contents: list, num_dimension: int):
-    r"""Check the validity of the list of parameters file size
+def get_doe_spec(method: str, num_samples: int, dimension: int,
+                 seed: int=None) -> dict:
+    r"""Get the specification of the design matrix to be generated
+
+    :param method: the design of experiment method
+    :param num_samples: the number of samples
+    :param dimension: the number of parameters
+    :param seed: the seed of the random number generator. If None, a seed is
+        drawn at random so that it can be recorded.
+    :return: the specification with keys "method", "num_samples",
+        "dimension", and "seed"
+    """
+    import random
+
+    if num_samples is None:
+        raise ValueError("The number of samples (-doe_samples) is required "
+                         "to generate a design matrix")
+    if num_samples <= 0:
+        raise ValueError("The number of samples must be > 0")
+    if method == "morris" and num_samples % (dimension + 1) != 0:
+        raise ValueError("A Morris design consists of trajectories of {} "
+                         "samples, the number of samples must be a multiple "
+                         "of it" .format(dimension + 1))
+
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**31)
+    elif seed < 0:
+        raise ValueError("The seed must be >= 0")
+
+    return {"method": method,
+            "num_samples": num_samples,
+            "dimension": dimension,
+            "seed": seed}
+
+
+def count_params(params_list_contents: list) -> int:
+    r"""Count the number of parameters in the list of parameters file
 
     :param params_list_contents: the contents of the file
-    :param num_dimension: the dimension of the design matrix file
+    :return: the number of parameters (lines not commented)
     """
-    # Check the number of parameters listed in the params_list_file
     num_params = 0
     for line in params_list_contents:
         if not line.startswith("#"):
             num_params += 1
 
+    return num_params
+
+
+def check_dimension(params_list_contents: list, num_dimension: int):
+    r"""Check the validity of the list of parameters file size
+
+    :param params_list_contents: the contents of the file
+    :param num_dimension: the dimension of the design matrix file
+    """
+    # Check the number of parameters listed in the params_list_file
+    num_params = count_params(params_list_contents)
+
     # Check the number of parameters in the dm file and list of parameters file
     if num_params != num_dimension:
         raise ValueError("The number of parameters is inconsistent\n"
@@ -10,10 +10,12 @@ from .._version import __version__
 __author__ = "Damar Wicaksono"
 
 
-def get() -> list:
+def get() -> tuple:
     """Get the command line arguments of the execute phase
 
-    :return: list of string, the contents of an info file
+    :return: tuple with the following values
+        (list, str) the contents of an info file
+        (int) the number of threads to remove the files with
     """
     import argparse
 
@@ -29,6 +31,15 @@ def get() -> list:
         required=True
     )
 
+    # The number of threads to remove the files with
+    parser.add_argument(
+        "-nthreads", "--num_threads",
+        type=int,
+        help="The number of threads to remove the files with",
+        default=1,
+        required=False
+    )
+
     # Print the version
     parser.add_argument(
         "-V", "--version",
@@ -39,8 +50,12 @@ def get() -> list:
     # Get the command line arguments
     args = parser.parse_args()
 
+    # Check the validity of the number of threads
+    if args.num_threads <= 0:
+        raise ValueError("The number of threads must be > 0")
+
     # Read file argument contents
     with args.info_file as info_file:
         info_file_contents = info_file.read().splitlines()
 
-    return info_file_contents
+    return info_file_contents, args.num_threads
@@ -16,12 +16,15 @@ def main():
     print("Please use the driver scripts for each of the desired phases:")
     print("     trace_simexp_prepro     pre-process and generate perturbed "
           "inputs")
+    print("     trace_simexp_extend     extend a campaign with new samples")
     print("     trace_simexp_execute    execute the generated perturbed " 
           "inputs")
     print("     trace_simexp_postpro    extract select variables from dmx")
+    print("     trace_simexp_analyze    compute the statistics of the results")
     print("     trace_simexp_reset      return the original state of a given " 
           "phase")
     print("     trace_simexp_freeze     freeze current state for archival")
+    print("     trace_simexp_dm2npy     convert a csv design matrix into npy")
     print("Use <driver_script> --help to get the help for each")
     print("")
 
@@ -30,13 +33,37 @@ def cli_prepro():
     """Command line interface for trace-simexp pre-processing step"""
 
     from trace_simexp import prepro
-    from trace_simexp import tracin
-    from trace_simexp import info_file
-    from trace_simexp import paramfile
 
     # Construct a dictionary of required inputs from command line arguments,etc
     inputs = prepro.get_input()
 
+    # Generate the perturbed inputs
+    run_prepro(inputs)
+
+
+def cli_extend():
+    """Command line interface to extend a campaign with new samples"""
+
+    from trace_simexp import extend
+
+    # Extend the design matrix and construct the inputs of the new samples
+    inputs = extend.get_input()
+
+    # Generate the perturbed inputs of the new samples only
+    run_prepro(inputs)
+
+
+def run_prepro(inputs: dict):
+    """Carry out the pre-processing step for the given inputs
+
+    :param inputs: the inputs of the pre-processing step, see
+        prepro.get_input()
+    """
+    from trace_simexp import prepro
+    from trace_simexp import tracin
+    from trace_simexp import info_file
+    from trace_simexp import paramfile
+
     # Write an prepro info file
     info_file.prepro.write(inputs)
 
@@ -52,7 +79,22 @@ def cli_prepro():
                                              inputs["tracin_base_contents"])
 
     # Create a directory structure based on the specified input
-    prepro.create_dirtree(inputs, params_dict, tracin_template)
+    written_samples, stale_samples = prepro.create_dirtree(inputs,
+                                                           params_dict,
+                                                           tracin_template)
+
+    # Update the info file with the written and stale input decks
+    info_file.prepro.append_written(inputs["info_file"], written_samples,
+                                    inputs["num_workers"], stale_samples)
+
+    # Record the phase in the campaign database
+    db_filename = info_file.campaign.make_filename(
+        dict(inputs, base_dir=inputs["base_dirname"]))
+    info_file.campaign.add_phase(db_filename, "prepro", inputs["info_file"],
+                                 inputs["samples"])
+
+    # The info file is a view of the database
+    check_info(db_filename, inputs["info_file"])
 
 
 def cli_execute():
@@ -64,14 +106,29 @@ def cli_execute():
     # Consolidate all the required inputs for post-processing phase
     exec_inputs = execute.get_input()
 
+    # Nothing left to do when resuming a finished campaign
+    if not exec_inputs["samples"]:
+        print("All selected samples are already finished. Nothing to resume.")
+        return
+
     # Otherwise, write the execute phase info file
     info_file.execute.write(exec_inputs)
 
+    # Record the phase in the campaign database
+    db_filename = info_file.campaign.make_filename(exec_inputs)
+    info_file.campaign.add_phase(db_filename, "exec",
+                                 exec_inputs["info_file"],
+                                 exec_inputs["samples"],
+                                 exec_inputs["hostname"])
+
     # Check if the directory structure structures already exists
     execute.check_dirtree(exec_inputs)
 
-    # Commence the calculation in batches
-    execute.run_batches(exec_inputs)
+    # Commence the calculation, keeping all processors busy
+    execute.run_queue(exec_inputs)
+
+    # The info file is a view of the database
+    check_info(db_filename, exec_inputs["info_file"])
 
 
 def cli_postpro():
@@ -86,11 +143,84 @@ def cli_postpro():
     # Write the execute phase info file
     info_file.postpro.write(postpro_inputs)
 
-    # Check if the directory structure structures already exists
-    postpro.check_dirtree(postpro_inputs)
+    # Record the phase in the campaign database, the sections appended to
+    # the info file afterward are recorded as well
+    db_filename = info_file.campaign.make_filename(postpro_inputs)
+    info_file.campaign.add_phase(db_filename, "postpro",
+                                 postpro_inputs["info_file"],
+                                 postpro_inputs["samples"],
+                                 postpro_inputs["hostname"])
+
+    if postpro_inputs["follow"]:
+        # Post-process the samples as they are executed
+        store_fullname = postpro.follow(
+            postpro_inputs, timeout=postpro_inputs["follow_timeout"])
+    else:
+        # Check the directory structures, get the samples not yet up to date
+        extracted_samples, up_to_date_samples, unavailable_samples = \
+            postpro.check_dirtree(postpro_inputs)
+        info_file.postpro.append_extracted(postpro_inputs["info_file"],
+                                           extracted_samples,
+                                           up_to_date_samples,
+                                           unavailable_samples,
+                                           db_filename)
+
+        # Commence the conversion
+        postpro.dmx2csv(postpro_inputs, extracted_samples)
+
+        # Consolidate the extracted csv files into the result store
+        store_fullname = postpro.consolidate(postpro_inputs,
+                                             extracted_samples)
+
+    info_file.postpro.append_store(postpro_inputs["info_file"],
+                                   store_fullname, db_filename=db_filename)
+
+    # Reduce the time series into the quantities of interest
+    if postpro_inputs["qoi_spec"] is not None:
+        qoi_fullname = postpro.evaluate_qoi(postpro_inputs, store_fullname)
+        info_file.postpro.append_store(postpro_inputs["info_file"],
+                                       qoi_fullname, "QoI Matrix",
+                                       db_filename)
+
+    # The info file is a view of the database
+    check_info(db_filename, postpro_inputs["info_file"])
+
+
+def check_info(db_filename: str, info_filename: str):
+    """Check that the info file of a phase is the same as its database view
+
+    If it is not (e.g., it was edited during the phase), it is written anew
+    from the campaign database.
+
+    :param db_filename: the fullname of the campaign database
+    :param info_filename: the fullname of the info file of the phase
+    """
+    from trace_simexp.info_file import campaign
+
+    if not campaign.check_info(db_filename, info_filename):
+        print("{} differs from the campaign database, written anew from {}"
+              .format(info_filename, db_filename))
+        campaign.write_info(db_filename, info_filename, info_filename)
+
+
+def cli_analyze():
+    """trace-simexp analysis command line interface"""
+    from trace_simexp import analyze
+
+    # Get all inputs
+    analyze_inputs = analyze.get_input()
+
+    # Analyze the time series of the result store
+    analysis_fullname = analyze.analyze_store(analyze_inputs)
+    print("Statistics of the result store written in {}"
+          .format(analysis_fullname))
 
-    # Commence the conversion
-    postpro.dmx2csv(postpro_inputs)
+    # Analyze the quantities of interest
+    if analyze_inputs["qoi_fullname"] is not None:
+        summary_fullname, sensitivity_fullname = \
+            analyze.analyze_qoi(analyze_inputs)
+        print("Statistics of the QoIs written in {} and {}"
+              .format(summary_fullname, sensitivity_fullname))
 
 
 def cli_reset():
@@ -107,3 +237,18 @@ def cli_reset():
         execute.reset(reset_inputs)
     elif reset_inputs["phase"] == "postpro":
         postpro.reset(reset_inputs)
+
+
+def cli_dm2npy():
+    """trace-simexp design matrix conversion command line interface"""
+    from trace_simexp import cmdln_args
+    from trace_simexp import design_matrix
+
+    # Get all inputs
+    csv_fullname, npy_fullname, chunk_size = cmdln_args.dm2npy.get()
+
+    # Convert the design matrix
+    npy_fullname = design_matrix.convert(csv_fullname, npy_fullname,
+                                         chunk_size)
+
+    print("{} converted to {}" .format(csv_fullname, npy_fullname))
@@ -0,0 +1,645 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.design_matrix
+    **************************
+
+    Module to read the design matrix file, either a delimiter separated value
+    (csv) file or a binary numpy (npy) file, to convert the former into
+    the latter, and to generate a design matrix directly into an npy file
+
+    A csv file is read in chunks of rows so that it never has to be held as
+    text in memory. An npy file is memory-mapped, only the rows of the
+    processed samples are actually read from the disk.
+"""
+import numpy as np
+
+__author__ = "Damar Wicaksono"
+
+# The delimiters of a csv design matrix file
+DELIMITERS = "\t|,| |;"
+
+# The default number of rows in a chunk of a csv design matrix file
+CHUNK_SIZE = 10000
+
+# The supported design of experiment methods
+METHODS = ["lhs", "sobol", "halton", "random", "morris"]
+
+# The number of levels of a Morris design (even)
+MORRIS_LEVELS = 4
+
+# The number of random Latin hypercube candidates for maximin optimization
+NUM_CANDIDATES = 10
+
+
+def read(dm_fullname: str) -> np.ndarray:
+    """Read the design matrix file
+
+    :param dm_fullname: the fullname of the design matrix file, either a csv
+        file or an npy file (by its extension)
+    :return: the design matrix as 2-dimensional numpy array, memory-mapped
+        (read-only) for an npy file
+    """
+    if is_npy(dm_fullname):
+        dm_contents = np.load(dm_fullname, mmap_mode="r")
+        if dm_contents.ndim != 2:
+            raise ValueError("The design matrix {} is not 2-dimensional"
+                             .format(dm_fullname))
+        return dm_contents
+
+    with open(dm_fullname, "rt") as csv_file:
+        return parse_csv(csv_file)
+
+
+def is_npy(dm_fullname: str) -> bool:
+    """Check if the design matrix file is an npy file, by its extension
+
+    :param dm_fullname: the fullname of the design matrix file
+    :return: True if it is an npy file
+    """
+    return dm_fullname.lower().endswith(".npy")
+
+
+def parse_csv(csv_file) -> np.ndarray:
+    """Parse a csv design matrix file, with any of the supported delimiters
+
+    :param csv_file: the opened csv file
+    :return: the design matrix as 2-dimensional numpy array
+    """
+    chunks = list(iter_csv(csv_file))
+
+    if not chunks:
+        raise ValueError("The design matrix file is empty")
+
+    return np.vstack(chunks)
+
+
+def iter_csv(csv_file, chunk_size: int=CHUNK_SIZE):
+    """Iterate over a csv design matrix file, a chunk of rows at a time
+
+    Blank lines are skipped. The rows of all chunks have the same number of
+    columns.
+
+    :param csv_file: the opened csv file
+    :param chunk_size: the maximum number of rows in a chunk
+    :return: an iterator of 2-dimensional numpy arrays
+    """
+    import re
+
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be > 0")
+
+    num_columns = None
+    rows = list()
+    for num_line, line in enumerate(csv_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        row = re.split(DELIMITERS, line)
+        if num_columns is None:
+            num_columns = len(row)
+        elif len(row) != num_columns:
+            raise ValueError("Line {} of the design matrix has {} columns "
+                             "instead of {}"
+                             .format(num_line, len(row), num_columns))
+        rows.append(row)
+
+        if len(rows) == chunk_size:
+            yield np.array(rows, dtype=np.float64)
+            rows = list()
+
+    if rows:
+        yield np.array(rows, dtype=np.float64)
+
+
+def convert(csv_fullname: str, npy_fullname: str=None,
+            chunk_size: int=CHUNK_SIZE) -> str:
+    """Convert a csv design matrix file into an npy file
+
+    The csv file is read twice in chunks: first to get the shape of the
+    design matrix, then to fill the memory-mapped npy file. The design matrix
+    is never held in memory as a whole. An existing npy file is only replaced
+    once the new one is complete, see write_chunks().
+
+    :param csv_fullname: the fullname of the csv file
+    :param npy_fullname: the fullname of the npy file. If None, the same as
+        the csv file with the extension replaced by ".npy"
+    :param chunk_size: the maximum number of rows in a chunk
+    :return: the fullname of the npy file
+    """
+    import os
+
+    if npy_fullname is None:
+        npy_fullname = "{}.npy" .format(os.path.splitext(csv_fullname)[0])
+
+    # Get the shape of the design matrix
+    num_rows = 0
+    num_columns = 0
+    with open(csv_fullname, "rt") as csv_file:
+        for chunk in iter_csv(csv_file, chunk_size):
+            num_rows += chunk.shape[0]
+            num_columns = chunk.shape[1]
+
+    if num_rows == 0:
+        raise ValueError("The design matrix file {} is empty"
+                         .format(csv_fullname))
+
+    # Fill the npy file chunk by chunk
+    with open(csv_fullname, "rt") as csv_file:
+        write_chunks(npy_fullname, (num_rows, num_columns),
+                     iter_csv(csv_file, chunk_size))
+
+    return npy_fullname
+
+
+def make_name(method: str, dimension: int, seed: int) -> str:
+    """Make the name of a generated design matrix
+
+    The number of samples is not part of the name, so that the design matrix
+    (and its campaign) keeps its name when more samples are added to it.
+
+    :param method: the design of experiment method, one of METHODS
+    :param dimension: the number of parameters
+    :param seed: the seed of the random number generator
+    :return: the name, e.g., "sobol_27_seed42"
+    """
+    return "{}_{}_seed{}" .format(method, dimension, seed)
+
+
+def generate(method: str, num_samples: int, dimension: int, seed: int,
+             offset: int=0, chunk_size: int=CHUNK_SIZE):
+    """Generate a design matrix in the unit hypercube, a chunk at a time
+
+    +--------+----------------------------------------------------------------+
+    | Method | Description                                                    |
+    +========+================================================================+
+    | lhs    | Latin hypercube, the best of NUM_CANDIDATES random ones        |
+    |        | according to the maximin criterion, see lhs_maximin()          |
+    +--------+----------------------------------------------------------------+
+    | sobol  | Scrambled Sobol' sequence (scipy.stats.qmc)                    |
+    +--------+----------------------------------------------------------------+
+    | halton | Scrambled Halton sequence (scipy.stats.qmc)                    |
+    +--------+----------------------------------------------------------------+
+    | random | Independent uniform random numbers (numpy PCG64)               |
+    +--------+----------------------------------------------------------------+
+    | morris | Morris trajectories for the elementary effects, see            |
+    |        | morris_trajectories(). The number of samples (and the offset)  |
+    |        | must be a multiple of the dimension + 1.                       |
+    +--------+----------------------------------------------------------------+
+
+    For the sequences (sobol, halton, random, and morris), the samples do not
+    depend on the chunk size and an offset continues an existing design
+    matrix.
+
+    :param method: the design of experiment method, one of METHODS
+    :param num_samples: the number of samples (rows) to generate
+    :param dimension: the number of parameters (columns)
+    :param seed: the seed of the random number generator
+    :param offset: the number of samples of the sequence to skip
+    :param chunk_size: the maximum number of rows in a chunk
+    :return: an iterator of 2-dimensional numpy arrays
+    """
+    from scipy.stats import qmc
+
+    if method not in METHODS:
+        raise ValueError("*{}* is not a supported design of experiment "
+                         "method!" .format(method))
+    if num_samples <= 0 or dimension <= 0:
+        raise ValueError("The number of samples and dimension must be > 0")
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be > 0")
+
+    if method == "lhs":
+        if offset != 0:
+            raise ValueError("A Latin hypercube is not a sequence, "
+                             "it cannot be continued with an offset")
+        design = lhs_maximin(num_samples, dimension, seed)
+        for start in range(0, num_samples, chunk_size):
+            yield design[start:start+chunk_size, :]
+        return
+
+    if method == "morris":
+        size = dimension + 1
+        if num_samples % size != 0 or offset % size != 0:
+            raise ValueError("A Morris design consists of trajectories of {} "
+                             "samples, the number of samples must be a "
+                             "multiple of it" .format(size))
+        num_trajectories = num_samples // size
+        # Whole trajectories in a chunk
+        step = max(1, chunk_size // size)
+        for start in range(0, num_trajectories, step):
+            yield morris_trajectories(min(step, num_trajectories - start),
+                                      dimension, seed,
+                                      offset // size + start)
+        return
+
+    if method in ["sobol", "halton"]:
+        if method == "sobol":
+            engine = qmc.Sobol(dimension, scramble=True, seed=seed)
+        else:
+            engine = qmc.Halton(dimension, scramble=True, seed=seed)
+        if offset > 0:
+            engine.fast_forward(offset)
+        draw = engine.random
+    else:
+        # A double consumes a single step of the generator
+        rng = np.random.Generator(
+            np.random.PCG64(seed).advance(offset * dimension))
+        draw = lambda n: rng.random((n, dimension))
+
+    for start in range(0, num_samples, chunk_size):
+        yield draw(min(chunk_size, num_samples - start))
+
+
+def morris_trajectories(num_trajectories: int, dimension: int, seed: int,
+                        offset: int=0,
+                        num_levels: int=MORRIS_LEVELS) -> np.ndarray:
+    """Generate Morris trajectories (one-at-a-time design)
+
+    Each trajectory starts from a random point of a grid of num_levels levels
+    per parameter and moves each parameter once, in random order, by half
+    of the levels (up or down, within the grid), i.e., dimension + 1
+    samples per trajectory. The levels are the centers of num_levels
+    intervals of equal probability, (j + 0.5) / num_levels, so that no
+    sample lies on the bounds of the unit hypercube (an infinite value for
+    an unbounded distribution).
+
+    The trajectory t is drawn from its own stream (seed, t), an offset
+    (in trajectories) therefore continues an existing design.
+
+    :param num_trajectories: the number of trajectories
+    :param dimension: the number of parameters
+    :param seed: the seed of the random number generator
+    :param offset: the number of trajectories to skip
+    :param num_levels: the number of levels, even
+    :return: the design as 2-dimensional numpy array, (num_trajectories *
+        (dimension + 1)) x dimension
+    """
+    jump = num_levels // 2
+    size = dimension + 1
+
+    design = np.empty((num_trajectories * size, dimension))
+    for t in range(num_trajectories):
+        rng = np.random.Generator(np.random.PCG64(
+            np.random.SeedSequence([seed, offset + t])))
+        levels = rng.integers(num_levels, size=dimension)
+        steps = np.where(levels < num_levels - jump, jump, -jump)
+        trajectory = np.repeat(levels[np.newaxis, :], size, axis=0)
+        # Move one parameter at a time, the moves accumulate
+        for i, k in enumerate(rng.permutation(dimension)):
+            trajectory[i+1:, k] += steps[k]
+        design[t*size:(t+1)*size, :] = (trajectory + 0.5) / num_levels
+
+    return design
+
+
+def lhs_maximin(num_samples: int, dimension: int, seed: int,
+                num_candidates: int=NUM_CANDIDATES) -> np.ndarray:
+    """Generate a maximin Latin hypercube design
+
+    A number of random Latin hypercube designs are generated and the one with
+    the largest minimum distance between any two of its samples is selected.
+
+    :param num_samples: the number of samples
+    :param dimension: the number of parameters
+    :param seed: the seed of the random number generator
+    :param num_candidates: the number of candidate designs
+    :return: the design as 2-dimensional numpy array
+    """
+    from scipy.stats import qmc
+
+    engine = qmc.LatinHypercube(dimension, seed=seed)
+
+    best_design = None
+    best_distance = -1.0
+    for _ in range(num_candidates):
+        design = engine.random(num_samples)
+        distance = get_min_distance(design)
+        if distance > best_distance:
+            best_design = design
+            best_distance = distance
+
+    return best_design
+
+
+def get_min_distance(design: np.ndarray) -> float:
+    """Compute the minimum distance between any two samples of a design
+
+    :param design: the design as 2-dimensional numpy array
+    :return: the minimum Euclidean distance, infinite for a single sample
+    """
+    from scipy.spatial import cKDTree
+
+    if design.shape[0] < 2:
+        return float("inf")
+
+    # The nearest neighbor of each sample, except the sample itself
+    distances, _ = cKDTree(design).query(design, k=2)
+
+    return float(distances[:, 1].min())
+
+
+def check_generated(dm_fullname: str, method: str, num_samples: int,
+                    dimension: int, seed: int) -> bool:
+    """Check a design matrix generated before against its specification
+
+    The generated design matrix matches if it was generated with the same
+    method, number of samples, dimension, and seed. The samples added since
+    by extensions (see extend()) are part of the matching design matrix.
+
+    :param dm_fullname: the fullname of the npy file
+    :param method: the design of experiment method, one of METHODS
+    :param num_samples: the number of samples, without the extensions
+    :param dimension: the number of parameters
+    :param seed: the seed of the random number generator
+    :return: None if neither the npy file nor its specification exists, True
+        if both exist and match, False otherwise
+    """
+    import os
+
+    spec = read_spec(dm_fullname)
+    if spec is None and not os.path.isfile(dm_fullname):
+        return None
+    if spec is None or not os.path.isfile(dm_fullname):
+        return False
+
+    num_generated = spec["num_samples"] - sum(spec.get("extensions", []))
+
+    return (spec["method"] == method and num_generated == num_samples and
+            spec["dimension"] == dimension and spec["seed"] == seed and
+            read(dm_fullname).shape == (spec["num_samples"], dimension))
+
+
+def write_generated(dm_fullname: str, method: str, num_samples: int,
+                    dimension: int, seed: int,
+                    chunk_size: int=CHUNK_SIZE) -> np.ndarray:
+    """Generate a design matrix into an npy file, a chunk at a time
+
+    The specification of the design is written next to it (with the "json"
+    extension) so that the design can be reproduced, see read_spec().
+
+    :param dm_fullname: the fullname of the npy file
+    :param method: the design of experiment method, one of METHODS
+    :param num_samples: the number of samples
+    :param dimension: the number of parameters
+    :param seed: the seed of the random number generator
+    :param chunk_size: the maximum number of rows in a chunk
+    :return: the design matrix, memory-mapped (read-only)
+    """
+    import os
+
+    os.makedirs(os.path.dirname(dm_fullname), exist_ok=True)
+
+    write_chunks(dm_fullname, (num_samples, dimension),
+                 generate(method, num_samples, dimension, seed,
+                          chunk_size=chunk_size))
+
+    write_spec(dm_fullname, {"method": method,
+                             "num_samples": num_samples,
+                             "dimension": dimension,
+                             "seed": seed})
+
+    return read(dm_fullname)
+
+
+def extend(dm_fullname: str, num_samples: int,
+           chunk_size: int=CHUNK_SIZE) -> np.ndarray:
+    """Extend a generated design matrix with new samples, in place
+
+    A sequence (sobol, halton, or random) is continued where it stopped, a
+    Latin hypercube design is augmented, see lhs_augment(). The number of
+    new samples is appended to the "extensions" of the specification.
+
+    :param dm_fullname: the fullname of the generated npy file
+    :param num_samples: the number of new samples
+    :param chunk_size: the maximum number of rows in a chunk
+    :return: the extended design matrix, memory-mapped (read-only)
+    """
+    spec = read_spec(dm_fullname)
+    if spec is None:
+        raise ValueError("The design matrix {} was not generated, it cannot "
+                         "be extended with new samples" .format(dm_fullname))
+    if num_samples <= 0:
+        raise ValueError("The number of new samples must be > 0")
+
+    dm_contents = read(dm_fullname)
+    if dm_contents.shape[0] != spec["num_samples"]:
+        raise ValueError("The design matrix {} does not match its "
+                         "specification" .format(dm_fullname))
+
+    if spec["method"] == "lhs":
+        # The augmentation depends on the current size of the design
+        new_chunks = [lhs_augment(np.asarray(dm_contents), num_samples,
+                                  [spec["seed"], spec["num_samples"]])]
+    else:
+        new_chunks = generate(spec["method"], num_samples, spec["dimension"],
+                              spec["seed"], offset=spec["num_samples"],
+                              chunk_size=chunk_size)
+
+    dm_contents = append(dm_fullname, dm_contents, new_chunks, num_samples,
+                         chunk_size)
+
+    spec["num_samples"] += num_samples
+    spec["extensions"] = spec.get("extensions", []) + [num_samples]
+    write_spec(dm_fullname, spec)
+
+    return dm_contents
+
+
+def append(npy_fullname: str, dm_contents: np.ndarray, new_chunks,
+           num_samples: int, chunk_size: int=CHUNK_SIZE) -> np.ndarray:
+    """Write a design matrix with new samples appended into an npy file
+
+    The npy file is written under a temporary name and renamed afterward, it
+    can therefore be the file of the design matrix itself.
+
+    :param npy_fullname: the fullname of the npy file
+    :param dm_contents: the current design matrix
+    :param new_chunks: the iterable of 2-dimensional numpy arrays, the new
+        samples
+    :param num_samples: the total number of new samples in the chunks
+    :param chunk_size: the maximum number of rows copied at a time
+    :return: the design matrix with new samples, memory-mapped (read-only)
+    """
+    import os
+
+    num_rows, num_columns = dm_contents.shape
+    tmp_fullname = make_tmp_filename(npy_fullname)
+
+    npy_contents = np.lib.format.open_memmap(
+        tmp_fullname, mode="w+", dtype=np.float64,
+        shape=(num_rows + num_samples, num_columns))
+
+    try:
+        # Copy the current samples
+        for start in range(0, num_rows, chunk_size):
+            stop = min(start + chunk_size, num_rows)
+            npy_contents[start:stop, :] = dm_contents[start:stop, :]
+
+        # Append the new samples
+        offset = num_rows
+        for chunk in new_chunks:
+            chunk = np.atleast_2d(chunk)
+            if chunk.shape[1] != num_columns:
+                raise ValueError("The new samples have {} columns instead "
+                                 "of {}" .format(chunk.shape[1], num_columns))
+            if offset + chunk.shape[0] > num_rows + num_samples:
+                raise ValueError("More than {} new samples given"
+                                 .format(num_samples))
+            npy_contents[offset:offset+chunk.shape[0], :] = chunk
+            offset += chunk.shape[0]
+
+        if offset != num_rows + num_samples:
+            raise ValueError("{} new samples expected, {} given"
+                             .format(num_samples, offset - num_rows))
+
+        npy_contents.flush()
+    except BaseException:
+        del npy_contents
+        os.remove(tmp_fullname)
+        raise
+
+    del npy_contents
+
+    os.replace(tmp_fullname, npy_fullname)
+
+    return read(npy_fullname)
+
+
+def write_chunks(npy_fullname: str, shape: tuple, chunks):
+    """Write a design matrix into an npy file, a chunk at a time
+
+    The npy file is written under a temporary name and renamed afterward, so
+    that an existing file is never left half-written (e.g., on an error while
+    reading the chunks or an interruption).
+
+    :param npy_fullname: the fullname of the npy file
+    :param shape: the shape of the design matrix, (rows, columns)
+    :param chunks: the iterable of 2-dimensional numpy arrays, the rows of
+        the design matrix
+    """
+    import os
+
+    tmp_fullname = make_tmp_filename(npy_fullname)
+
+    npy_contents = np.lib.format.open_memmap(tmp_fullname, mode="w+",
+                                             dtype=np.float64, shape=shape)
+
+    try:
+        offset = 0
+        for chunk in chunks:
+            npy_contents[offset:offset+chunk.shape[0], :] = chunk
+            offset += chunk.shape[0]
+
+        if offset != shape[0]:
+            raise ValueError("{} rows expected, {} given"
+                             .format(shape[0], offset))
+
+        npy_contents.flush()
+    except BaseException:
+        del npy_contents
+        os.remove(tmp_fullname)
+        raise
+
+    del npy_contents
+
+    os.replace(tmp_fullname, npy_fullname)
+
+
+def make_tmp_filename(npy_fullname: str) -> str:
+    """Make the temporary fullname an npy file is written under
+
+    :param npy_fullname: the fullname of the npy file
+    :return: the temporary fullname, in the same directory
+    """
+    import os
+
+    return "{}.{}.tmp.npy" .format(os.path.splitext(npy_fullname)[0],
+                                   os.getpid())
+
+
+def lhs_augment(design: np.ndarray, num_samples: int, seed,
+                num_candidates: int=NUM_CANDIDATES) -> np.ndarray:
+    """Augment a Latin hypercube design with new samples
+
+    The strata are refined for the augmented number of samples. In each
+    dimension, the new samples are put at random into the strata not yet
+    occupied by the current samples (there are at least as many of them as
+    new samples) and randomly paired across the dimensions. The best of
+    several candidates according to the maximin criterion is selected.
+
+    :param design: the current design as 2-dimensional numpy array
+    :param num_samples: the number of new samples
+    :param seed: the seed of the random number generator (an int or a list of
+        int)
+    :param num_candidates: the number of candidate augmentations
+    :return: (np.ndarray) the new samples only
+    """
+    rng = np.random.default_rng(seed)
+    num_rows, dimension = design.shape
+    num_strata = num_rows + num_samples
+
+    # The empty strata of each dimension, refined
+    empty_strata = list()
+    for j in range(dimension):
+        occupied = np.minimum(np.floor(design[:, j] * num_strata),
+                              num_strata - 1).astype(int)
+        empty_strata.append(np.setdiff1d(np.arange(num_strata), occupied))
+
+    best_samples = None
+    best_distance = -1.0
+    for _ in range(num_candidates):
+        new_samples = np.empty((num_samples, dimension))
+        for j in range(dimension):
+            strata = rng.choice(empty_strata[j], num_samples, replace=False)
+            new_samples[:, j] = (strata + rng.random(num_samples)) / num_strata
+        distance = get_min_distance(np.vstack([design, new_samples]))
+        if distance > best_distance:
+            best_samples = new_samples
+            best_distance = distance
+
+    return best_samples
+
+
+def make_spec_filename(dm_fullname: str) -> str:
+    """Make the fullname of the specification of a generated design matrix
+
+    :param dm_fullname: the fullname of the npy file
+    :return: the fullname of the specification file
+    """
+    import os
+
+    return "{}.json" .format(os.path.splitext(dm_fullname)[0])
+
+
+def write_spec(dm_fullname: str, spec: dict):
+    """Write the specification of a generated design matrix
+
+    :param dm_fullname: the fullname of the npy file
+    :param spec: the specification with keys "method", "num_samples" (the
+        current number of samples), "dimension", "seed", and optionally
+        "extensions" (the number of samples added by each extension)
+    """
+    import json
+
+    with open(make_spec_filename(dm_fullname), "wt") as spec_file:
+        json.dump(spec, spec_file, indent=4, sort_keys=True)
+        spec_file.write("\n")
+
+
+def read_spec(dm_fullname: str) -> dict:
+    """Read the specification of a generated design matrix
+
+    :param dm_fullname: the fullname of the npy file
+    :return: the specification with keys "method", "num_samples",
+        "dimension", and "seed". None if the design matrix was not generated.
+    """
+    import os
+    import json
+
+    spec_filename = make_spec_filename(dm_fullname)
+    if not os.path.isfile(spec_filename):
+        return None
+
+    with open(spec_filename, "rt") as spec_file:
+        return json.load(spec_file)
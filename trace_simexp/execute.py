@@ -29,6 +29,12 @@ def get_input() -> dict:
     | num_procs            | (int) The number of processors to execute TRACE  |
     |                      | perturbed cases simultaneously                   |
     +----------------------+--------------------------------------------------+
+    | num_convs            | (int) The number of xtv to dmx conversions to    |
+    |                      | carry out simultaneously                         |
+    +----------------------+--------------------------------------------------+
+    | num_threads          | (int) The number of threads to remove the files  |
+    |                      | of dirty run directories with                    |
+    +----------------------+--------------------------------------------------+
     | scratch_dir          | (str or None) The scratch directory, if None     |
     |                      | the dmx link will not be created                 |
     +----------------------+--------------------------------------------------+
@@ -58,6 +64,10 @@ def get_input() -> dict:
     |                      | step even though info files and directory        |
     |                      | structures already exist                         |
     +----------------------+--------------------------------------------------+
+    | resume               | (bool) The flag to skip the samples finished     |
+    |                      | according to the journal and to reset the run    |
+    |                      | directories of the unfinished ones               |
+    +----------------------+--------------------------------------------------+
     | info_file            | (str) The filename of the exec infofile          |
     +----------------------+--------------------------------------------------+
     """
@@ -65,15 +75,15 @@ def get_input() -> dict:
 
     from . import cmdln_args
     from . import util
-    from .info_file import common, prepro
+    from .info_file import common, prepro, journal
     from .cmdln_args.common import get_samples
 
     # Read the command line arguments
     samples, \
         prepro_info_fullname, prepro_info_contents, \
-        num_procs, scratch_dir, \
+        num_procs, num_convs, num_threads, scratch_dir, \
         trace_exec, xtv2dmx_exec, \
-        overwrite, exec_filename = cmdln_args.execute.get()
+        overwrite, resume, exec_filename = cmdln_args.execute.get()
 
     # Read the pre-processing phase info file
     base_dir, case_name, params_list_name, dm_name, avail_samples = \
@@ -100,6 +110,8 @@ def get_input() -> dict:
         "prepro_info_fullname": prepro_info_fullname,
         "prepro_info_contents": prepro_info_contents,
         "num_procs": num_procs,
+        "num_convs": num_convs,
+        "num_threads": num_threads,
         "scratch_dir": scratch_dir,
         "trace_exec": trace_exec,
         "xtv2dmx_exec": xtv2dmx_exec,
@@ -110,6 +122,7 @@ def get_input() -> dict:
         "samples": samples,
         "hostname": hostname,
         "overwrite": overwrite,
+        "resume": resume,
     }
 
     # Create an infofile filename if not provided
@@ -120,30 +133,81 @@ def get_input() -> dict:
     # Add new entry to the dictionary
     exec_inputs["info_file"] = exec_filename
 
+    # Skip the samples already finished according to the journal
+    if resume:
+        exec_inputs["samples"] = journal.get_unfinished(
+            journal.make_filename(exec_inputs), samples)
+        for sample in samples:
+            if sample not in exec_inputs["samples"]:
+                print("Sample {} already finished - skipped" .format(sample))
+
     return exec_inputs
 
 
-def run_batches(exec_inputs: dict):
-    """Driver function to prepare run directory and execute TRACE in batches
+def run_queue(exec_inputs: dict):
+    """Driver function to prepare run directories and execute TRACE in a queue
 
-    1. The directories are prepared by making a link between dummy xtv in the
-       run directory and its corresponding scratch directory.
-    2. All the trace jobs are executed in parallel depending on the available
-       number of CPUs
-    3. After execution, a link is made between a dummy dmx file in the run
-       directory and its corresponding scratch directory.
-    4. Convert the xtv into dmx
-    5. Do directory clean up after TRACE execution and XTV conversion, all
-       unnecessary auxiliary files are removed to save disk space. The original
-       xtv file and its link are also removed.
+    Blocking wrapper around run_samples() for the command line interface.
 
     :param exec_inputs: (dict) the inputs for execution phase
     """
+    from .task import pipeline
+
+    pipeline.drain(run_samples(exec_inputs))
+
+
+async def run_samples(exec_inputs: dict, samples: list=None):
+    """Coroutine to execute the samples, yield an event per finished stage
+
+    The directories are prepared by making a link between dummy xtv and dmx
+    files in the run directory and their corresponding scratch directory, for
+    all samples in one pass. Afterward, each sample goes through its own chain
+    of stages:
+
+    1. simulate: execute TRACE, at most num_procs samples simultaneously.
+       A new sample is started as soon as any of the running ones is finished.
+    2. convert: convert the xtv into dmx, at most num_convs simultaneously
+    3. clean: remove all unnecessary auxiliary files to save disk space.
+       The original xtv file and its link are also removed.
+
+    If the input deck of a sample was deferred by the pre-processing phase
+    (i.e., it does not exist yet), it is rendered from the artifacts of the
+    pre-processing phase and its run directory is prepared only when the
+    sample is about to be simulated, see prepro.write_deferred().
+
+    The state of each sample (queued, running, simulated, converted, cleaned,
+    or failed) is appended to the journal in the design matrix directory,
+    see info_file.journal. The outcome of each TRACE run and xtv to dmx
+    conversion is recorded in the campaign database, see info_file.campaign.
+
+    A sample enters the next stage as soon as its previous stage is done, so
+    the conversion of a sample overlaps with the simulation of the others.
+    The coroutine can be driven from any asyncio event loop, e.g., alongside
+    other campaigns::
+
+        async for event in run_samples(exec_inputs):
+            if event["stage"] == "clean":
+                print("sample {} is done" .format(event["sample"]))
+
+    :param exec_inputs: (dict) the inputs for execution phase
+    :param samples: (list, int) the samples to execute, a subset of the
+        samples in exec_inputs. If None all of them are executed.
+    :return: an asynchronous iterator of events, each a dictionary with keys
+        "sample", "stage", and "returncode" (None for in-process stages)
+    """
+    import os
+    import time
+
+    from .task import pipeline
     from .task import trace
     from .task import xtv2dmx
     from .task import clean
+    from .info_file import journal
+    from .info_file import campaign
+    from .info_file import artifacts
+    from .info_file import manifest
+    from .prepro import write_deferred
     from .util import link_exec
-    from .util import create_iter
     from .util import make_dirnames
     from .util import make_auxfilenames
     from .util import exe_exists
@@ -163,148 +227,192 @@ def run_batches(exec_inputs: dict):
         xtv2dmx_is_in_path = False
         xtv2dmx_exec_name = get_name(exec_inputs["xtv2dmx_exec"], incl_ext=True)
 
-    num_samples = len(exec_inputs["samples"])
+    if samples is None:
+        samples = exec_inputs["samples"]
     case_name = exec_inputs["case_name"]
-    batch_int = 1
-    for batch_iter in create_iter(num_samples, exec_inputs["num_procs"]):
-
-        # Append the exec.info
-        info_file = open(exec_inputs["info_file"], "a")
-        info_file.writelines("*** Batch Execution - {:5d} ***\n"
-                             .format(batch_int))
-        info_file.close()
-        batch_int += 1
 
-        # Put the iterator from create_iter into a list for re-usage
-        # Use the samples instead of the bare iterator
-        list_iter = [exec_inputs["samples"][i] for i in list(batch_iter)]
+    # Create bunch of run directory names
+    run_dirnames = make_dirnames(samples, exec_inputs, False)
 
-        # Create bunch of run directory names
-        run_dirnames = make_dirnames(list_iter, exec_inputs, False)
+    # Create bunch of log files
+    log_filenames = make_auxfilenames(samples, case_name, ".log")
+    log_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
+                                                           log_filenames)]
 
-        # Create bunch of log files
-        log_filenames = make_auxfilenames(list_iter, case_name, ".log")
-        log_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               log_filenames)]
+    # Create bunch of xtv files
+    xtv_filenames = make_auxfilenames(samples, case_name, ".xtv")
+    xtv_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
+                                                           xtv_filenames)]
 
-        # Create bunch of xtv files
-        xtv_filenames = make_auxfilenames(list_iter, case_name, ".xtv")
-        xtv_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               xtv_filenames)]
+    # Create bunch of DMX files
+    dmx_filenames = make_auxfilenames(samples, case_name, ".dmx")
+    dmx_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
+                                                           dmx_filenames)]
 
-        if exec_inputs["scratch_dir"] is not None:
-            # If scratch directory specified make the symbolic links
-            # Create bunch of scratch directory names
-            scratch_dirnames = make_dirnames(list_iter, exec_inputs, True)
-            scratch_xtv_fullnames = [
-                "{}/{}".format(a, b) for a, b in zip(scratch_dirnames,
-                                                     xtv_filenames)]
-            # Link the xtv in the scratch
-            trace.link_xtv(scratch_dirnames, xtv_fullnames,
-                           scratch_xtv_fullnames)
-
-        # Create a bunch of trace input deck to be passed to the exec (no ext)
-        inp_filenames = make_auxfilenames(list_iter, case_name, "")
-
-        # If TRACE executable is not in the path, create a symlink in run dir
-        # Because for batch run to work with TRACE it has to be executed in
-        # the respective directory
-        if trace_is_in_path:
-            trace_exec = exec_inputs["trace_exec"]
-        else:
-            for run_dirname in run_dirnames:
-                link_exec(exec_inputs["trace_exec"], run_dirname)
-            trace_exec = "./{}" .format(trace_exec_name)
-
-        # Create a bunch of TRACE commands
-        trace_commands = trace.make_commands(trace_exec, inp_filenames)
-
-        # Execute TRACE commands
-        trace.run(trace_commands, log_fullnames,
-                  run_dirnames, exec_inputs["info_file"])
+    if exec_inputs["scratch_dir"] is not None:
+        # If scratch directory specified make the symbolic links
+        # Create bunch of scratch directory names
+        scratch_dirnames = make_dirnames(samples, exec_inputs, True)
+        scratch_xtv_fullnames = [
+            "{}/{}".format(a, b) for a, b in zip(scratch_dirnames,
+                                                 xtv_filenames)]
+        scratch_dmx_fullnames = [
+            "{}/{}".format(a, b) for a, b in zip(scratch_dirnames,
+                                                 dmx_filenames)]
+
+    # Create a bunch of trace input deck to be passed to the exec (no ext)
+    inp_filenames = make_auxfilenames(samples, case_name, "")
+    inp_fullnames = ["{}/{}.inp" .format(a, b) for a, b in zip(run_dirnames,
+                                                              inp_filenames)]
+
+    # If TRACE executable is not in the path, create a symlink in run dir
+    # Because for batch run to work with TRACE it has to be executed in
+    # the respective directory
+    if trace_is_in_path:
+        trace_exec = exec_inputs["trace_exec"]
+    else:
+        trace_exec = "./{}" .format(trace_exec_name)
 
-        # Create bunch of DMX files
-        dmx_filenames = make_auxfilenames(list_iter, case_name, ".dmx")
-        dmx_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               dmx_filenames)]
+    # If XTV2DMX exec. not in the path, create a symbolic link in run dir
+    if xtv2dmx_is_in_path:
+        xtv2dmx_exec = exec_inputs["xtv2dmx_exec"]
+    else:
+        xtv2dmx_exec = "./{}" .format(xtv2dmx_exec_name)
 
+    def prepare(indices: list):
         if exec_inputs["scratch_dir"] is not None:
-            # If scratch directory specified make the symbolic links
-            scratch_dmx_fullnames = [
-                "{}/{}" .format(a, b) for a, b in zip(scratch_dirnames,
-                                                      dmx_filenames)]
-
-            # Link the DMX in the scratch to the one in run directory
-            xtv2dmx.link_dmx(dmx_fullnames, scratch_dmx_fullnames)
-
-        # If XTV2DMX exec. not in the path, create a symbolic link in run dir
-        if xtv2dmx_is_in_path:
-            xtv2dmx_exec = exec_inputs["xtv2dmx_exec"]
-        else:
-            for run_dirname in run_dirnames:
-                link_exec(exec_inputs["xtv2dmx_exec"], run_dirname)
-            xtv2dmx_exec = "./{}" .format(xtv2dmx_exec_name)
-
-        # Create bunch of XTV2DMX commands
-        xtv2dmx_commands = xtv2dmx.make_commands(xtv2dmx_exec,
-                                                 xtv_filenames,
-                                                 dmx_filenames)
-
-        # Execute XTV2DMX commands
-        xtv2dmx.run(xtv2dmx_commands, log_fullnames,
-                    run_dirnames, exec_inputs["info_file"])
-
-        # Start to clean up things
-        aux_files_list = []
-
-        # Create bunch of .dif files
-        dif_filenames = make_auxfilenames(list_iter, case_name, ".dif")
-        dif_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               dif_filenames)]
-        aux_files_list.append(dif_fullnames)
-
-        # Create bunch of .tpr files
-        tpr_filenames = make_auxfilenames(list_iter, case_name, ".tpr")
-        tpr_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               tpr_filenames)]
-        aux_files_list.append(tpr_fullnames)
-
-        # Create bunch of .out files
-        out_filenames = make_auxfilenames(list_iter, case_name, ".out")
-        out_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               out_filenames)]
-        aux_files_list.append(out_fullnames)
-
-        # Create bunch of .echo files
-        ech_filenames = make_auxfilenames(list_iter, case_name, ".echo")
-        ech_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               ech_filenames)]
-        aux_files_list.append(ech_fullnames)
-
-        # Create bunch of .msg files
-        msg_filenames = make_auxfilenames(list_iter, case_name, ".msg")
-        msg_fullnames = ["{}/{}" .format(a, b) for a, b in zip(run_dirnames,
-                                                               msg_filenames)]
-        aux_files_list.append(msg_fullnames)
+            # Link the xtv and the dmx in the scratch
+            trace.link_xtv([scratch_dirnames[i] for i in indices],
+                           [xtv_fullnames[i] for i in indices],
+                           [scratch_xtv_fullnames[i] for i in indices])
+            xtv2dmx.link_dmx([dmx_fullnames[i] for i in indices],
+                             [scratch_dmx_fullnames[i] for i in indices])
+
+        # Link the executables not in the path
+        for i in indices:
+            if not trace_is_in_path:
+                link_exec(exec_inputs["trace_exec"], run_dirnames[i])
+            if not xtv2dmx_is_in_path:
+                link_exec(exec_inputs["xtv2dmx_exec"], run_dirnames[i])
+
+    # The input decks deferred by the pre-processing phase
+    deferred = set(i for i, inp_fullname in enumerate(inp_fullnames)
+                   if not os.path.isfile(inp_fullname))
+    if deferred:
+        deck_artifacts = artifacts.read(artifacts.make_filename(exec_inputs))
+        manifest_filename = manifest.make_filename(exec_inputs)
+
+    # Prepare the run directories of all the other samples in one pass
+    prepare([i for i in range(len(samples)) if i not in deferred])
+
+    # Create a bunch of TRACE commands
+    trace_commands = trace.make_commands(trace_exec, inp_filenames)
+
+    # Create bunch of XTV2DMX commands
+    xtv2dmx_commands = xtv2dmx.make_commands(xtv2dmx_exec,
+                                             xtv_filenames,
+                                             dmx_filenames)
+
+    # Journal of the state of each sample, to resume an interrupted phase
+    journal_filename = journal.make_filename(exec_inputs)
+    failed = set()
+
+    # Database of the outcome of each task, with the time each was started
+    db_filename = campaign.make_filename(exec_inputs)
+    started = dict()
+
+    def record(i: int, state: str, returncode: int=None):
+        # A failed sample is journaled once and stays failed
+        if i in failed:
+            return
+        if returncode is not None and returncode != 0:
+            failed.add(i)
+            state = "failed"
+        journal.append(journal_filename, [samples[i]], state)
+
+    def simulate(i: int):
+        if i in deferred:
+            # Render the input deck and prepare the run directory just in time
+            write_deferred(deck_artifacts, [samples[i]], [inp_fullnames[i]],
+                           manifest_filename)
+            prepare([i])
+        record(i, "running")
+        started[i] = time.time()
+        return trace.submit(trace_commands[i], log_fullnames[i],
+                            run_dirnames[i])
+
+    def simulated(i: int, returncode: int):
+        trace.report(trace_commands[i], returncode, log_fullnames[i],
+                     exec_inputs["info_file"])
+        campaign.add_task(db_filename, exec_inputs["info_file"], samples[i],
+                          "trace", trace_commands[i], returncode, started[i],
+                          time.time(), log_fullnames[i])
+        record(i, "simulated", returncode)
+
+    def convert(i: int):
+        started[i] = time.time()
+        return xtv2dmx.submit(xtv2dmx_commands[i], log_fullnames[i],
+                              run_dirnames[i])
+
+    def converted(i: int, returncode: int):
+        xtv2dmx.report(xtv2dmx_commands[i], returncode, log_fullnames[i],
+                       exec_inputs["info_file"])
+        campaign.add_task(db_filename, exec_inputs["info_file"], samples[i],
+                          "xtv2dmx", xtv2dmx_commands[i], returncode,
+                          started[i], time.time(), log_fullnames[i])
+        record(i, "converted", returncode)
+
+    def cleanup(i: int):
+        # Collect the auxiliary files of the sample
+        aux_files = ["{}/{}{}" .format(run_dirnames[i], inp_filenames[i], ext)
+                     for ext in [".dif", ".tpr", ".out", ".echo", ".msg"]]
 
         # Collect the xtv files
-        aux_files_list.append(xtv_fullnames)
+        aux_files.append(xtv_fullnames[i])
         if exec_inputs["scratch_dir"] is not None:
-            aux_files_list.append(scratch_xtv_fullnames)
+            aux_files.append(scratch_xtv_fullnames[i])
 
         # Collect all the symbolic link of executables (if exists)
         if not trace_is_in_path:
-            trace_links = ["{}/{}" .format(run_dirname, trace_exec_name)
-                           for run_dirname in run_dirnames]
-            aux_files_list.append(trace_links)
+            aux_files.append("{}/{}" .format(run_dirnames[i], trace_exec_name))
         if not xtv2dmx_is_in_path:
-            xtv2dmx_links = ["{}/{}" .format(run_dirname, xtv2dmx_exec_name)
-                             for run_dirname in run_dirnames]
-            aux_files_list.append(xtv2dmx_links)
-
-        # Clean up TRACE directories
-        for aux_files in aux_files_list:
-            clean.rm_files(aux_files)
+            aux_files.append("{}/{}" .format(run_dirnames[i],
+                                             xtv2dmx_exec_name))
+
+        # Clean up TRACE directory
+        clean.rm_files(aux_files)
+
+    # Chain of stages each sample goes through, independent of other samples
+    stages = list()
+    stages.append({
+        "name": "simulate",
+        "num_procs": exec_inputs["num_procs"],
+        "start": simulate,
+        "finish": simulated,
+        "timeout": trace.TIMEOUT
+    })
+    stages.append({
+        "name": "convert",
+        "num_procs": exec_inputs["num_convs"],
+        "start": convert,
+        "finish": converted,
+        "timeout": xtv2dmx.TIMEOUT
+    })
+    stages.append({
+        "name": "clean",
+        "num_procs": None,
+        "start": cleanup,
+        "finish": lambda i, returncode: record(i, "cleaned")
+    })
+
+    # All samples wait in the queue
+    journal.append(journal_filename, samples, "queued")
+
+    # Move every sample through the stages as soon as it is ready
+    async for event in pipeline.iterate(len(samples), stages):
+        yield {"sample": samples[event["job"]],
+               "stage": event["stage"],
+               "returncode": event["returncode"]}
 
 
 def check_dirtree(exec_inputs: dict):
@@ -312,12 +420,18 @@ def check_dirtree(exec_inputs: dict):
 
     "Clean" means there is no other file other than the TRACE input deck itself
 
+    A missing input deck (or run directory) is accepted only if the sample
+    was deferred by the pre-processing phase (as recorded in its artifacts),
+    the input deck is then rendered just before the sample is executed (see
+    run_samples()).
+
     :param exec_inputs: the execute phase inputs
     :return: list of dirty directory tree
     """
     import os
     from .util import make_dirnames
     from .util import make_auxfilenames
+    from .info_file import artifacts
 
     dirty_dirs = []
     dirty_dir_nums = []
@@ -330,13 +444,22 @@ def check_dirtree(exec_inputs: dict):
                                       exec_inputs["case_name"],
                                       ".inp")
     
+    # The input decks deferred to the execute phase
+    deferred = set(artifacts.read_deferred(
+        artifacts.make_filename(exec_inputs)))
+
     # Loop over run directories and input filenames and grab the invalid ones
     for i, (run_dirname, inp_filename) in \
         enumerate(zip(run_dirnames, inp_filenames)):
-        if len(os.listdir(run_dirname)) > 1:
+        if os.path.isdir(run_dirname):
+            run_files = os.listdir(run_dirname)
+        else:
+            run_files = []
+        if [_ for _ in run_files if _ != inp_filename]:
             dirty_dirs.append(run_dirname)
             dirty_dir_nums.append(exec_inputs["samples"][i])
-        if inp_filename not in os.listdir(run_dirname):
+        if inp_filename not in run_files and \
+                exec_inputs["samples"][i] not in deferred:
             empty_dirs.append(run_dirname)
 
     # Check if there is empty run directory
@@ -347,7 +470,8 @@ def check_dirtree(exec_inputs: dict):
         raise ValueError("Some input file does not exist!")
     # Check if there is dirty run directory
     elif dirty_dirs:
-        if not exec_inputs["overwrite"]:
+        # When resuming, the dirty directories belong to unfinished samples
+        if not (exec_inputs["overwrite"] or exec_inputs.get("resume")):
             for dirty_dir in dirty_dirs:
                 print("{} run directory is dirty!"
                       .format(dirty_dir))
@@ -387,18 +511,24 @@ def clean_dirtree(exec_inputs: dict, dirty_dir_nums: list):
                                       exec_inputs["case_name"],
                                       ".inp")
 
+    num_threads = exec_inputs["num_threads"]
+    counts = [(0, 0)]
+
     # Clean scratch directories if they do exist
     if exec_inputs["scratch_dir"] is not None:
         # Create list of scratch directories
         scratch_dirnames = make_dirnames(dirty_dir_nums, exec_inputs, True)
         # Clean scratch dirs
-        clean.rm_files(scratch_dirnames)
+        counts.append(clean.rm_files(scratch_dirnames, num_threads))
 
     # Clean dmx links
-    clean.rm_files(dmx_fullnames)
+    counts.append(clean.rm_files(dmx_fullnames, num_threads))
 
     # Clean the rest
-    clean.rm_except(run_dirnames, inp_filenames)
+    counts.append(clean.rm_except(run_dirnames, inp_filenames, num_threads))
+
+    print("Dirty run directories cleaned: {}"
+          .format(clean.format_count(clean.total(counts))))
 
 
 def reset(reset_inputs: dict):
@@ -414,6 +544,7 @@ def reset(reset_inputs: dict):
     from .util import make_dirnames
     from .util import make_auxfilenames
     from .task import clean
+    from .info_file import journal
 
     run_dirnames = make_dirnames(reset_inputs["samples"], reset_inputs, False)
 
@@ -456,19 +587,31 @@ def reset(reset_inputs: dict):
                         " Warning: this will delete all except *.inp file.",
                         default="no"):
 
+            num_threads = reset_inputs["num_threads"]
+            counts = [(0, 0)]
+
             # Clean scratch dirs if they do exist
             if reset_inputs["scratch_dir"] is not None:
                 # Create list of scratch directories
                 scratch_dirnames = make_dirnames(reset_inputs["samples"],
                                                  reset_inputs, True)
                 # Clean scratch dirs
-                clean.rm_files(scratch_dirnames)
+                counts.append(clean.rm_files(scratch_dirnames, num_threads))
 
             # Clean dmx links in the run directories
-            clean.rm_files(dmx_fullnames)
+            counts.append(clean.rm_files(dmx_fullnames, num_threads))
 
             # Clean the rest, except the input file itself
-            clean.rm_except(run_dirnames, inp_filenames)
+            counts.append(clean.rm_except(run_dirnames, inp_filenames,
+                                          num_threads))
+
+            print(clean.format_count(clean.total(counts)))
+
+            # The samples have to be executed again when resuming
+            journal_filename = journal.make_filename(reset_inputs)
+            if os.path.isfile(journal_filename):
+                journal.append(journal_filename, reset_inputs["samples"],
+                               "reset")
     
     if broken:
         # If something Broken 
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.extend
+    *******************
+
+    Main module to extend an existing simulation campaign with new samples
+
+    The new samples are appended to the design matrix of the campaign, which
+    keeps its name, so that their run directories are created in the same
+    directory tree. Only the input decks of the new samples are generated and
+    only the new samples are listed in the resulting prepro info file, to be
+    passed to the execute phase and, afterward, the post-processing phase.
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def get_input() -> dict:
+    """Get the command line arguments, read the info file, and construct dict
+
+    The campaign design matrix is extended beforehand, either by generating
+    new samples (for a generated design matrix) or by appending the rows of
+    another design matrix file. In the latter case, the design matrix of the
+    campaign is copied into the design matrix directory as an npy file, named
+    after the design matrix, see design_matrix.append(). Whichever prepro
+    info file of the campaign is given, the extension continues from the
+    design matrix in the design matrix directory if there is one, the design
+    matrix of the info file must then be the start of it.
+
+    :return: All the inputs required for pre-processing the new samples in a
+        dictionary, with the same keys as prepro.get_input() and the
+        following additional one
+
+    +----------------------+--------------------------------------------------+
+    | Key                  | Value                                            |
+    +======================+==================================================+
+    | prepro_info_fullname | (str) The fullname of the prepro info file of    |
+    |                      | the extended campaign                            |
+    +----------------------+--------------------------------------------------+
+    """
+    import os
+    import numpy as np
+
+    from . import cmdln_args
+    from . import util
+    from . import design_matrix
+    from .info_file import common, prepro
+
+    # Read the command line arguments
+    prepro_info_fullname, prepro_info_contents, \
+        num_new, new_dm_fullname, \
+        overwrite, num_workers, lazy, info, \
+        prepro_filename = cmdln_args.extend.get()
+
+    # Read the pre-processing phase info file of the campaign
+    base_dirname, case_name, params_list_name, dm_name, _ = \
+        prepro.read(prepro_info_contents)
+    tracin_base_fullname, params_list_fullname, dm_fullname, \
+        campaign_info = prepro.read_fullnames(prepro_info_contents)
+
+    # Read the base TRACE input deck and the list of parameters file
+    with open(tracin_base_fullname, "rt") as tracin_file:
+        tracin_base_contents = tracin_file.read().splitlines()
+    with open(params_list_fullname, "rt") as params_list_file:
+        params_list_contents = params_list_file.read().splitlines()
+
+    # The current design matrix of the campaign, an extended (or generated)
+    # design matrix is in the design matrix directory
+    campaign_dm_fullname = os.path.join(
+        base_dirname, case_name,
+        "{}-{}" .format(params_list_name, dm_name),
+        "{}.npy" .format(dm_name))
+    dm_contents = design_matrix.read(dm_fullname)
+    if os.path.isfile(campaign_dm_fullname):
+        campaign_dm_contents = design_matrix.read(campaign_dm_fullname)
+        # The info file may be of an earlier state of the campaign, but not
+        # of another design matrix
+        if dm_contents.shape[1] != campaign_dm_contents.shape[1] or \
+                dm_contents.shape[0] > campaign_dm_contents.shape[0] or \
+                not np.array_equal(
+                    dm_contents,
+                    campaign_dm_contents[:dm_contents.shape[0], :]):
+            raise ValueError("The design matrix {} is not the start of the "
+                             "design matrix of the campaign {}"
+                             .format(dm_fullname, campaign_dm_fullname))
+        dm_fullname = campaign_dm_fullname
+        dm_contents = campaign_dm_contents
+    num_samples = dm_contents.shape[0]
+
+    if num_new is not None:
+        # Generate the new samples, continuing the design matrix
+        dm_contents = design_matrix.extend(dm_fullname, num_new)
+    else:
+        if design_matrix.read_spec(dm_fullname) is not None:
+            raise ValueError("The design matrix {} was generated, extend it "
+                             "with a number of new samples instead"
+                             .format(dm_fullname))
+
+        # The rows of the file after the current ones (if it starts with
+        # them, i.e., rows were appended to it) or all of them are new
+        new_contents = design_matrix.read(new_dm_fullname)
+        if new_contents.shape[0] >= num_samples and \
+                np.array_equal(new_contents[:num_samples, :], dm_contents):
+            new_contents = new_contents[num_samples:, :]
+        if new_contents.shape[0] == 0:
+            raise ValueError("No new samples in {}" .format(new_dm_fullname))
+
+        # Keep the extended design matrix in the design matrix directory
+        dm_contents = design_matrix.append(campaign_dm_fullname, dm_contents,
+                                           [new_contents],
+                                           new_contents.shape[0])
+        dm_fullname = campaign_dm_fullname
+
+    # Only the new samples are pre-processed
+    samples = list(range(num_samples + 1, dm_contents.shape[0] + 1))
+    print("Campaign extended with samples {} to {}"
+          .format(samples[0], samples[-1]))
+
+    # Construct the dictionary, as in the pre-processing phase
+    inputs = {
+        "samples": samples,
+        "base_dirname": base_dirname,
+        "base_name": util.get_name(base_dirname),
+        "tracin_base_contents": tracin_base_contents,
+        "tracin_base_fullname": tracin_base_fullname,
+        "case_name": case_name,
+        "dm_contents": dm_contents,
+        "dm_fullname": dm_fullname,
+        "dm_name": dm_name,
+        "doe_spec": design_matrix.read_spec(dm_fullname),
+        "params_list_contents": params_list_contents,
+        "params_list_fullname": params_list_fullname,
+        "params_list_name": params_list_name,
+        "overwrite": overwrite,
+        "num_workers": num_workers,
+        "lazy": lazy,
+        "info": info if info is not None else campaign_info,
+        "prepro_info_fullname": prepro_info_fullname
+    }
+
+    # Create the filename for the info file of the new samples
+    if os.path.isdir(prepro_filename):
+        # Append the filename with the full path
+        prepro_filename = os.path.join(prepro_filename,
+                                       common.make_filename(inputs, "prepro"))
+    # Add new entry to the dictionary
+    inputs["info_file"] = prepro_filename
+
+    return inputs
@@ -9,6 +9,10 @@ from . import prepro
 from . import execute
 from . import postpro
 from . import common
+from . import journal
+from . import campaign
+from . import manifest
+from . import artifacts
 
 
 __author__ = "Damar Wicaksono"
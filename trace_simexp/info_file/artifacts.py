@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.info_file.artifacts
+    ********************************
+
+    Module to save and load the artifacts of the pre-processing phase, i.e.,
+    everything required to render a perturbed input deck: the compiled
+    template, the list of parameters with their nominal values, and the design
+    matrix. The execute phase renders a missing input deck from them just
+    before the sample is executed.
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def make_filename(inputs: dict) -> str:
+    """Create the fullname of the artifacts file of a simulation campaign
+
+    The artifacts are located in the design matrix directory, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/prepro.artifacts"
+
+    :param inputs: the inputs of a phase in dictionary
+    :return: the fullname of the artifacts file
+    """
+    import os
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "prepro.artifacts")
+
+
+def write(artifacts_filename: str, tracin_template: dict, params_dict: list,
+          dm_contents, digest: str, deferred: list=None):
+    """Save the artifacts of the pre-processing phase
+
+    The file is written under a temporary name and renamed afterward, so an
+    execute phase never reads a partially written file.
+
+    :param artifacts_filename: the fullname of the artifacts file
+    :param tracin_template: the compiled TRACE template
+    :param params_dict: the list of perturbed parameters
+    :param dm_contents: (array) the whole design matrix. A memory-mapped one
+        (from an npy file) is saved by its fullname and not by its contents.
+    :param digest: the part of the content hash common to all samples, see
+        manifest.get_digest()
+    :param deferred: (list, int) the samples whose input deck was deferred to
+        the execute phase, only their missing input decks are rendered there
+    """
+    import os
+    import pickle
+    import numpy as np
+    from .._version import __version__
+
+    artifacts = {
+        "version": __version__,
+        "tracin_template": tracin_template,
+        "params_dict": params_dict,
+        "dm_contents": dm_contents,
+        "dm_fullname": None,
+        "digest": digest,
+        "deferred": sorted(deferred) if deferred is not None else []
+    }
+
+    if isinstance(dm_contents, np.memmap) and dm_contents.filename:
+        artifacts["dm_contents"] = None
+        artifacts["dm_fullname"] = dm_contents.filename
+
+    tmp_filename = "{}.{}.tmp" .format(artifacts_filename, os.getpid())
+    with open(tmp_filename, "wb") as artifacts_file:
+        pickle.dump(artifacts, artifacts_file, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_filename, artifacts_filename)
+
+
+def read(artifacts_filename: str) -> dict:
+    """Load the artifacts of the pre-processing phase
+
+    :param artifacts_filename: the fullname of the artifacts file
+    :return: the artifacts in a dictionary with keys "version",
+        "tracin_template", "params_dict", "dm_contents", "dm_fullname",
+        "digest", and "deferred". The design matrix saved by its fullname is memory-mapped.
+    """
+    import pickle
+    from .._version import __version__
+    from .. import design_matrix
+
+    with open(artifacts_filename, "rb") as artifacts_file:
+        artifacts = pickle.load(artifacts_file)
+
+    if artifacts["version"] != __version__:
+        raise ValueError("The artifacts {} were created by trace-simexp "
+                         "version {}, run the pre-processing phase again"
+                         .format(artifacts_filename, artifacts["version"]))
+
+    if artifacts["dm_contents"] is None:
+        artifacts["dm_contents"] = design_matrix.read(artifacts["dm_fullname"])
+
+    return artifacts
+
+
+def read_deferred(artifacts_filename: str) -> list:
+    """Get the samples whose input deck was deferred to the execute phase
+
+    :param artifacts_filename: the fullname of the artifacts file
+    :return: (list, int) the deferred samples, empty if there is no artifacts
+        file
+    """
+    import os
+    import pickle
+
+    if not os.path.isfile(artifacts_filename):
+        return []
+
+    with open(artifacts_filename, "rb") as artifacts_file:
+        artifacts = pickle.load(artifacts_file)
+
+    return artifacts.get("deferred", [])
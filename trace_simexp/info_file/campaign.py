@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.info_file.campaign
+    *******************************
+
+    Module to store the state of a simulation campaign in an SQLite database,
+    the phases, their samples, and the outcome of each task (a TRACE run, an
+    xtv to dmx conversion, or an AptPlot extraction) with its timings, return
+    code, and files, and the sections appended to the info file of a phase
+    after its summary (e.g., the outputs of the post-processing phase). The
+    info files of each phase can be produced as a view of the database.
+"""
+
+__author__ = "Damar Wicaksono"
+
+# The tables of the campaign database
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS phases (
+    id          INTEGER PRIMARY KEY,
+    phase       TEXT,
+    info_file   TEXT UNIQUE NOT NULL,
+    hostname    TEXT,
+    created     REAL,
+    contents    TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    phase_id    INTEGER NOT NULL REFERENCES phases(id),
+    sample      INTEGER NOT NULL,
+    PRIMARY KEY (phase_id, sample)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id          INTEGER PRIMARY KEY,
+    phase_id    INTEGER NOT NULL REFERENCES phases(id),
+    sample      INTEGER NOT NULL,
+    task        TEXT NOT NULL,
+    command     TEXT,
+    returncode  INTEGER,
+    started     REAL,
+    finished    REAL,
+    log_file    TEXT
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id          INTEGER PRIMARY KEY,
+    phase_id    INTEGER NOT NULL REFERENCES phases(id),
+    written     REAL,
+    contents    TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_outcome ON tasks (task, returncode);
+CREATE INDEX IF NOT EXISTS tasks_sample ON tasks (sample);
+"""
+
+# The tasks recorded in the database, an "aptplot" task is a session
+# extracting several runs, each run is recorded as an "extract" task with the
+# run name as its command
+TASKS = ["trace", "xtv2dmx", "aptplot", "extract"]
+
+
+def make_filename(inputs: dict) -> str:
+    """Create the fullname of the database file of a simulation campaign
+
+    The database is located in the design matrix directory, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/campaign.db"
+
+    :param inputs: the inputs of a phase in dictionary
+    :return: the fullname of the database file
+    """
+    import os
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "campaign.db")
+
+
+def connect(db_filename: str):
+    """Open the campaign database, create the tables if they do not exist
+
+    :param db_filename: the fullname of the database file, the directory is
+        created if it does not exist
+    :return: an sqlite3.Connection to the database
+    """
+    import os
+    import sqlite3
+
+    db_dirname = os.path.dirname(db_filename)
+    if db_dirname and not os.path.exists(db_dirname):
+        os.makedirs(db_dirname)
+
+    # Several phases might write to the same campaign at the same time
+    connection = sqlite3.connect(db_filename, timeout=60)
+    connection.executescript(SCHEMA)
+
+    return connection
+
+
+def get_phase_id(connection, info_filename: str) -> int:
+    """Get the id of the phase documented by an info file, add it if new
+
+    :param connection: the sqlite3.Connection to the campaign database
+    :param info_filename: the fullname of the info file of the phase
+    :return: the id of the phase
+    """
+    connection.execute("INSERT OR IGNORE INTO phases (info_file) VALUES (?)",
+                       (info_filename, ))
+    row = connection.execute("SELECT id FROM phases WHERE info_file = ?",
+                             (info_filename, )).fetchone()
+
+    return row[0]
+
+
+def add_phase(db_filename: str, phase: str, info_filename: str,
+              samples: list, hostname: str=None):
+    """Record a phase in the database, after its info file has been written
+
+    The contents of the info file written so far (i.e., the summary of the
+    command line arguments) are stored along with the phase. As the info file
+    is written anew, the samples, tasks, and sections recorded under a
+    previous phase with the same info file are removed.
+
+    :param db_filename: the fullname of the database file
+    :param phase: the phase, either "prepro", "exec", or "postpro"
+    :param info_filename: the fullname of the info file of the phase
+    :param samples: (list, int) the samples of the phase
+    :param hostname: the name of the machine the phase is carried out
+    """
+    import time
+
+    if phase not in ["prepro", "exec", "postpro"]:
+        raise ValueError("*{}* is not a valid phase!" .format(phase))
+
+    with open(info_filename, "rt") as info_file:
+        contents = info_file.read()
+
+    connection = connect(db_filename)
+    try:
+        with connection:
+            phase_id = get_phase_id(connection, info_filename)
+            for table in ["samples", "tasks", "sections"]:
+                connection.execute(
+                    "DELETE FROM {} WHERE phase_id = ?" .format(table),
+                    (phase_id, ))
+            connection.execute(
+                "UPDATE phases SET phase = ?, hostname = ?, created = ?, "
+                "contents = ? WHERE id = ?",
+                (phase, hostname, time.time(), contents, phase_id))
+            connection.executemany(
+                "INSERT OR IGNORE INTO samples (phase_id, sample) "
+                "VALUES (?, ?)",
+                [(phase_id, sample) for sample in samples])
+    finally:
+        connection.close()
+
+
+def get_created(db_filename: str, info_filename: str) -> float:
+    """Get the time a phase was recorded, i.e., right after its info file
+
+    :param db_filename: the fullname of the database file
+    :param info_filename: the fullname of the info file of the phase
+    :return: the time the phase was recorded, in seconds since the epoch.
+        None if it is not recorded.
+    """
+    connection = connect(db_filename)
+    try:
+        row = connection.execute(
+            "SELECT created FROM phases WHERE info_file = ?",
+            (info_filename, )).fetchone()
+    finally:
+        connection.close()
+
+    return None if row is None else row[0]
+
+
+def add_task(db_filename: str, info_filename: str, sample: int, task: str,
+             command: list, returncode: int, started: float, finished: float,
+             log_file: str=None):
+    """Record the outcome of a finished task in the database
+
+    :param db_filename: the fullname of the database file
+    :param info_filename: the fullname of the info file of the phase
+    :param sample: the sample of the task
+    :param task: the task, one of TASKS
+    :param command: the shell command of the task
+    :param returncode: the return code of the task
+    :param started: the time the task was started, in seconds since the epoch
+    :param finished: the time the task was finished, in seconds since the epoch
+    :param log_file: the log fullname of the task
+    """
+    import subprocess
+
+    if task not in TASKS:
+        raise ValueError("*{}* is not a valid task!" .format(task))
+
+    connection = connect(db_filename)
+    try:
+        with connection:
+            phase_id = get_phase_id(connection, info_filename)
+            connection.execute(
+                "INSERT INTO tasks (phase_id, sample, task, command, "
+                "returncode, started, finished, log_file) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (phase_id, sample, task, subprocess.list2cmdline(command),
+                 returncode, started, finished, log_file))
+    finally:
+        connection.close()
+
+
+def add_section(db_filename: str, info_filename: str, contents: str):
+    """Record a section appended to the info file of a phase in the database
+
+    :param db_filename: the fullname of the database file
+    :param info_filename: the fullname of the info file of the phase
+    :param contents: the contents of the section, as appended to the info file
+    """
+    import time
+
+    connection = connect(db_filename)
+    try:
+        with connection:
+            phase_id = get_phase_id(connection, info_filename)
+            connection.execute(
+                "INSERT INTO sections (phase_id, written, contents) "
+                "VALUES (?, ?, ?)",
+                (phase_id, time.time(), contents))
+    finally:
+        connection.close()
+
+
+def get_tasks(db_filename: str, task: str=None, failed: bool=False,
+              info_filename: str=None) -> list:
+    """Get the recorded tasks, optionally of a given kind, outcome, or phase
+
+    :param db_filename: the fullname of the database file
+    :param task: the task, one of TASKS. If None all tasks are returned.
+    :param failed: the flag to return only the failed tasks
+    :param info_filename: the fullname of the info file of the phase. If None
+        the tasks of all phases are returned.
+    :return: (list, dict) the tasks in the order they finished, each with
+        keys "sample", "task", "command", "returncode", "started", "finished",
+        "log_file", and "info_file"
+    """
+    query = "SELECT tasks.sample, tasks.task, tasks.command, " \
+            "tasks.returncode, tasks.started, tasks.finished, " \
+            "tasks.log_file, phases.info_file " \
+            "FROM tasks JOIN phases ON tasks.phase_id = phases.id"
+    conditions = []
+    values = []
+    if task is not None:
+        conditions.append("tasks.task = ?")
+        values.append(task)
+    if failed:
+        conditions.append("tasks.returncode != 0")
+    if info_filename is not None:
+        conditions.append("phases.info_file = ?")
+        values.append(info_filename)
+    if conditions:
+        query = "{} WHERE {}" .format(query, " AND ".join(conditions))
+    query = "{} ORDER BY tasks.finished, tasks.id" .format(query)
+
+    keys = ["sample", "task", "command", "returncode", "started", "finished",
+            "log_file", "info_file"]
+
+    connection = connect(db_filename)
+    try:
+        rows = connection.execute(query, values).fetchall()
+    finally:
+        connection.close()
+
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def get_failed(db_filename: str, task: str, info_filename: str=None) -> list:
+    """Get the samples of which the task failed, e.g., the xtv2dmx conversion
+
+    :param db_filename: the fullname of the database file
+    :param task: the task, one of TASKS
+    :param info_filename: the fullname of the info file of the phase. If None
+        the failures of all phases are returned.
+    :return: (list, int) the sorted samples
+    """
+    tasks = get_tasks(db_filename, task, True, info_filename)
+
+    return sorted(set(task["sample"] for task in tasks))
+
+
+def read_info(db_filename: str, info_filename: str) -> list:
+    """Produce the contents of an info file from the database
+
+    The contents are the stored summary of the phase followed by a line for
+    each of its tasks and by its appended sections, in the order they were
+    recorded, as in the info file itself. An "extract" task only has a line
+    if it failed. The contents can be passed to the read() function of the
+    respective phase.
+
+    :param db_filename: the fullname of the database file
+    :param info_filename: the fullname of the info file of the phase
+    :return: (list, str) the contents of the info file, line by line
+    """
+    connection = connect(db_filename)
+    try:
+        row = connection.execute(
+            "SELECT contents FROM phases WHERE info_file = ?",
+            (info_filename, )).fetchone()
+        sections = connection.execute(
+            "SELECT sections.written, sections.contents FROM sections "
+            "JOIN phases ON sections.phase_id = phases.id "
+            "WHERE phases.info_file = ? ORDER BY sections.written, "
+            "sections.id", (info_filename, )).fetchall()
+    finally:
+        connection.close()
+
+    if row is None or row[0] is None:
+        raise ValueError("{} is not recorded in {}"
+                         .format(info_filename, db_filename))
+
+    # The lines of the tasks and the sections with the time they were written
+    entries = list()
+    for task in get_tasks(db_filename, info_filename=info_filename):
+        if task["task"] == "extract":
+            if task["returncode"] != 0:
+                entries.append((task["finished"],
+                                ["Extraction Failed: {}\n"
+                                 .format(task["command"])]))
+        elif task["returncode"] != 0:
+            entries.append((task["finished"],
+                            ["Execution Failed: {}\n"
+                             .format(task["command"])]))
+        else:
+            entries.append((task["finished"],
+                            ["Execution Successful: {}\n"
+                             .format(task["command"])]))
+    for written, contents in sections:
+        entries.append((written, contents.splitlines(keepends=True)))
+
+    contents = row[0].splitlines(keepends=True)
+    for _, lines in sorted(entries, key=lambda entry: entry[0]):
+        contents.extend(lines)
+
+    return contents
+
+
+def write_info(db_filename: str, info_filename: str, output_filename: str):
+    """Write an info file from the database, e.g., to restore a lost one
+
+    :param db_filename: the fullname of the database file
+    :param info_filename: the fullname of the info file of the phase
+    :param output_filename: the fullname of the info file to be written
+    """
+    with open(output_filename, "wt") as info_file:
+        info_file.writelines(read_info(db_filename, info_filename))
+
+
+def check_info(db_filename: str, info_filename: str) -> bool:
+    """Check that an info file is the same as its view of the database
+
+    :param db_filename: the fullname of the database file
+    :param info_filename: the fullname of the info file of the phase
+    :return: True if the contents of the info file are the same as the ones
+        produced from the database, see read_info()
+    """
+    with open(info_filename, "rt") as info_file:
+        contents = info_file.read().splitlines(keepends=True)
+
+    return contents == read_info(db_filename, info_filename)
@@ -76,7 +76,7 @@ def write(inputs: dict):
               "List of Parameters Name", "Design Matrix Name",
               "TRACE Executable", "XTV2DMX Executable",
               "Scratch Directory Name", "Number of Processors",
-              "Samples to Run"]
+              "Number of Converters", "Samples to Run"]
 
     with open(inputs["info_file"], "wt") as info_file:
         info_file.writelines("TRACE Simulation Experiment - Date: {}\n"
@@ -133,8 +133,12 @@ def write(inputs: dict):
                              .format(header[9], "->", inputs["num_procs"],
                                      inputs["hostname"]))
 
+        # Number of simultaneous xtv to dmx conversions
+        info_file.writelines("{:<30s}{:3s}{:<3d}\n"
+                             .format(header[10], "->", inputs["num_convs"]))
+
         # Samples to Run
-        info_file.writelines("{:<30s}{:3s}\n" .format(header[10], "->"))
+        info_file.writelines("{:<30s}{:3s}\n" .format(header[11], "->"))
         common.write_by_tens(inputs["samples"], "5d", info_file)
         # Mark the end of samples
         info_file.writelines("***  End of Samples  ***\n")
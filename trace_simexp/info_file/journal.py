@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.info_file.journal
+    ******************************
+
+    Module to write and read the journal of the execute phase, an append-only
+    record of the state of each sample used to resume an interrupted campaign
+"""
+
+__author__ = "Damar Wicaksono"
+
+# The states of a sample in the execute phase, in the order they are reached
+STATES = ["queued", "running", "simulated", "converted", "cleaned", "failed",
+          "reset", "stale"]
+
+# A sample in this state needs not to be executed again
+FINISHED = "cleaned"
+
+# A sample in one of these states has its final dmx file
+CONVERTED = ["converted", "cleaned"]
+
+# The format of the moment of an entry
+MOMENT_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def make_filename(inputs: dict) -> str:
+    """Create the fullname of the journal file of a simulation campaign
+
+    The journal is located in the design matrix directory, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/exec.journal"
+
+    :param inputs: the inputs of a phase in dictionary
+    :return: the fullname of the journal file
+    """
+    import os
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "exec.journal")
+
+
+def append(journal_filename: str, samples: list, state: str):
+    """Append the new state of the samples to the journal
+
+    The entries are flushed and synchronized to disk before returning so that
+    the journal survives an interruption (e.g., a node reboot) of the phase.
+
+    :param journal_filename: the fullname of the journal file
+    :param samples: (list, int) the samples
+    :param state: the new state of the samples, one of STATES
+    """
+    import os
+    import time
+
+    if state not in STATES:
+        raise ValueError("*{}* is not a valid sample state!" .format(state))
+
+    moment = time.strftime(MOMENT_FORMAT)
+
+    with open(journal_filename, "a") as journal_file:
+        # Terminate a partially written line left by an interruption
+        if journal_file.tell() > 0:
+            with open(journal_filename, "rb") as check_file:
+                check_file.seek(-1, os.SEEK_END)
+                if check_file.read(1) != b"\n":
+                    journal_file.write("\n")
+        for sample in samples:
+            journal_file.writelines("{:>8d} {:<10s} {}\n"
+                                    .format(sample, state, moment))
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+
+
+def read(journal_filename: str, since: float=None) -> dict:
+    """Read the journal and get the latest state of each sample
+
+    A partially written last line (e.g., due to an interruption) is ignored.
+
+    :param journal_filename: the fullname of the journal file
+    :param since: only the entries written at or after this time (in seconds
+        since the epoch, to the second) are read. If None, all of them.
+    :return: the latest state of each sample, keyed by the sample number.
+        Empty if the journal does not exist.
+    """
+    import os
+    import time
+
+    states = dict()
+
+    if not os.path.isfile(journal_filename):
+        return states
+
+    with open(journal_filename, "r") as journal_file:
+        for line in journal_file:
+            entry = line.split()
+            if not line.endswith("\n") or len(entry) != 3:
+                continue
+            if since is not None and time.mktime(
+                    time.strptime(entry[2], MOMENT_FORMAT)) < int(since):
+                continue
+            if entry[1] in STATES:
+                states[int(entry[0])] = entry[1]
+
+    return states
+
+
+def get_unfinished(journal_filename: str, samples: list) -> list:
+    """Get the samples that have not been finished according to the journal
+
+    :param journal_filename: the fullname of the journal file
+    :param samples: (list, int) the samples to check
+    :return: (list, int) the samples to be (re-)executed
+    """
+    states = read(journal_filename)
+
+    return [sample for sample in samples if states.get(sample) != FINISHED]
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.info_file.manifest
+    *******************************
+
+    Module to write and read the manifest of the pre-processing phase, an
+    append-only record of the content hash of each generated input deck
+
+    The hash of a sample covers everything its input deck is generated from:
+    the version of trace-simexp, the base TRACE input deck, the parameters
+    parsed from the list of parameters file (so that editing a comment of the
+    file does not change it), and the row of the design matrix. An input deck
+    whose hash is unchanged is up to date and needs not to be generated again.
+
+    The post-processing phase keeps a manifest of the same layout for each
+    list of graphic variables, the hash of a sample then covers the list and
+    the size and modification time of the dmx file the csv is extracted from.
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def make_filename(inputs: dict, name: str="prepro") -> str:
+    """Create the fullname of the manifest file of a simulation campaign
+
+    The manifest is located in the design matrix directory, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/<name>.manifest"
+
+    :param inputs: the inputs of a phase in dictionary
+    :param name: the name of the manifest, "prepro" for the input decks or
+        "postpro-<xtv_vars_name>" for the extracted csv files
+    :return: the fullname of the manifest file
+    """
+    import os
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "{}.manifest" .format(name))
+
+
+def get_digest(*contents_list: list) -> str:
+    """Compute the part of the hash common to all samples of a campaign
+
+    :param contents_list: (list, str) the contents the samples are generated
+        from, i.e., the contents of the base TRACE input deck and the parsed
+        parameters, see dump_params() (prepro), or the list of graphic
+        variables (postpro)
+    :return: the hexadecimal digest
+    """
+    import hashlib
+    from .._version import __version__
+
+    digest = hashlib.sha256()
+    for contents in ([__version__], ) + contents_list:
+        digest.update("".join(contents).encode())
+        # Separate the contents so that they cannot be shifted into another
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+
+def dump_params(params_dict: list) -> str:
+    """Serialize the parsed list of parameters to be hashed
+
+    The keys are sorted so that the serialization only depends on the
+    parameters themselves, not on the layout of the list of parameters file.
+    Numbers are written at full precision, see to_json().
+
+    :param params_dict: the parameter perturbation specification, see
+        prepro.read_params()
+    :return: the parameters as JSON string
+    """
+    import json
+
+    return json.dumps(params_dict, sort_keys=True, default=to_json)
+
+
+def to_json(value):
+    """Convert a value JSON does not support, for dump_params()
+
+    numpy arrays and scalars are converted into lists and numbers (str()
+    would abbreviate large arrays and round the values), anything else into
+    its repr().
+
+    :param value: the value to convert
+    :return: the value as list, number, or string
+    """
+    import numpy as np
+
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+
+    return repr(value)
+
+
+def hash_samples(common_digest: str, norm_pert_factors) -> list:
+    """Compute the content hash of the input deck of each sample
+
+    :param common_digest: the part of the hash common to all samples, see
+        get_digest()
+    :param norm_pert_factors: (array) the rows of the design matrix of the
+        samples
+    :return: (list, str) the hexadecimal hash of each sample
+    """
+    import hashlib
+    import numpy as np
+
+    rows = np.atleast_2d(np.asarray(norm_pert_factors, dtype=np.float64))
+
+    hashes = list()
+    for row in rows:
+        digest = hashlib.sha256(common_digest.encode())
+        digest.update(np.ascontiguousarray(row).tobytes())
+        hashes.append(digest.hexdigest())
+
+    return hashes
+
+
+def hash_files(common_digest: str, fullnames: list) -> list:
+    """Compute the hash of each sample from the size and time of its file
+
+    The file is not read, it is considered unchanged as long as its size and
+    modification time are.
+
+    :param common_digest: the part of the hash common to all samples, see
+        get_digest()
+    :param fullnames: (list, str) the fullname of the file of each sample
+    :return: (list, str) the hexadecimal hash of each sample
+    """
+    import os
+    import hashlib
+
+    hashes = list()
+    for fullname in fullnames:
+        stat = os.stat(fullname)
+        digest = hashlib.sha256(common_digest.encode())
+        digest.update("{} {}" .format(stat.st_size,
+                                      stat.st_mtime_ns).encode())
+        hashes.append(digest.hexdigest())
+
+    return hashes
+
+
+def append(manifest_filename: str, samples: list, hashes: list):
+    """Append the hash of the newly written input decks to the manifest
+
+    :param manifest_filename: the fullname of the manifest file
+    :param samples: (list, int) the samples
+    :param hashes: (list, str) the hash of the input deck of each sample
+    """
+    import os
+
+    with open(manifest_filename, "a") as manifest_file:
+        # Terminate a partially written line left by an interruption
+        if manifest_file.tell() > 0:
+            with open(manifest_filename, "rb") as check_file:
+                check_file.seek(-1, os.SEEK_END)
+                if check_file.read(1) != b"\n":
+                    manifest_file.write("\n")
+        for sample, sample_hash in zip(samples, hashes):
+            manifest_file.writelines("{:>8d} {}\n"
+                                     .format(sample, sample_hash))
+        manifest_file.flush()
+        os.fsync(manifest_file.fileno())
+
+
+def read(manifest_filename: str) -> dict:
+    """Read the manifest and get the latest hash of each sample
+
+    A partially written last line (e.g., due to an interruption) is ignored.
+
+    :param manifest_filename: the fullname of the manifest file
+    :return: the latest hash of each sample, keyed by the sample number.
+        Empty if the manifest does not exist.
+    """
+    import os
+
+    hashes = dict()
+
+    if not os.path.isfile(manifest_filename):
+        return hashes
+
+    with open(manifest_filename, "r") as manifest_file:
+        for line in manifest_file:
+            entry = line.split()
+            if not line.endswith("\n") or len(entry) != 2:
+                continue
+            hashes[int(entry[0])] = entry[1]
+
+    return hashes
+
+
+def get_outdated(manifest_filename: str, samples: list,
+                 hashes: list) -> list:
+    """Get the samples whose input deck is not up to date
+
+    :param manifest_filename: the fullname of the manifest file
+    :param samples: (list, int) the samples to check
+    :param hashes: (list, str) the current hash of each sample
+    :return: (list, int) the samples whose hash is missing from the manifest
+        or differs from the current one
+    """
+    recorded = read(manifest_filename)
+
+    return [sample for sample, sample_hash in zip(samples, hashes)
+            if recorded.get(sample) != sample_hash]
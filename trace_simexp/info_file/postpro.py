@@ -58,6 +58,26 @@ def read(postpro_info_contents: list) -> tuple:
             dm_name, xtv_vars_name, samples)
 
 
+def read_outputs(postpro_info_contents: list) -> tuple:
+    """Get the outputs appended to the info file of the post-processing phase
+
+    :param postpro_info_contents: the contents of the post-process phase info
+    :return: a tuple with the following contents
+        (str or None) the fullname of the result store
+        (str or None) the fullname of the QoI matrix
+    """
+    store_fullname = None
+    qoi_fullname = None
+
+    for line in postpro_info_contents:
+        if line.startswith("Result Store"):
+            store_fullname = line.split("-> ")[-1].strip()
+        if line.startswith("QoI Matrix"):
+            qoi_fullname = line.split("-> ")[-1].strip()
+
+    return store_fullname, qoi_fullname
+
+
 def write(inputs: dict):
     """Write a summary of the post-processing phase (a.k.a postpro.info)
 
@@ -71,7 +91,8 @@ def write(inputs: dict):
               "List of Parameters Name", "Design Matrix Name",
               "APTPlot Executable", "Number of Processors (Host)",
               "List of XTV Variables Name", "List of XTV Variables File", 
-              "List of XTV Variables", "Samples to Post-process"]
+              "List of XTV Variables", "Samples to Post-process",
+              "QoI Specification File"]
 
     with open(inputs["info_file"], "wt") as info_file:
 
@@ -132,6 +153,11 @@ def write(inputs: dict):
                              .format(header[9], "->",
                                      inputs["xtv_vars_fullname"]))
 
+        # QoI Specification File
+        info_file.writelines("{:<30s}{:3s}{}\n"
+                             .format(header[12], "->",
+                                     inputs["qoi_spec_fullname"]))
+
         # List of Graphic Variables
         info_file.writelines("{:<30s}{:3s}\n" .format(header[10], "->"))
         common.write_by_tens(inputs["xtv_vars"], ">20s", info_file)
@@ -141,3 +167,66 @@ def write(inputs: dict):
         common.write_by_tens(inputs["samples"], "5d", info_file)
         # Mark the end of samples
         info_file.writelines("***  End of Samples  ***\n")
+
+
+def append_extracted(info_filename: str, extracted_samples: list,
+                     up_to_date_samples: list, unavailable_samples: list,
+                     db_filename: str=None):
+    r"""Append the samples to be extracted and the skipped ones to the info file
+
+    :param info_filename: the fullname of the postpro info file
+    :param extracted_samples: (list, int) the samples to be extracted
+    :param up_to_date_samples: (list, int) the samples whose csv file is up
+        to date, skipped
+    :param unavailable_samples: (list, int) the samples without a final dmx
+        file, skipped
+    :param db_filename: the fullname of the campaign database, if given the
+        section is also recorded in it, see campaign.add_section()
+    """
+    import io
+    from . import common
+
+    section = io.StringIO()
+    section.writelines("***Extraction***\n")
+    section.writelines("{:<30s}{:3s}\n" .format("Samples to Extract", "->"))
+    common.write_by_tens(extracted_samples, "5d", section)
+    section.writelines("{:<30s}{:3s}\n" .format("Up-to-date Samples", "->"))
+    common.write_by_tens(up_to_date_samples, "5d", section)
+    section.writelines("{:<30s}{:3s}\n" .format("Unavailable Samples", "->"))
+    common.write_by_tens(unavailable_samples, "5d", section)
+    section.writelines("***  End of Extraction  ***\n")
+
+    append_section(info_filename, section.getvalue(), db_filename)
+
+
+def append_store(info_filename: str, store_fullname: str,
+                 header: str="Result Store", db_filename: str=None):
+    r"""Append the fullname of the result store (or QoI matrix) to the info file
+
+    :param info_filename: the fullname of the postpro info file
+    :param store_fullname: the fullname of the result store
+    :param header: the header of the line, "Result Store" or "QoI Matrix"
+    :param db_filename: the fullname of the campaign database, if given the
+        line is also recorded in it, see campaign.add_section()
+    """
+    append_section(info_filename,
+                   "{:<30s}{:3s}{:<30s}\n"
+                   .format(header, "->", store_fullname),
+                   db_filename)
+
+
+def append_section(info_filename: str, contents: str, db_filename: str=None):
+    r"""Append a section to the info file and record it in the database
+
+    :param info_filename: the fullname of the postpro info file
+    :param contents: the contents of the section
+    :param db_filename: the fullname of the campaign database, if None the
+        section is only appended to the info file
+    """
+    from . import campaign
+
+    with open(info_filename, "at") as file:
+        file.write(contents)
+
+    if db_filename is not None:
+        campaign.add_section(db_filename, info_filename, contents)
@@ -63,6 +63,33 @@ def write(inputs: dict):
         file.writelines("***  End of Samples  ***\n")
 
 
+def append_written(info_filename: str, written_samples: list,
+                   num_workers: int=1, stale_samples: list=None):
+    r"""Append the samples whose input deck was written to the info file
+
+    :param info_filename: the fullname of the prepro info file
+    :param written_samples: (list, int) the samples whose input deck was
+        written, merged from all the worker processes
+    :param num_workers: the number of worker processes used
+    :param stale_samples: (list, int) the samples whose existing input deck
+        was not up to date, whether it was rewritten or not
+    """
+    from . import common
+
+    if stale_samples is None:
+        stale_samples = []
+
+    with open(info_filename, "at") as file:
+        file.writelines("***Input Decks***\n")
+        file.writelines("{:<30s}{:3s}{:<30d}\n"
+                        .format("Number of Workers", "->", num_workers))
+        file.writelines("{:<30s}{:3s}\n" .format("Written Decks", "->"))
+        common.write_by_tens(written_samples, "5d", file)
+        file.writelines("{:<30s}{:3s}\n" .format("Stale Decks", "->"))
+        common.write_by_tens(stale_samples, "5d", file)
+        file.writelines("***  End of Written Decks  ***\n")
+
+
 def read(prepro_info_contents: list) -> tuple:
     """Read the info file produced in the pre-processing phase
 
@@ -110,3 +137,31 @@ def read(prepro_info_contents: list) -> tuple:
                 i += 1
 
     return base_dir, case_name, params_list_name, dm_name, samples
+
+
+def read_fullnames(prepro_info_contents: list) -> tuple:
+    """Read the fullnames of the input files from the prepro info file
+
+    :param prepro_info_contents: the contents of the prepro info file
+    :return: a tuple with the following contents
+        (str) the base TRACE input deck fullname
+        (str) the list of parameters fullname
+        (str) the design matrix fullname
+        (str) the short message of the simulation experiment
+    """
+    tracin_base_fullname = None
+    params_list_fullname = None
+    dm_fullname = None
+
+    for line in prepro_info_contents:
+        if "Base Case File" in line:
+            tracin_base_fullname = line.split("-> ")[-1].strip()
+        if "List of Parameters File" in line:
+            params_list_fullname = line.split("-> ")[-1].strip()
+        if "Design Matrix File" in line:
+            dm_fullname = line.split("-> ")[-1].strip()
+
+    # The message is written right after the date
+    info = prepro_info_contents[1].strip()
+
+    return tracin_base_fullname, params_list_fullname, dm_fullname, info
@@ -8,6 +8,13 @@
 
 __author__ = "Damar Wicaksono"
 
+# The time between two checks of the journal in the follow mode, in seconds
+FOLLOW_INTERVAL = 5.0
+
+# The time without a new journal entry after which the follow mode stops, in
+# seconds, longer than a TRACE job may run (see task.trace.TIMEOUT)
+FOLLOW_TIMEOUT = 9000.0
+
 
 def get_input():
     """Get all the inputs for post-processing phase of the experiment runs
@@ -47,6 +54,9 @@ def get_input():
     | num_procs            | (int) The number of processors to post-process   |
     |                      | TRACE perturbed cases outputs simultaneously     |
     +----------------------+--------------------------------------------------+
+    | num_threads          | (int) The number of threads to remove the        |
+    |                      | out-of-date csv files with                       |
+    +----------------------+--------------------------------------------------+
     | samples              | (list, int) List of samples to be executed       |
     |                      | must be in accordance between prepro and command |
     |                      | line arguments                                   |
@@ -67,6 +77,22 @@ def get_input():
     |                      | step even though info files and directory        |
     |                      | structures already exist                         |
     +----------------------+--------------------------------------------------+
+    | follow               | (bool) The flag to post-process each sample as   |
+    |                      | soon as it is executed, see follow()             |
+    +----------------------+--------------------------------------------------+
+    | follow_timeout       | (float) The time without progress of the execute |
+    |                      | phase after which to stop following it, in       |
+    |                      | seconds                                          |
+    +----------------------+--------------------------------------------------+
+    | qoi_spec_name        | (str or None) The name of the QoI specification  |
+    |                      | file                                             |
+    +----------------------+--------------------------------------------------+
+    | qoi_spec_fullname    | (str or None) The name and full path of the QoI  |
+    |                      | specification file                               |
+    +----------------------+--------------------------------------------------+
+    | qoi_spec             | (list, dict or None) The quantities of interest, |
+    |                      | parsed from the specified file                   |
+    +----------------------+--------------------------------------------------+
     | info_file            | (str) The filename of the post-pro infofile      |
     +----------------------+--------------------------------------------------+
     """
@@ -74,14 +100,16 @@ def get_input():
     from .task import aptscript
     from . import cmdln_args
     from . import util
+    from . import qoi
     from .info_file import common, execute
     from .cmdln_args.common import get_samples
 
     # Get command line arguments
     exec_info_fullname, exec_info_contents, \
         xtv_vars_fullname, xtv_vars_contents, \
-        aptplot_exec, num_procs, \
-        samples, overwrite, postpro_filename = cmdln_args.postpro.get()
+        aptplot_exec, num_procs, num_threads, \
+        samples, overwrite, postpro_filename, follow, follow_timeout, \
+        qoi_spec_fullname, qoi_spec_contents = cmdln_args.postpro.get()
 
     # Parse exec.info file
     prepro_info_fullname, base_dir, case_name, params_list_name, \
@@ -109,6 +137,13 @@ def get_input():
     # Read the list of TRACE variables name
     xtv_vars = aptscript.read(xtv_vars_contents)
 
+    # Read the specification of the quantities of interest
+    if qoi_spec_fullname is not None:
+        qoi_spec_name = util.get_name(qoi_spec_fullname, incl_ext=False)
+        qoi_spec = qoi.read_spec(qoi_spec_contents, xtv_vars)
+    else:
+        qoi_spec_name, qoi_spec = None, None
+
     # Get the host name
     hostname = util.get_hostname()
 
@@ -123,6 +158,7 @@ def get_input():
                       "xtv_vars": xtv_vars,
                       "aptplot_exec": aptplot_exec,
                       "num_procs": num_procs,
+                      "num_threads": num_threads,
                       "samples": samples,
                       "base_dir": base_dir,
                       "case_name": case_name,
@@ -130,6 +166,12 @@ def get_input():
                       "dm_name": dm_name,
                       "hostname": hostname,
                       "overwrite": overwrite,
+                      "follow": follow,
+                      "follow_timeout": follow_timeout
+                      if follow_timeout is not None else FOLLOW_TIMEOUT,
+                      "qoi_spec_name": qoi_spec_name,
+                      "qoi_spec_fullname": qoi_spec_fullname,
+                      "qoi_spec": qoi_spec,
                       }
 
     # Create an infofile filename if not provided
@@ -143,136 +185,434 @@ def get_input():
     return postpro_inputs
 
 
-def dmx2csv(postpro_inputs: dict):
+def dmx2csv(postpro_inputs: dict, samples: list=None):
     """Driver function to convert the dmx or xtv file into a csv file
 
+    Blocking wrapper around extract_samples() for the command line interface.
+
     :param postpro_inputs: the input parameters for post-processing phase
+    :param samples: (list, int) the samples to post-process, a subset of the
+        samples in postpro_inputs. If None all of them are post-processed.
     """
+    from .task import pipeline
+
+    pipeline.drain(extract_samples(postpro_inputs, samples))
+
+
+async def extract_samples(postpro_inputs: dict, samples: list=None):
+    """Coroutine to extract variables from the dmx, yield an event per sample
+
+    The samples are split into num_procs chunks, each extracted by a single
+    aptplot session so that aptplot (a JVM) is started once per chunk instead
+    of once per sample. At most num_procs sessions are run simultaneously.
+    The outcome of each extraction is recorded in the campaign database, see
+    info_file.campaign, and each successfully extracted sample in the postpro
+    manifest, see check_dirtree().
+
+    :param postpro_inputs: the input parameters for post-processing phase
+    :param samples: (list, int) the samples to post-process, a subset of the
+        samples in postpro_inputs. If None all of them are post-processed.
+    :return: an asynchronous iterator of events, each a dictionary with keys
+        "sample", "stage", and "returncode". The events of the samples of a
+        session are yielded together once the session is finished.
+    """
+    import os
+    import time
+
     from .task import dmx2csv
-    from .task import clean
-    from .util import link_exec
-    from .util import create_iter
+    from .task import pipeline
+    from .info_file import campaign, manifest
     from .util import make_dirnames
     from .util import make_auxfilenames
-    from .util import exe_exists
-    from .util import cmd_exists
-    from .util import get_name
-
-    # Check if the APTPLOT executable is in the path
-    if cmd_exists(postpro_inputs["aptplot_exec"]):
-        aptplot_is_in_path = True
-    elif exe_exists(postpro_inputs["aptplot_exec"]):
-        aptplot_is_in_path = False
-        aptplot_exec_name = get_name(postpro_inputs["aptplot_exec"],
-                                     incl_ext=True)
-
-    num_samples = len(postpro_inputs["samples"])
+
+    if samples is None:
+        samples = postpro_inputs["samples"]
     case_name = postpro_inputs["case_name"]
-    batch_int = 1
 
-    for batch_iter in create_iter(num_samples, postpro_inputs["num_procs"]):
+    # Create bunch of run directory names
+    run_dirnames = make_dirnames(samples, postpro_inputs, False)
+
+    # Create bunch of run names
+    run_names = make_auxfilenames(samples, case_name, "")
+
+    # The sessions are run in the design matrix directory, the executable is
+    # either in the path or specified with its full path
+    aptplot_exec = postpro_inputs["aptplot_exec"]
+
+    # Execute the dmx commands, a new session is started as soon as one is done
+    sessions = dmx2csv.make_sessions(len(samples), postpro_inputs["num_procs"])
+    stage = dmx2csv.make_stage(aptplot_exec,
+                               postpro_inputs["xtv_vars"],
+                               postpro_inputs["xtv_vars_name"],
+                               run_names, run_dirnames, sessions,
+                               postpro_inputs["info_file"],
+                               postpro_inputs["num_procs"])
+
+    # Record the outcome of each extraction in the campaign database
+    db_filename = campaign.make_filename(postpro_inputs)
+    manifest_filename = make_manifest_filename(postpro_inputs)
+    common_digest = manifest.get_digest(postpro_inputs["xtv_vars"])
+    started = dict()
+    hashes = dict()
+    returncodes = dict()
+    submit, report = stage["start"], stage["finish"]
+
+    def extract(i: int):
+        started[i] = time.time()
+        # The dmx files as they are before the extraction
+        hashes[i] = manifest.hash_files(
+            common_digest,
+            [os.path.join(run_dirnames[j], "{}.dmx" .format(run_names[j]))
+             for j in sessions[i]])
+        return submit(i)
+
+    def extracted(i: int, returncode: int):
+        returncodes[i] = report(i, returncode)
+        finished = time.time()
+        apt_script_filename = dmx2csv.make_apt_filename(
+            dmx2csv.make_session_name([run_names[j] for j in sessions[i]]),
+            postpro_inputs["xtv_vars_name"])
+        # The session, under its first sample, then each of its runs
+        campaign.add_task(db_filename, postpro_inputs["info_file"],
+                          samples[sessions[i][0]], "aptplot",
+                          [aptplot_exec, "-batch", apt_script_filename,
+                           "-nowin"],
+                          returncode, started[i], finished)
+        for j, run_returncode in zip(sessions[i], returncodes[i]):
+            campaign.add_task(db_filename, postpro_inputs["info_file"],
+                              samples[j], "extract", [run_names[j]],
+                              run_returncode, started[i], finished)
+        manifest.append(manifest_filename,
+                        [samples[j] for j, run_returncode
+                         in zip(sessions[i], returncodes[i])
+                         if run_returncode == 0],
+                        [sample_hash for sample_hash, run_returncode
+                         in zip(hashes.pop(i), returncodes[i])
+                         if run_returncode == 0])
+
+    stage["start"], stage["finish"] = extract, extracted
+
+    async for event in pipeline.iterate(len(sessions), [stage]):
+        for j, run_returncode in zip(sessions[event["job"]],
+                                     returncodes.pop(event["job"])):
+            yield {"sample": samples[j],
+                   "stage": event["stage"],
+                   "returncode": run_returncode}
+
+
+def consolidate(postpro_inputs: dict, samples: list=None,
+                append: bool=False):
+    """Consolidate the csv files of the post-processed samples into the store
+
+    The samples whose csv file is missing (i.e., failed extraction) are left
+    out. The shards appended to the store so far are merged into it as well.
+
+    :param postpro_inputs: the input parameters for post-processing phase
+    :param samples: (list, int) the samples just extracted, to be stored
+        anew. The other samples of postpro_inputs are only stored if they are
+        not yet in the store (or its shards). If None, all of them are stored
+        anew.
+    :param append: the flag to append the samples as a shard instead of
+        rewriting the store, see result_store.append(). The store is then
+        consolidated later on.
+    :return: the fullname of the result store
+    """
+    import os
+    from . import result_store
+    from .util import make_dirnames
+    from .util import make_auxfilenames
+
+    # Create the list of CSV files
+    run_dirnames = make_dirnames(postpro_inputs["samples"], postpro_inputs,
+                                 False)
+    csv_filenames = make_auxfilenames(postpro_inputs["samples"],
+                                      postpro_inputs["case_name"],
+                                      "-{}.csv" .format(
+                                          postpro_inputs["xtv_vars_name"]))
+    csv_fullnames = [os.path.join(a, b) for a, b in zip(run_dirnames,
+                                                        csv_filenames)]
+
+    # Only the successfully extracted samples
+    extracted = [(sample, csv_fullname) for sample, csv_fullname
+                 in zip(postpro_inputs["samples"], csv_fullnames)
+                 if os.path.isfile(csv_fullname)]
+
+    store_fullname = result_store.make_filename(postpro_inputs)
+    if samples is not None:
+        samples = set(samples)
+        stored = set(result_store.get_samples(store_fullname))
+        extracted = [(sample, csv_fullname)
+                     for sample, csv_fullname in extracted
+                     if sample in samples or sample not in stored]
+
+    if append:
+        if extracted:
+            shard_fullname = result_store.append(
+                store_fullname,
+                [sample for sample, _ in extracted],
+                [csv_fullname for _, csv_fullname in extracted],
+                postpro_inputs["xtv_vars"])
+            print("{} sample(s) appended to {}"
+                  .format(len(extracted), shard_fullname))
+    elif extracted or result_store.get_shards(store_fullname) or \
+            not os.path.isfile(store_fullname):
+        num_shards = len(result_store.get_shards(store_fullname))
+        store = result_store.update(
+            store_fullname,
+            [sample for sample, _ in extracted],
+            [csv_fullname for _, csv_fullname in extracted],
+            postpro_inputs["xtv_vars"])
+        print("{} sample(s) stored in {} ({} in total)"
+              .format(len(extracted), store_fullname, len(store["samples"])))
+        if num_shards > 0:
+            print("{} appended shard(s) merged into {}"
+                  .format(num_shards, store_fullname))
+    else:
+        print("{} up to date" .format(store_fullname))
 
-        # Append the exec.info
-        info_file = open(postpro_inputs["info_file"], "a")
-        info_file.writelines("*** Batch Execution - {:5d} ***\n"
-                             .format(batch_int))
-        info_file.close()
-        batch_int += 1
+    return store_fullname
 
-        # Put the iterator from create_iter into a list for re-usage
-        # Use the samples instead of bare iterator
-        list_iter = [postpro_inputs["samples"][i] for i in list(batch_iter)]
 
-        # Create bunch of run directory names
-        run_dirnames = make_dirnames(list_iter, postpro_inputs, False)
+def evaluate_qoi(postpro_inputs: dict, store_fullname: str) -> str:
+    """Evaluate the quantities of interest of all samples in the result store
 
-        # Create bunch of run names
-        run_names = make_auxfilenames(list_iter, case_name, "")
+    The QoI matrix is written next to the result store, see qoi.write().
 
-        # If AptPlot executable not in path, create a symbolic link in run dir
-        if aptplot_is_in_path:
-            aptplot_exec = postpro_inputs["aptplot_exec"]
-        else:
-            for run_dirname in run_dirnames:
-                link_exec(postpro_inputs["aptplot_exec"], run_dirname)
-            aptplot_exec = "./{}".format(aptplot_exec_name)
+    :param postpro_inputs: the input parameters for post-processing phase
+    :param store_fullname: the fullname of the result store
+    :return: the fullname of the QoI matrix
+    """
+    from . import qoi
+    from . import result_store
+
+    store = result_store.read(store_fullname)
+    qois = qoi.evaluate(store, postpro_inputs["qoi_spec"])
 
-        # Execute the dmx commands
-        dmx2csv.run(aptplot_exec,
-                    postpro_inputs["xtv_vars"],
-                    postpro_inputs["xtv_vars_name"],
-                    run_names, run_dirnames,
-                    postpro_inputs["info_file"])
+    qoi_fullname = qoi.make_filename(postpro_inputs)
+    qoi.write(qoi_fullname, store["samples"], postpro_inputs["qoi_spec"], qois)
 
-        # Clean up run directories from symbolic link
-        if not aptplot_is_in_path:
-            aptplot_links = ["{}/{}".format(run_dirname, aptplot_exec_name)
-                             for run_dirname in run_dirnames]
-            clean.rm_files(aptplot_links)
+    print("{} QoI(s) of {} sample(s) written in {}"
+          .format(len(postpro_inputs["qoi_spec"]), len(store["samples"]),
+                  qoi_fullname))
 
+    return qoi_fullname
 
-def check_dirtree(postpro_inputs: dict):
-    """Check the run directory structure whether it is clean for post-processing
 
-    "Clean" means there is at the very least the appropriate dmx file and no 
-    overlapping csv file. If there is no dmx then raise error, if there is 
-    overlapping csv, check if overwrite is allowed
+def follow(postpro_inputs: dict, interval: float=FOLLOW_INTERVAL,
+           timeout: float=FOLLOW_TIMEOUT) -> str:
+    """Post-process each sample as soon as its dmx file is final
+
+    The journal of the execute phase is watched, the samples which have
+    reached one of the converted states since the last check are
+    post-processed together (see check_dirtree() and dmx2csv()) while the
+    execute phase goes on. Each batch is appended to the result store as a
+    shard, the shards are merged into the store once at the end (see
+    consolidate()). Only the journal entries
+    written since the execute phase was started count, older ones (e.g., of
+    a previous execution of the samples) are ignored. A sample without any
+    journal entry is ready once its dmx file exists. The function returns
+    once every sample is either post-processed or failed in the execute
+    phase, or once the journal has not changed for timeout seconds (e.g.,
+    the execute phase died) leaving the pending samples behind.
+
+    :param postpro_inputs: the input parameters for post-processing phase
+    :param interval: the time between two checks of the journal, in seconds
+    :param timeout: the time without a change of the journal after which the
+        remaining samples are given up, in seconds
+    :return: the fullname of the result store
+    """
+    import os
+    import time
+    from .info_file import campaign, journal, postpro
+    from .util import make_dirnames
+    from .util import make_auxfilenames
+
+    pending = list(postpro_inputs["samples"])
+    dmx_fullnames = dict(zip(
+        pending,
+        [os.path.join(a, b) for a, b in zip(
+            make_dirnames(pending, postpro_inputs, False),
+            make_auxfilenames(pending, postpro_inputs["case_name"], ".dmx"))]))
+    journal_filename = journal.make_filename(postpro_inputs)
+    journal_mtime = None
+    db_filename = campaign.make_filename(postpro_inputs)
+
+    # The execute phase started once its info file was written
+    started = campaign.get_created(db_filename,
+                                   postpro_inputs["exec_info_fullname"])
+    changed = time.time()
+
+    while pending:
+        # Read the journal again only if it has changed
+        mtime = os.stat(journal_filename).st_mtime_ns \
+            if os.path.isfile(journal_filename) else None
+        if mtime != journal_mtime or mtime is None:
+            if mtime != journal_mtime:
+                changed = time.time()
+            journal_mtime = mtime
+            journaled = journal.read(journal_filename)
+            states = journal.read(journal_filename, started)
+
+            failed = [sample for sample in pending
+                      if states.get(sample) == "failed"]
+            ready = [sample for sample in pending
+                     if states.get(sample) in journal.CONVERTED or
+                     (sample not in journaled and
+                      os.path.isfile(dmx_fullnames[sample]))]
+
+            for sample in failed:
+                print("sample {} failed in the execute phase - skipped"
+                      .format(sample))
+            for sample in [_ for _ in ready
+                           if not os.path.isfile(dmx_fullnames[_])]:
+                print("sample {} has no dmx file - skipped" .format(sample))
+                failed.append(sample)
+                ready.remove(sample)
+
+            if ready:
+                batch_inputs = dict(postpro_inputs, samples=ready)
+                extracted, up_to_date, unavailable = \
+                    check_dirtree(batch_inputs)
+                postpro.append_extracted(postpro_inputs["info_file"],
+                                         extracted, up_to_date, unavailable,
+                                         db_filename)
+                dmx2csv(batch_inputs, extracted)
+                consolidate(batch_inputs, extracted, append=True)
+
+            done = set(failed + ready)
+            pending = [sample for sample in pending if sample not in done]
+            if ready or failed:
+                print("{} sample(s) pending" .format(len(pending)))
+
+        if pending and time.time() - changed > timeout:
+            print("The journal has not changed for {:.0f} s, the execute "
+                  "phase is assumed to be stopped - {} sample(s) left: {}"
+                  .format(timeout, len(pending),
+                          " ".join(str(_) for _ in pending)))
+            break
+
+        if pending:
+            time.sleep(interval)
+
+    # The batches are merged into the store at once
+    return consolidate(postpro_inputs, [])
+
+
+def check_dirtree(postpro_inputs: dict) -> tuple:
+    """Check the run directory structure and get the samples to post-process
+
+    Only the samples whose csv file is missing or not up to date are
+    post-processed. A csv file is up to date if it was extracted from the
+    same dmx file (by its size and modification time) with the same list of
+    graphic variables, as recorded in the postpro manifest, see
+    info_file.manifest.
+
+    A sample without a final dmx file (missing or, according to the journal,
+    still being executed) is skipped, if no sample has one raise error. If
+    there is a csv file which is not up to date, check if overwrite is allowed
+    and remove it.
 
     :param postpro_inputs: the postpro phase inputs
-    :return: list of dirty directory tree
+    :return: a tuple of the samples to post-process, the samples whose csv
+        file is up to date, and the samples without a final dmx file
     """
     import os
     from .util import make_dirnames
     from .util import make_auxfilenames
     from .task import clean
+    from .info_file import campaign, journal, manifest
 
-    dirty_dirs = []
-    dirty_dir_nums = []
-    empty_dirs = []
+    samples = postpro_inputs["samples"]
 
     # Create the list of run directories
-    run_dirnames = make_dirnames(postpro_inputs["samples"], postpro_inputs, False)
-    # Create the list of TRACE dmx files not to be removed
-    dmx_filenames = make_auxfilenames(postpro_inputs["samples"],
-                                      postpro_inputs["case_name"],
+    run_dirnames = make_dirnames(samples, postpro_inputs, False)
+    # Create the list of TRACE dmx files
+    dmx_filenames = make_auxfilenames(samples, postpro_inputs["case_name"],
                                       ".dmx")
     # Create the list of CSV files
-    csv_filenames =  make_auxfilenames(postpro_inputs["samples"],
-                                       postpro_inputs["case_name"],
-                                       "-{}.csv" .format(
-                                           postpro_inputs["xtv_vars_name"]))
-    # CSV fullnames
+    csv_filenames = make_auxfilenames(samples, postpro_inputs["case_name"],
+                                      "-{}.csv" .format(
+                                          postpro_inputs["xtv_vars_name"]))
+    # DMX and CSV fullnames
+    dmx_fullnames = [os.path.join(a, b) for a, b in zip(run_dirnames,
+                                                        dmx_filenames)]
     csv_fullnames = [os.path.join(a, b) for a, b in zip(run_dirnames,
                                                         csv_filenames)]
 
-    # Loop over run directories and input filenames and grab the invalid ones
-    for i, (run_dirname, dmx_filename, csv_filename) in \
-            enumerate(zip(run_dirnames, dmx_filenames, csv_filenames)):
-        if csv_filename in os.listdir(run_dirname):
-            dirty_dirs.append(run_dirname)
-            dirty_dir_nums.append(postpro_inputs["samples"][i])
-        if dmx_filename not in os.listdir(run_dirname):
-            empty_dirs.append(run_dirname)
-
-    # Check if there is empty run directory
-    if empty_dirs:
-        for empty_dir in empty_dirs:
+    # A sample not in the journal is assumed to have been executed
+    states = journal.read(journal.make_filename(postpro_inputs))
+    available = [i for i, sample in enumerate(samples)
+                 if os.path.isfile(dmx_fullnames[i]) and
+                 states.get(sample, journal.FINISHED) in journal.CONVERTED]
+    unavailable = sorted(set(range(len(samples))) - set(available))
+
+    # Check if there is no dmx file at all
+    if not available:
+        for run_dirname in run_dirnames:
             print("{} does not contain the correct input file!"
-                  .format(empty_dir))
+                  .format(run_dirname))
         raise ValueError("Some input file does not exist!")
+    # The samples of which the conversion failed, from the campaign database
+    failed = set(campaign.get_failed(campaign.make_filename(postpro_inputs),
+                                     "xtv2dmx"))
+    for i in unavailable:
+        if samples[i] in failed:
+            print("{} xtv2dmx conversion failed - skipped"
+                  .format(run_dirnames[i]))
+        else:
+            print("{} has no final dmx file yet - skipped"
+                  .format(run_dirnames[i]))
+    unavailable = [samples[i] for i in unavailable]
+
+    # Compare the dmx files with the manifest
+    hashes = manifest.hash_files(
+        manifest.get_digest(postpro_inputs["xtv_vars"]),
+        [dmx_fullnames[i] for i in available])
+    outdated = set(manifest.get_outdated(
+        make_manifest_filename(postpro_inputs),
+        [samples[i] for i in available], hashes))
+
+    extracted = list()
+    up_to_date = list()
+    dirty_dirs = list()
+    for i in available:
+        if samples[i] not in outdated and os.path.isfile(csv_fullnames[i]):
+            up_to_date.append(samples[i])
+            continue
+        extracted.append(samples[i])
+        if os.path.isfile(csv_fullnames[i]):
+            dirty_dirs.append(i)
+
+    if up_to_date:
+        print("{} sample(s) up to date - skipped" .format(len(up_to_date)))
+
     # Check if there is dirty run directory
-    elif dirty_dirs:
+    if dirty_dirs:
         if not postpro_inputs["overwrite"]:
-            for dirty_dir in dirty_dirs:
+            for i in dirty_dirs:
                 print("{} run directory is dirty!"
-                      .format(dirty_dir))
+                      .format(run_dirnames[i]))
             raise ValueError("One or more run directories are dirty and no"
                              " overwrite flag!")
         else:
             # Clean the directory first
-            clean.rm_files(csv_fullnames)
-    else:
-        pass
+            clean.rm_files([csv_fullnames[i] for i in dirty_dirs],
+                           postpro_inputs["num_threads"])
+
+    return extracted, up_to_date, unavailable
+
+
+def make_manifest_filename(postpro_inputs: dict) -> str:
+    """Create the fullname of the manifest of the list of graphic variables
+
+    :param postpro_inputs: the postpro phase inputs
+    :return: the fullname of the postpro manifest file
+    """
+    from .info_file import manifest
+
+    return manifest.make_filename(
+        postpro_inputs,
+        "postpro-{}" .format(postpro_inputs["xtv_vars_name"]))
 
 
 def reset(postpro_inputs: dict):
@@ -285,6 +625,7 @@ def reset(postpro_inputs: dict):
     from .util import make_auxfilenames
     from .util import query_yes_no
     from .task import clean
+    from . import result_store
 
     dirty_nums = 0
 
@@ -310,7 +651,15 @@ def reset(postpro_inputs: dict):
     # Do the cleanup
     if dirty_nums > 0:
         if query_yes_no("Delete all CSV files?", default="no"):
-            clean.rm_files(csv_fullnames)
+            print(clean.format_count(
+                clean.rm_files(csv_fullnames, postpro_inputs["num_threads"])))
+            # The samples are no longer post-processed
+            store_fullname = result_store.make_filename(postpro_inputs)
+            num_removed = result_store.remove(store_fullname,
+                                              postpro_inputs["samples"])
+            if num_removed > 0:
+                print("{} sample(s) removed from {}"
+                      .format(num_removed, store_fullname))
     else:
         print("No csv file can be found. Aborting...")
 
@@ -48,6 +48,10 @@ def get_input() -> dict:
     |                      | from the filename excluding the extension and    |
     |                      | the path                                         |
     +----------------------+--------------------------------------------------+
+    | doe_spec             | (dict) The specification of the generated design |
+    |                      | matrix (method, num_samples, dimension, seed),   |
+    |                      | None if the design matrix was read from a file   |
+    +----------------------+--------------------------------------------------+
     | params_list_contents | (list, str) The contents of the the list of      |
     |                      | parameters file as a list of string              |
     +----------------------+--------------------------------------------------+
@@ -61,6 +65,12 @@ def get_input() -> dict:
     |                      | step even though info files and directory        |
     |                      | structures already exist                         |
     +----------------------+--------------------------------------------------+
+    | num_workers          | (int) The number of processes to generate the    |
+    |                      | input decks with                                 |
+    +----------------------+--------------------------------------------------+
+    | lazy                 | (bool) The flag to defer the generation of the   |
+    |                      | input decks to the execute phase                 |
+    +----------------------+--------------------------------------------------+
     | info                 | (str) A short message for the simulation         |
     |                      | experiment                                       |
     +----------------------+--------------------------------------------------+
@@ -70,21 +80,51 @@ def get_input() -> dict:
     import os
     from . import cmdln_args
     from . import util
+    from . import design_matrix
     from .info_file import common
 
     # Read the command line arguments
     samples, base_dirname, \
         tracin_base_fullname, tracin_base_contents, \
-        dm_fullname, dm_contents, \
+        dm_fullname, dm_contents, doe_spec, \
         params_list_fullname, params_list_contents, \
-        overwrite, info, prepro_filename = cmdln_args.prepro.get()
+        overwrite, num_workers, lazy, info, prepro_filename = \
+        cmdln_args.prepro.get()
     
     # Get the names of directory and files
     base_name = util.get_name(base_dirname)
     case_name = util.get_name(tracin_base_fullname)
-    dm_name = util.get_name(dm_fullname)
     params_list_name = util.get_name(params_list_fullname)
 
+    if doe_spec is not None:
+        # Generate the design matrix into the campaign directory
+        dm_name = design_matrix.make_name(doe_spec["method"],
+                                          doe_spec["dimension"],
+                                          doe_spec["seed"])
+        dm_fullname = os.path.join(base_dirname, case_name,
+                                   "{}-{}" .format(params_list_name, dm_name),
+                                   "{}.npy" .format(dm_name))
+        generated = design_matrix.check_generated(dm_fullname,
+                                                  doe_spec["method"],
+                                                  doe_spec["num_samples"],
+                                                  doe_spec["dimension"],
+                                                  doe_spec["seed"])
+        if generated:
+            # Reuse it, including the samples of its extensions
+            dm_contents = design_matrix.read(dm_fullname)
+            print("Design matrix reused: {}" .format(dm_fullname))
+        elif generated is None or overwrite:
+            dm_contents = design_matrix.write_generated(
+                dm_fullname, doe_spec["method"], doe_spec["num_samples"],
+                doe_spec["dimension"], doe_spec["seed"])
+            print("Design matrix generated: {}" .format(dm_fullname))
+        else:
+            raise ValueError("The design matrix {} exists and differs from "
+                             "the specified one, no overwrite flag!"
+                             .format(dm_fullname))
+    else:
+        dm_name = util.get_name(dm_fullname)
+
     # Construct the dictionary
     inputs = {
         "samples": samples,
@@ -96,10 +136,13 @@ def get_input() -> dict:
         "dm_contents": dm_contents,
         "dm_fullname": dm_fullname,
         "dm_name": dm_name,
+        "doe_spec": doe_spec,
         "params_list_contents": params_list_contents,
         "params_list_fullname": params_list_fullname,
         "params_list_name": params_list_name,
         "overwrite": overwrite,
+        "num_workers": num_workers,
+        "lazy": lazy,
         "info": info
     }
 
@@ -173,16 +216,41 @@ def read_params(params_list_contents: list,
 
 def create_dirtree(prepro_inputs: dict,
                    params_dict: dict,
-                   tracin_template: str):
+                   tracin_template: str) -> tuple:
     """Create a directory structure for the simulation campaign
 
+    An input deck is only generated if its content hash (see the manifest
+    module) differs from the one recorded in the manifest of the campaign,
+    otherwise it is up to date and left as it is. An existing input deck that
+    is not up to date is stale, it is rewritten only with the overwrite flag.
+    The rewritten samples are marked as stale in the execute phase journal so
+    that they are executed again when the execute phase is resumed.
+
+    The artifacts to render the input decks are saved in the design matrix
+    directory. With the lazy flag the missing input decks are not generated,
+    they are rendered just before each sample is executed in the execute
+    phase, see write_deferred(). Only existing stale input decks are then
+    (re)written. The deferred samples are recorded in the artifacts, the
+    execute phase accepts a missing input deck only for them.
+
+    The samples to write are split into contiguous shards, one per worker
+    process. Each worker renders the input decks of its shard from the
+    compiled template and writes them into their run directories, see
+    write_decks().
+
     :param prepro_inputs: the complete inputs of the prepro step
     :param params_dict: the list of perturbed parameters
-    :param tracin_template: the TRACE template with keys to be substituted with
-        actual values from the rescaled design matrix
+    :param tracin_template: the compiled TRACE template with keys to be
+        substituted with actual values from the rescaled design matrix
+    :returns: a tuple of (list, int) the samples whose input deck was
+        written and (list, int) the samples whose input deck was stale
     """
     import os
-    from . import tracin
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+    from .info_file import manifest
+    from .info_file import journal
+    from .info_file import artifacts
 
     # Put the dictionary into corresponding local variables
     # The name of the case
@@ -207,29 +275,161 @@ def create_dirtree(prepro_inputs: dict,
     if not os.path.exists(dm_name_dir):
         os.makedirs(dm_name_dir)
 
-    # Loop over required samples
-    for i in samples:
-        num_runs = i
-        run_dir_name = "{}/{}-run_{}" .format(dm_name_dir, case_name, num_runs)
+    # The input deck fullname of all required samples
+    tracin_fullnames = {i: "{0}/{1}-run_{2}/{1}-run_{2}.inp"
+                        .format(dm_name_dir, case_name, i) for i in samples}
+
+    # The content hash of the input deck of all required samples
+    campaign_inputs = dict(prepro_inputs, base_dir=base_dirname)
+    manifest_filename = manifest.make_filename(campaign_inputs)
+    digest = manifest.get_digest(prepro_inputs["tracin_base_contents"],
+                                 [manifest.dump_params(params_dict)])
+    hashes = dict(zip(samples, manifest.hash_samples(
+        digest, dm_array[[i-1 for i in samples], :])))
+
+    # Only the input decks not up to date (or missing) are generated
+    outdated = set(manifest.get_outdated(manifest_filename, samples,
+                                         [hashes[i] for i in samples]))
+    existing = set(i for i in samples if os.path.isfile(tracin_fullnames[i]))
+    to_write = [i for i in samples if i in outdated or i not in existing]
+    if len(to_write) < len(samples):
+        print("{} input deck(s) up to date - skipped"
+              .format(len(samples) - len(to_write)))
+
+    # The missing input decks are deferred to the execute phase
+    artifacts_filename = artifacts.make_filename(campaign_inputs)
+    deferred = set(artifacts.read_deferred(artifacts_filename))
+    if prepro_inputs.get("lazy"):
+        num_deferred = len([i for i in to_write if i not in existing])
+        deferred.update(i for i in to_write if i not in existing)
+        to_write = [i for i in to_write if i in existing]
+        if num_deferred > 0:
+            print("{} input deck(s) deferred to the execute phase"
+                  .format(num_deferred))
+    deferred.difference_update(to_write)
+
+    # Save everything required to render the input decks later on
+    artifacts.write(artifacts_filename, tracin_template, params_dict,
+                    dm_array, digest, deferred)
+
+    # Split the samples into contiguous shards, one per worker
+    num_workers = min(prepro_inputs.get("num_workers", 1), len(to_write))
+    shards = [[to_write[j] for j in shard] for shard in
+              np.array_split(np.arange(len(to_write)), max(num_workers, 1))
+              if shard.size > 0]
+    shard_args = [(tracin_template, params_dict,
+                   dm_array[[i-1 for i in shard], :],
+                   [tracin_fullnames[i] for i in shard], overwrite)
+                  for shard in shards]
+
+    if num_workers <= 1:
+        statuses = [write_decks(*args) for args in shard_args]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            statuses = list(executor.map(write_decks, *zip(*shard_args)))
+
+    # Merge the results of the shards, in the order of the samples
+    written_samples = list()
+    stale_samples = list()
+    rewritten_samples = list()
+    for shard, shard_statuses in zip(shards, statuses):
+        for i, status in zip(shard, shard_statuses):
+            if status != "written":
+                stale_samples.append(i)
+            if status == "kept":
+                print("{} exist - no overwrite flag"
+                      .format(tracin_fullnames[i]))
+            else:
+                written_samples.append(i)
+            if status == "rewritten":
+                rewritten_samples.append(i)
 
-        if not os.path.exists(run_dir_name):
-            os.makedirs(run_dir_name)
+    # Record the hash of the written input decks
+    if written_samples:
+        manifest.append(manifest_filename, written_samples,
+                        [hashes[i] for i in written_samples])
 
-        str_tracin = tracin.create(tracin_template,
-                                   params_dict,
-                                   dm_array[i-1, :])
-        tracin_filename = "{}-run_{}.inp" .format(case_name, num_runs)
-        tracin_fullname = "{}/{}" .format(run_dir_name, tracin_filename)
+    # The rewritten samples have to be executed again
+    journal_filename = journal.make_filename(campaign_inputs)
+    if rewritten_samples and os.path.isfile(journal_filename):
+        journal.append(journal_filename, rewritten_samples, "stale")
 
-        if os.path.isfile(tracin_fullname):
-            if overwrite:
-                with open(tracin_fullname, "wt") as tracin_file:
-                    tracin_file.write(str_tracin)
-            else:
-                print("{} exist - no overwrite flag" .format(tracin_fullname))
-        else:
+    if stale_samples:
+        print("Stale input deck(s) of sample(s): {}"
+              .format(" ".join(str(i) for i in stale_samples)))
+
+    return written_samples, stale_samples
+
+
+def write_decks(tracin_template: dict,
+                params_dict: list,
+                norm_pert_factors,
+                tracin_fullnames: list,
+                overwrite: bool) -> list:
+    """Render and write the input decks of a shard of samples
+
+    The run directories are created if they do not exist. Without the
+    overwrite flag an existing input deck is kept; the file is first opened
+    in exclusive mode, so no separate check for its existence is required.
+
+    :param tracin_template: the compiled TRACE template
+    :param params_dict: the list of perturbed parameters
+    :param norm_pert_factors: (array) the rows of the design matrix of the
+        samples in the shard
+    :param tracin_fullnames: the input deck fullname of each sample
+    :param overwrite: the flag to overwrite existing input decks
+    :returns: (list, str) the status of the input deck of each sample,
+        "written" if it did not exist, "rewritten" if it existed and was
+        overwritten, and "kept" if it existed and was not overwritten
+    """
+    import os
+    from . import tracin
+
+    str_tracins = tracin.create_samples(tracin_template, params_dict,
+                                        norm_pert_factors)
+
+    statuses = list()
+    for tracin_fullname, str_tracin in zip(tracin_fullnames, str_tracins):
+        os.makedirs(os.path.dirname(tracin_fullname), exist_ok=True)
+        try:
+            with open(tracin_fullname, "xt") as tracin_file:
+                tracin_file.write(str_tracin)
+        except FileExistsError:
+            if not overwrite:
+                statuses.append("kept")
+                continue
             with open(tracin_fullname, "wt") as tracin_file:
-                    tracin_file.write(str_tracin)
+                tracin_file.write(str_tracin)
+            statuses.append("rewritten")
+        else:
+            statuses.append("written")
+
+    return statuses
+
+
+def write_deferred(deck_artifacts: dict, samples: list,
+                   tracin_fullnames: list, manifest_filename: str):
+    """Render and write the deferred input decks of samples to be executed
+
+    :param deck_artifacts: the artifacts of the pre-processing phase, see
+        info_file.artifacts.read()
+    :param samples: (list, int) the samples
+    :param tracin_fullnames: the input deck fullname of each sample
+    :param manifest_filename: the fullname of the manifest file, updated with
+        the hash of the written input decks
+    """
+    from .info_file import manifest
+
+    norm_pert_factors = deck_artifacts["dm_contents"][[i-1 for i in samples],
+                                                      :]
+
+    write_decks(deck_artifacts["tracin_template"],
+                deck_artifacts["params_dict"],
+                norm_pert_factors, tracin_fullnames, True)
+
+    manifest.append(manifest_filename, samples,
+                    manifest.hash_samples(deck_artifacts["digest"],
+                                          norm_pert_factors))
 
 
 def reset(reset_inputs: dict):
@@ -263,7 +463,8 @@ def reset(reset_inputs: dict):
         if query_yes_no("Delete the select run directories?"
                         " (Warning: this will delete them all)", default="no"):
             # Remove folders
-            clean.rm_files(run_dirnames)
+            print(clean.format_count(
+                clean.rm_files(run_dirnames, reset_inputs["num_threads"])))
 
             # Remove parent directories if they are empty
             if not os.listdir(full_path):
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.qoi
+    ****************
+
+    Module to reduce the time series of each sample in the result store into
+    scalar quantities of interest (QoI), e.g., the peak clad temperature and
+    the quench time, according to a declarative specification file
+
+    Each line of the specification defines a QoI, comments start with "#"::
+
+        <name> <operation> <graphic variable> [<argument>]
+
+    e.g.::
+
+        pct      max          rftn-20A69R29            # peak clad temp.
+        t_pct    argmax       rftn-20A69R29            # time of the peak
+        t_quench first_below  rftn-20A69R29  600.0     # quench time
+
+    An operation is evaluated at once over all the samples (vectorized over
+    the samples x time arrays of the store) and the result is a samples x QoI
+    matrix.
+"""
+import numpy as np
+
+__author__ = "Damar Wicaksono"
+
+# The supported operations, with whether they take an argument
+OPERATIONS = {
+    "max": False,           # Maximum value
+    "min": False,           # Minimum value
+    "argmax": False,        # Time of the maximum value
+    "argmin": False,        # Time of the minimum value
+    "integral": False,      # Integral over time, trapezoidal rule
+    "value_at": True,       # Value at the given time, linearly interpolated
+    "first_above": True,    # Time the value first reaches the given value
+    "first_below": True     # Time the value first drops to the given value
+}
+
+
+def read_spec(qoi_spec_contents: list, xtv_vars: list) -> list:
+    """Parse the contents of a QoI specification file
+
+    :param qoi_spec_contents: (list, str) the contents of the specification
+    :param xtv_vars: (list, str) the list of TRACE graphic variables, the
+        variable of each QoI must be one of them
+    :return: (list, dict) each QoI in a dictionary with keys "name",
+        "operation", "variable", and "argument" (float or None)
+    """
+    qoi_spec = list()
+
+    for num_line, line in enumerate(qoi_spec_contents):
+        entry = line.split("#")[0].split()
+        if not entry:
+            continue
+
+        if len(entry) not in [3, 4]:
+            raise ValueError("Line {} of the QoI specification: expected "
+                             "name, operation, variable, [argument]"
+                             .format(num_line + 1))
+        name, operation, variable = entry[:3]
+
+        if operation not in OPERATIONS:
+            raise ValueError("Line {} of the QoI specification: unknown "
+                             "operation *{}*, choose from {}"
+                             .format(num_line + 1, operation,
+                                     ", ".join(OPERATIONS)))
+        if OPERATIONS[operation] != (len(entry) == 4):
+            raise ValueError("Line {} of the QoI specification: operation "
+                             "*{}* {} an argument"
+                             .format(num_line + 1, operation,
+                                     "requires" if OPERATIONS[operation]
+                                     else "takes no"))
+        if variable not in xtv_vars:
+            raise ValueError("Line {} of the QoI specification: *{}* is not "
+                             "in the list of graphic variables"
+                             .format(num_line + 1, variable))
+        if name in [_["name"] for _ in qoi_spec]:
+            raise ValueError("Line {} of the QoI specification: duplicate "
+                             "name *{}*" .format(num_line + 1, name))
+
+        qoi_spec.append({
+            "name": name,
+            "operation": operation,
+            "variable": variable,
+            "argument": float(entry[3]) if len(entry) == 4 else None
+        })
+
+    return qoi_spec
+
+
+def evaluate(store: dict, qoi_spec: list) -> np.ndarray:
+    """Evaluate the QoIs of all the samples of the result store
+
+    A QoI which cannot be evaluated for a sample (e.g., no crossing, or the
+    time is out of the simulated range) is NaN.
+
+    :param store: the result store in a dictionary, see result_store.collect()
+    :param qoi_spec: (list, dict) the QoIs, see read_spec()
+    :return: the QoIs, samples x QoI, in the order of the store samples
+    """
+    xtv_vars = store["xtv_vars"].tolist()
+    time = store["time"]
+    qois = np.full((len(store["samples"]), len(qoi_spec)), np.nan)
+
+    for j, qoi in enumerate(qoi_spec):
+        values = store["values"][:, xtv_vars.index(qoi["variable"]), :]
+        qois[:, j] = reduce(qoi["operation"], time, values, qoi["argument"])
+
+    return qois
+
+
+def reduce(operation: str, time: np.ndarray, values: np.ndarray,
+           argument: float=None) -> np.ndarray:
+    """Reduce the time series of the samples into a scalar per sample
+
+    :param operation: the operation, one of OPERATIONS
+    :param time: the time of each sample, samples x time, padded with NaN
+    :param values: the values of each sample, samples x time, padded with NaN
+    :param argument: the argument of the operation, if it takes one
+    :return: (array) the scalar of each sample, NaN if it has no value
+    """
+    num_samples, num_times = values.shape
+    rows = np.arange(num_samples)
+    valid = ~np.isnan(values) & ~np.isnan(time)
+    has_values = valid.any(axis=1)
+    result = np.full(num_samples, np.nan)
+
+    if num_times == 0:
+        return result
+
+    if operation in ["max", "argmax"]:
+        index = np.where(valid, values, -np.inf).argmax(axis=1)
+    elif operation in ["min", "argmin"]:
+        index = np.where(valid, values, np.inf).argmin(axis=1)
+
+    if operation in ["max", "min"]:
+        result[has_values] = values[rows, index][has_values]
+    elif operation in ["argmax", "argmin"]:
+        result[has_values] = time[rows, index][has_values]
+    elif operation == "integral":
+        segments = valid[:, 1:] & valid[:, :-1]
+        areas = np.diff(time, axis=1) * (values[:, 1:] + values[:, :-1]) / 2
+        result[has_values] = np.where(segments, areas, 0.0).sum(
+            axis=1)[has_values]
+    elif operation == "value_at":
+        # The last time point at or before the argument, then interpolate
+        before = valid & (time <= argument)
+        after = valid & (time >= argument)
+        lower = num_times - 1 - before[:, ::-1].argmax(axis=1)
+        upper = after.argmax(axis=1)
+        found = before.any(axis=1) & after.any(axis=1)
+        result[found] = interpolate(
+            time[rows, lower], values[rows, lower],
+            time[rows, upper], values[rows, upper], argument, "time")[found]
+    elif operation in ["first_above", "first_below"]:
+        if operation == "first_above":
+            crossed = valid & (values >= argument)
+        else:
+            crossed = valid & (values <= argument)
+        upper = crossed.argmax(axis=1)
+        found = crossed.any(axis=1)
+        # The crossing is between the previous time point and the first one
+        # beyond the argument, already beyond at the first one is a crossing
+        lower = np.maximum(upper - 1, 0)
+        result[found] = interpolate(
+            time[rows, lower], values[rows, lower],
+            time[rows, upper], values[rows, upper], argument, "value")[found]
+    else:
+        raise ValueError("Unknown QoI operation *{}*" .format(operation))
+
+    return result
+
+
+def interpolate(time_1: np.ndarray, values_1: np.ndarray,
+                time_2: np.ndarray, values_2: np.ndarray,
+                argument: float, given: str) -> np.ndarray:
+    """Linearly interpolate between two points of each sample
+
+    :param time_1: the time of the first point of each sample
+    :param values_1: the value of the first point of each sample
+    :param time_2: the time of the second point of each sample
+    :param values_2: the value of the second point of each sample
+    :param argument: the given time or value
+    :param given: "time" to get the value at the given time, or "value" to
+        get the time of the given value
+    :return: the interpolated value (or time) of each sample, the first point
+        if both points coincide
+    """
+    if given == "time":
+        x_1, y_1, x_2, y_2 = time_1, values_1, time_2, values_2
+    else:
+        x_1, y_1, x_2, y_2 = values_1, time_1, values_2, time_2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(x_2 != x_1, (argument - x_1) / (x_2 - x_1), 0.0)
+
+    return y_1 + weight * (y_2 - y_1)
+
+
+def make_filename(inputs: dict) -> str:
+    """Create the fullname of the QoI matrix of a list of graphic variables
+
+    The matrix is located in the design matrix directory, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/
+    <case_name>-<xtv_vars_name>-<qoi_spec_name>.csv"
+
+    :param inputs: the inputs of the post-processing phase in dictionary
+    :return: the fullname of the QoI matrix
+    """
+    import os
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "{}-{}-{}.csv" .format(inputs["case_name"],
+                                               inputs["xtv_vars_name"],
+                                               inputs["qoi_spec_name"]))
+
+
+def write(qoi_fullname: str, samples, qoi_spec: list, qois: np.ndarray):
+    """Write the QoI matrix as a csv file, a row per sample
+
+    The first column is the sample, i.e., the row of the design matrix
+    (starting from 1), followed by a column per QoI. The header line has the
+    QoI names.
+
+    :param qoi_fullname: the fullname of the QoI matrix
+    :param samples: (array, int) the samples
+    :param qoi_spec: (list, dict) the QoIs, see read_spec()
+    :param qois: the QoIs, samples x QoI
+    """
+    import os
+
+    tmp_fullname = "{}.{}.tmp" .format(qoi_fullname, os.getpid())
+    with open(tmp_fullname, "wt") as qoi_file:
+        qoi_file.writelines("{}\n" .format(
+            ",".join(["sample"] + [qoi["name"] for qoi in qoi_spec])))
+        for sample, row in zip(samples, qois):
+            qoi_file.writelines("{}\n" .format(
+                ",".join(["{:d}" .format(sample)] +
+                         ["{:.10g}" .format(value) for value in row])))
+    os.replace(tmp_fullname, qoi_fullname)
+
+
+def read(qoi_fullname: str) -> tuple:
+    """Read the QoI matrix csv file
+
+    :param qoi_fullname: the fullname of the QoI matrix
+    :return: a tuple of the samples (array, int), the QoI names (list, str),
+        and the QoIs (array, samples x QoI)
+    """
+    with open(qoi_fullname, "rt") as qoi_file:
+        names = qoi_file.readline().strip().split(",")[1:]
+        contents = np.loadtxt(qoi_file, delimiter=",", ndmin=2)
+
+    if contents.size == 0:
+        contents = contents.reshape(0, len(names) + 1)
+
+    return contents[:, 0].astype(np.int64), names, contents[:, 1:]
@@ -17,12 +17,13 @@ def get_input() -> dict:
     from . import cmdln_args
     from .info_file import common, prepro, execute, postpro
 
-    info_file_contents = cmdln_args.reset.get()          # get the contents
+    info_file_contents, num_threads = cmdln_args.reset.get()
     phase = common.sniff_info_file(info_file_contents)   # decide the type
 
     # Consolidate into a dictionary
     reset_inputs = {
-        "phase": phase
+        "phase": phase,
+        "num_threads": num_threads
     }
 
     # Read the preprocess file according to their type
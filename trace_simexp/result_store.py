@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.result_store
+    *************************
+
+    Module to consolidate the csv files extracted from each run into a single
+    binary result store of the simulation campaign, and to read it back
+
+    The store holds the values of all the post-processed samples as a
+    samples x variables x time cube, with the time of each sample alongside.
+    It is an HDF5 file if h5py is available, otherwise an uncompressed numpy
+    npz file. Either way, loading it requires no text parsing.
+
+    Samples post-processed in batches (see postpro.follow()) are appended as
+    shards next to the store, one npz file per batch, instead of rewriting
+    the whole store for each batch. The shards are merged into the store
+    the next time it is updated, see update().
+"""
+import numpy as np
+
+__author__ = "Damar Wicaksono"
+
+# The supported formats of the result store, in the order of preference
+FORMATS = ["h5", "npz"]
+
+# The arrays of the result store
+KEYS = ["samples", "xtv_vars", "num_times", "time", "values"]
+
+
+def get_format() -> str:
+    """Get the format of the result store, HDF5 if h5py is available
+
+    :return: the extension of the result store, "h5" or "npz"
+    """
+    try:
+        import h5py
+    except ImportError:
+        return "npz"
+
+    return "h5"
+
+
+def make_filename(inputs: dict, store_format: str=None) -> str:
+    """Create the fullname of the result store of a list of graphic variables
+
+    The store is located in the design matrix directory, i.e.,
+    "<base_dir>/<case_name>/<parlist>-<dm>/<case_name>-<xtv_vars_name>.<ext>"
+
+    :param inputs: the inputs of the post-processing phase in dictionary
+    :param store_format: the format of the store, see FORMATS. If None, the
+        format given by get_format().
+    :return: the fullname of the result store
+    """
+    import os
+
+    if store_format is None:
+        store_format = get_format()
+    if store_format not in FORMATS:
+        raise ValueError("Unknown result store format {}"
+                         .format(store_format))
+
+    return os.path.join(inputs["base_dir"],
+                        inputs["case_name"],
+                        "{}-{}" .format(inputs["params_list_name"],
+                                        inputs["dm_name"]),
+                        "{}-{}.{}" .format(inputs["case_name"],
+                                           inputs["xtv_vars_name"],
+                                           store_format))
+
+
+def read_csv(csv_fullname: str, num_vars: int) -> tuple:
+    """Read a csv file exported by aptplot
+
+    The leading non-numeric lines (the header) are skipped, the first column
+    is the time and the rest are the variables, in the order of the list.
+
+    :param csv_fullname: the fullname of the csv file
+    :param num_vars: the number of graphic variables in the file
+    :return: a tuple of the time (1-dimensional array) and the values of the
+        variables (2-dimensional array, variables x time)
+    """
+    with open(csv_fullname, "rt") as csv_file:
+        lines = csv_file.read().splitlines()
+
+    # Skip the header
+    for num_header, line in enumerate(lines):
+        try:
+            float(line.split(",")[0])
+            break
+        except ValueError:
+            continue
+    else:
+        num_header = len(lines)
+
+    contents = np.loadtxt(lines[num_header:], delimiter=",", ndmin=2)
+    if contents.size == 0:
+        contents = contents.reshape(0, num_vars + 1)
+    if contents.shape[1] != num_vars + 1:
+        raise ValueError("{} has {} columns, expected time and {} variables"
+                         .format(csv_fullname, contents.shape[1], num_vars))
+
+    return contents[:, 0], contents[:, 1:].T
+
+
+def collect(samples: list, csv_fullnames: list, xtv_vars: list) -> dict:
+    """Collect the csv files of the samples into a result store dictionary
+
+    The time series of the samples may have different lengths, the shorter
+    ones are padded with NaN.
+
+    :param samples: (list, int) the samples
+    :param csv_fullnames: (list, str) the csv file of each sample
+    :param xtv_vars: (list, str) the list of TRACE graphic variables
+    :return: the result store in a dictionary
+
+    +-----------+-------------------------------------------------------------+
+    | Key       | Value                                                       |
+    +===========+=============================================================+
+    | samples   | (array, int) The samples, in increasing order               |
+    +-----------+-------------------------------------------------------------+
+    | xtv_vars  | (array, str) The TRACE graphic variables                    |
+    +-----------+-------------------------------------------------------------+
+    | num_times | (array, int) The number of time points of each sample       |
+    +-----------+-------------------------------------------------------------+
+    | time      | (array, float) The time of each sample, samples x time      |
+    +-----------+-------------------------------------------------------------+
+    | values    | (array, float) The values of the variables of each sample,  |
+    |           | samples x variables x time                                  |
+    +-----------+-------------------------------------------------------------+
+    """
+    contents = [read_csv(csv_fullname, len(xtv_vars))
+                for csv_fullname in csv_fullnames]
+
+    return make_store(samples, xtv_vars,
+                      [time for time, _ in contents],
+                      [values for _, values in contents])
+
+
+def make_store(samples: list, xtv_vars: list,
+               times: list, values: list) -> dict:
+    """Pad the time series of the samples and stack them into a result store
+
+    :param samples: (list, int) the samples
+    :param xtv_vars: (list, str) the list of TRACE graphic variables
+    :param times: (list of array) the time of each sample
+    :param values: (list of array) the values of each sample, variables x time
+    :return: the result store in a dictionary, see collect()
+    """
+    order = np.argsort(np.asarray(samples, dtype=np.int64), kind="stable")
+    num_times = np.array([len(time) for time in times], dtype=np.int64)
+    max_times = int(num_times.max()) if len(num_times) > 0 else 0
+
+    store = {
+        "samples": np.asarray(samples, dtype=np.int64)[order],
+        "xtv_vars": np.array(xtv_vars, dtype=str),
+        "num_times": num_times[order],
+        "time": np.full((len(samples), max_times), np.nan),
+        "values": np.full((len(samples), len(xtv_vars), max_times), np.nan)
+    }
+
+    for i, j in enumerate(order):
+        store["time"][i, :num_times[j]] = times[j]
+        store["values"][i, :, :num_times[j]] = values[j]
+
+    return store
+
+
+def write(store_fullname: str, store: dict):
+    """Write the result store, in the format given by its extension
+
+    The file is written under a temporary name and renamed afterward, so a
+    reader never reads a partially written store.
+
+    :param store_fullname: the fullname of the result store
+    :param store: the result store in a dictionary, see collect()
+    """
+    import os
+
+    store_format = store_fullname.rsplit(".", 1)[-1]
+    tmp_fullname = "{}.{}.tmp.{}" .format(store_fullname.rsplit(".", 1)[0],
+                                          os.getpid(), store_format)
+    try:
+        if store_format == "h5":
+            import h5py
+            with h5py.File(tmp_fullname, "w") as store_file:
+                for key in KEYS:
+                    if key == "xtv_vars":
+                        store_file[key] = store[key].astype(bytes)
+                    else:
+                        store_file[key] = store[key]
+        elif store_format == "npz":
+            with open(tmp_fullname, "wb") as store_file:
+                np.savez(store_file, **{key: store[key] for key in KEYS})
+        else:
+            raise ValueError("Unknown result store format {}"
+                             .format(store_format))
+        os.replace(tmp_fullname, store_fullname)
+    except BaseException:
+        if os.path.exists(tmp_fullname):
+            os.remove(tmp_fullname)
+        raise
+
+
+def read(store_fullname: str, keys: list=None) -> dict:
+    """Read the result store, in the format given by its extension
+
+    :param store_fullname: the fullname of the result store
+    :param keys: (list, str) the arrays to read, see KEYS. The others are not
+        read from the disk. If None, all of them.
+    :return: the result store in a dictionary, see collect()
+    """
+    if keys is None:
+        keys = KEYS
+    store_format = store_fullname.rsplit(".", 1)[-1]
+
+    if store_format == "h5":
+        import h5py
+        with h5py.File(store_fullname, "r") as store_file:
+            store = {key: store_file[key][()] for key in keys}
+        if "xtv_vars" in store:
+            store["xtv_vars"] = store["xtv_vars"].astype(str)
+    elif store_format == "npz":
+        with np.load(store_fullname, allow_pickle=False) as store_file:
+            store = {key: store_file[key] for key in keys}
+    else:
+        raise ValueError("Unknown result store format {}"
+                         .format(store_format))
+
+    return store
+
+
+def update(store_fullname: str, samples: list, csv_fullnames: list,
+           xtv_vars: list) -> dict:
+    """Add the csv files of the samples to the result store
+
+    The shards of the store (see append()) are merged into it as well and
+    removed afterward, so that the store is written only once. The samples
+    already in the store are replaced by the ones of the shards, in the order
+    they were appended, and by the given samples. The store (or a shard) is
+    left out if it holds another list of graphic variables, the store is
+    then started anew.
+
+    :param store_fullname: the fullname of the result store
+    :param samples: (list, int) the samples
+    :param csv_fullnames: (list, str) the csv file of each sample
+    :param xtv_vars: (list, str) the list of TRACE graphic variables
+    :return: the updated result store in a dictionary, see collect()
+    """
+    import os
+
+    shard_fullnames = get_shards(store_fullname)
+    stores = list()
+    for fullname in [store_fullname] + shard_fullnames:
+        if not os.path.isfile(fullname):
+            continue
+        store = read(fullname)
+        if store["xtv_vars"].tolist() != list(xtv_vars):
+            print("The graphic variables of {} differ, left out of the store"
+                  .format(fullname))
+            continue
+        stores.append(store)
+
+    stores.append(collect(samples, csv_fullnames, xtv_vars))
+    new_store = merge(stores)
+
+    write(store_fullname, new_store)
+    for shard_fullname in shard_fullnames:
+        os.remove(shard_fullname)
+
+    return new_store
+
+
+def append(store_fullname: str, samples: list, csv_fullnames: list,
+           xtv_vars: list) -> str:
+    """Append the csv files of the samples to the result store as a shard
+
+    Only the new samples are written, the store itself is left as it is until
+    the next update(). The shard is an npz file next to the store, numbered
+    after the existing ones, see make_shard_filename().
+
+    :param store_fullname: the fullname of the result store
+    :param samples: (list, int) the samples
+    :param csv_fullnames: (list, str) the csv file of each sample
+    :param xtv_vars: (list, str) the list of TRACE graphic variables
+    :return: the fullname of the shard
+    """
+    shard_fullnames = get_shards(store_fullname)
+    index = get_shard_index(shard_fullnames[-1]) + 1 if shard_fullnames \
+        else 1
+
+    shard_fullname = make_shard_filename(store_fullname, index)
+    write(shard_fullname, collect(samples, csv_fullnames, xtv_vars))
+
+    return shard_fullname
+
+
+def make_shard_filename(store_fullname: str, index: int) -> str:
+    """Create the fullname of a shard of the result store
+
+    :param store_fullname: the fullname of the result store
+    :param index: the number of the shard, starting from 1
+    :return: the fullname of the shard, "<store>.shard<index>.npz"
+    """
+    return "{}.shard{}.npz" .format(store_fullname, index)
+
+
+def get_shard_index(shard_fullname: str) -> int:
+    """Get the number of a shard of the result store
+
+    :param shard_fullname: the fullname of the shard
+    :return: the number of the shard
+    """
+    return int(shard_fullname.rsplit(".shard", 1)[1].split(".", 1)[0])
+
+
+def get_shards(store_fullname: str) -> list:
+    """Get the shards of the result store, in the order they were appended
+
+    :param store_fullname: the fullname of the result store
+    :return: (list, str) the fullnames of the shards
+    """
+    import glob
+
+    return sorted(glob.glob("{}.shard*.npz" .format(glob.escape(
+        store_fullname))), key=get_shard_index)
+
+
+def get_samples(store_fullname: str) -> list:
+    """Get the samples in the result store or in its shards
+
+    :param store_fullname: the fullname of the result store
+    :return: (list, int) the samples, in increasing order
+    """
+    import os
+
+    samples = set()
+    for fullname in [store_fullname] + get_shards(store_fullname):
+        if os.path.isfile(fullname):
+            samples.update(read(fullname, ["samples"])["samples"].tolist())
+
+    return sorted(samples)
+
+
+def remove(store_fullname: str, samples: list) -> int:
+    """Remove the samples from the result store and its shards, if they exist
+
+    :param store_fullname: the fullname of the result store
+    :param samples: (list, int) the samples to be removed
+    :return: the number of samples removed from the store (a sample also in
+        a shard is counted once)
+    """
+    import os
+
+    removed = set()
+    for fullname in [store_fullname] + get_shards(store_fullname):
+        if not os.path.isfile(fullname):
+            continue
+        store = read(fullname)
+        keep = ~np.isin(store["samples"], samples)
+        if np.all(keep):
+            continue
+        removed.update(store["samples"][~keep].tolist())
+        if fullname != store_fullname and not np.any(keep):
+            os.remove(fullname)
+        else:
+            write(fullname, select(store, keep))
+
+    return len(removed)
+
+
+def select(store: dict, keep) -> dict:
+    """Select samples of a result store
+
+    :param store: the result store in a dictionary, see collect()
+    :param keep: (array, bool) the mask of the samples to keep
+    :return: the result store of the selected samples, trimmed to the longest
+        remaining time series
+    """
+    num_times = store["num_times"][keep]
+    max_times = int(num_times.max()) if len(num_times) > 0 else 0
+
+    return {
+        "samples": store["samples"][keep],
+        "xtv_vars": store["xtv_vars"],
+        "num_times": num_times,
+        "time": store["time"][keep, :max_times],
+        "values": store["values"][keep, :, :max_times]
+    }
+
+
+def merge(stores: list) -> dict:
+    """Merge result stores of the same list of graphic variables
+
+    :param stores: (list, dict) the result stores, a sample of a store
+        replaces the same sample in the previous ones
+    :return: the merged result store
+    """
+    # Keep each sample from the last store holding it
+    seen = set()
+    kept = list()
+    for store in reversed(stores):
+        keep = ~np.isin(store["samples"], list(seen))
+        seen.update(store["samples"].tolist())
+        kept.append(select(store, keep))
+    kept.reverse()
+
+    return make_store(
+        np.concatenate([_["samples"] for _ in kept]).tolist(),
+        stores[-1]["xtv_vars"].tolist(),
+        [time[:num] for _ in kept
+         for time, num in zip(_["time"], _["num_times"])],
+        [values[:, :num] for _ in kept
+         for values, num in zip(_["values"], _["num_times"])])
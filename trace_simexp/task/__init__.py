@@ -9,6 +9,8 @@
 from . import aptscript
 from . import clean
 from . import dmx2csv
+from . import link
+from . import pipeline
 from . import trace
 from . import xtv2dmx
 
@@ -26,7 +26,7 @@ def read(trace_variables_contents: list) -> list:
     return vars_list
 
 
-def make_apt(run_filename: str, xtv_vars_name: str,
+def make_apt(run_filenames, xtv_vars_name: str,
              xtv_vars: list, xtv_ext="dmx") -> list:
     """Function to create an aptplot input file according to the requested vars
 
@@ -38,7 +38,13 @@ def make_apt(run_filename: str, xtv_vars_name: str,
         xtv_vars_filename = "xtvVars"
         csv_filename = "febaTrans216-run_1-xtvVars.csv"
 
-    :param run_filename: the run name, case_name + sample_num
+    Several runs can be extracted in a single aptplot session, the graphic file
+    of each run is then opened, read, exported, and closed in turn. The run
+    filename may include the path relative to the working directory of
+    aptplot, e.g., "febaTrans216-run_1/febaTrans216-run_1".
+
+    :param run_filenames: (str or list, str) the run name, case_name +
+        sample_num, or the run names of all the runs of the session
     :param xtv_vars_name: the name of the xtv variables list file
     :param xtv_vars: the list of TRACE graphic variables
     :param xtv_ext: the extension of the TRACE output, dmx or xtv
@@ -46,17 +52,23 @@ def make_apt(run_filename: str, xtv_vars_name: str,
     """
     apt_script = list()
 
-    apt_script.append("TRAC 0 XTV \"{}.{}\"" .format(run_filename, xtv_ext))
+    if isinstance(run_filenames, str):
+        run_filenames = [run_filenames]
+
+    for run_filename in run_filenames:
+        apt_script.append("TRAC 0 XTV \"{}.{}\""
+                          .format(run_filename, xtv_ext))
+
+        # Write all the requested TRACE graphic variables
+        for xtv_var in xtv_vars:
+            apt_script.append("TREAD 0 \"{}\" SIU" .format(xtv_var))
 
-    # Write all the requested TRACE graphic variables
-    for xtv_var in xtv_vars:
-        apt_script.append("TREAD 0 \"{}\" SIU" .format(xtv_var))
+        # Make the filename
+        csv_filename = "{}-{}.csv" .format(run_filename, xtv_vars_name)
 
-    # Make the filename
-    csv_filename = "{}-{}.csv" .format(run_filename, xtv_vars_name)
+        apt_script.append("TRAC 0 EXPORT CSV \"{}\"" .format(csv_filename))
+        apt_script.append("TRAC 0 CLOSE")
 
-    apt_script.append("TRAC 0 EXPORT CSV \"{}\"" .format(csv_filename))
-    apt_script.append("TRAC 0 CLOSE")
     apt_script.append("EXIT")
 
     return apt_script
@@ -4,38 +4,161 @@
     ***********************
 
     Module to clean up files and directories contents
+
+    The files are removed in-process (without spawning a shell command per
+    file). The removal can be spread over a pool of threads, which pays off
+    when the run directories reside on a network file system where each
+    removal waits for a round trip to the server.
 """
 
 __author__ = "Damar Wicaksono"
 
 
-def rm_files(files: list):
+def rm_files(files: list, num_threads: int=None) -> tuple:
     """Remove the listed files
 
-    :param csv_files: the list files or directories, fullname
-    """
-    import subprocess
-    import os
+    Regular files and symbolic links are unlinked (the target of a link is
+    left intact), directories are removed with all of their contents.
+    Non-existing entries are skipped.
 
-    for file in files:
-        if os.path.isfile(file):
-            subprocess.call(["rm", file])
-        elif os.path.islink(file):
-            subprocess.call(["rm", file])
-        elif os.path.isdir(file):
-            subprocess.call(["rm", "-rf", file])
+    :param files: the list files or directories, fullname
+    :param num_threads: the number of threads to remove the files with,
+        if None or 1 the files are removed one after another
+    :return: a tuple of the number of removed files and the number of freed
+        bytes
+    """
+    return total(map_threads(remove, files, num_threads))
 
 
-def rm_except(directories: list, files: list):
+def rm_except(directories: list, files: list, num_threads: int=None) -> tuple:
     """Remove the all the directory contents except a single file
 
+    The regular files inside each directory and its subdirectories are
+    removed, except the ones with the given name. Subdirectories and symbolic
+    links are left intact.
+
     :param directories: the list of directories
     :param files: files within the directories not to be deleted
+    :param num_threads: the number of threads to remove the files with,
+        if None or 1 the files are removed one after another
+    :return: a tuple of the number of removed files and the number of freed
+        bytes
     """
-    import subprocess
-
+    to_remove = list()
     for directory, file in zip(directories, files):
-        tmp_script = "find '{}' ! -name {} -type f -delete" .format(directory,
-                                                                    file)
-        # Use the whole string with shell interpreter
-        subprocess.call(tmp_script, shell=True)
+        to_remove.extend(scan_files(directory, file))
+
+    return total(map_threads(remove, to_remove, num_threads))
+
+
+def remove(path: str) -> tuple:
+    """Remove a single file, symbolic link, or directory tree
+
+    :param path: the fullname of the file, link, or directory
+    :return: a tuple of the number of removed files and the number of freed
+        bytes, (0, 0) if the path does not exist
+    """
+    import os
+    import stat
+    import shutil
+
+    try:
+        status = os.lstat(path)
+    except FileNotFoundError:
+        return 0, 0
+
+    if stat.S_ISDIR(status.st_mode):
+        # Sum up the contents before removing the whole tree
+        num_files, num_bytes = total(
+            (1, entry.stat(follow_symlinks=False).st_size)
+            for entry in scan_tree(path))
+        shutil.rmtree(path)
+        return num_files, num_bytes
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        # Removed in the meantime
+        return 0, 0
+
+    return 1, status.st_size
+
+
+def scan_tree(directory: str):
+    """Iterate over the files and links inside a directory, recursively
+
+    Symbolic links to directories are not followed.
+
+    :param directory: the fullname of the directory
+    :return: an iterator of os.DirEntry of the files and links
+    """
+    import os
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_tree(entry.path)
+            else:
+                yield entry
+
+
+def scan_files(directory: str, keep: str) -> list:
+    """Get the regular files inside a directory, recursively, except some
+
+    :param directory: the fullname of the directory
+    :param keep: the name of the files not to be collected
+    :return: (list, str) the fullnames of the regular files
+    """
+    import os
+
+    if not os.path.isdir(directory):
+        return []
+
+    return [entry.path for entry in scan_tree(directory)
+            if entry.is_file(follow_symlinks=False) and entry.name != keep]
+
+
+def map_threads(function, items: list, num_threads: int=None) -> list:
+    """Apply a function to each of the items, optionally on a pool of threads
+
+    :param function: the function to apply, taking a single item
+    :param items: the list of items
+    :param num_threads: the number of threads, if None or 1 the function is
+        applied in the calling thread
+    :return: the list of results in the order of the items
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if num_threads is not None and num_threads <= 0:
+        raise ValueError("The number of threads must be > 0")
+
+    if num_threads is None or num_threads == 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        return list(executor.map(function, items))
+
+
+def total(counts) -> tuple:
+    """Sum up the number of removed files and freed bytes
+
+    :param counts: the iterable of tuples of number of files and bytes
+    :return: a tuple of the total number of files and the total bytes
+    """
+    num_files = 0
+    num_bytes = 0
+    for files, size in counts:
+        num_files += files
+        num_bytes += size
+
+    return num_files, num_bytes
+
+
+def format_count(counts: tuple) -> str:
+    """Describe the number of removed files and freed bytes for the user
+
+    :param counts: a tuple of the number of removed files and freed bytes
+    :return: the description as string
+    """
+    return "{} file(s) removed, {:.1f} MB freed" \
+        .format(counts[0], counts[1] / 1024**2)
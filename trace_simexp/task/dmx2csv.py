@@ -4,93 +4,188 @@
     *************************
     
     Module to prepare and execute extraction of variables from the dmx to a csv
+
+    The runs are split into chunks, each extracted by a single aptplot session
+    (one JVM) instead of starting aptplot anew for every run.
 """
 
 __author__ = "Damar Wicaksono"
 
 
-def run(aptplot_executable: str, 
-        xtv_vars: list, xtv_vars_name:str,
-        run_names: list, run_dirnames: list, 
-        info_filename: str):
-    """Function to execute the aptplot in batch mode to extract trace variables
+def make_sessions(num_runs: int, num_procs: int=None) -> list:
+    """Split the runs into contiguous chunks, one per aptplot session
+
+    :param num_runs: the number of runs, indexed from 0 to num_runs - 1
+    :param num_procs: the maximum number of simultaneous aptplot processes,
+        the runs are evenly split into as many sessions. If None, each run has
+        its own session.
+    :return: (list of list, int) the indices of the runs of each session
+    """
+    import numpy as np
+
+    if num_runs <= 0:
+        return list()
+    if num_procs is None:
+        num_procs = num_runs
+
+    return [chunk.tolist() for chunk in
+            np.array_split(np.arange(num_runs), min(num_procs, num_runs))]
+
+
+def make_stage(aptplot_executable: str,
+               xtv_vars: list, xtv_vars_name: str,
+               run_names: list, run_dirnames: list, sessions: list,
+               info_filename: str, num_procs: int=None) -> dict:
+    """Create the pipeline stage specification of the extraction
+
+    A job of the stage is an aptplot session, the finish function returns the
+    return code of each run of the session, see report().
 
     :param aptplot_executable: the fullname of aptplot executable
     :param xtv_vars: the list of TRACE graphic variables to be extracted
     :param xtv_vars_name: the name of the list of graphic variables file
     :param run_names: The run names = case_name + sample_num
     :param run_dirnames: the run directory names, relative to driver script
+    :param sessions: (list of list, int) the indices of the runs of each
+        session, see make_sessions()
     :param info_filename: the postpro.info file to be appended
+    :param num_procs: the maximum number of simultaneous aptplot processes,
+        if None there is no limit
+    :return: the stage specification, see task.pipeline.run()
+    """
+    def select(items: list, i: int) -> list:
+        return [items[j] for j in sessions[i]]
+
+    stage = {
+        "name": "extract",
+        "num_procs": num_procs,
+        "start": lambda i: submit(aptplot_executable,
+                                  xtv_vars, xtv_vars_name,
+                                  select(run_names, i),
+                                  select(run_dirnames, i)),
+        "finish": lambda i, returncode: report(aptplot_executable,
+                                               xtv_vars_name, returncode,
+                                               select(run_names, i),
+                                               select(run_dirnames, i),
+                                               info_filename)
+    }
+
+    return stage
+
+
+async def submit(aptplot_executable: str,
+                 xtv_vars: list, xtv_vars_name: str,
+                 run_names: list, run_dirnames: list):
+    """Write the aptscript of a session and submit aptplot in batch mode
+
+    The session is run in the parent directory of the run directories (i.e.,
+    the directory of the design matrix), where its aptscript is written.
+
+    :param aptplot_executable: the fullname of aptplot executable
+    :param xtv_vars: the list of TRACE graphic variables to be extracted
+    :param xtv_vars_name: the name of the list of graphic variables file
+    :param run_names: The run names of the session = case_name + sample_num
+    :param run_dirnames: the run directory names of the session, relative to
+        driver script
+    :return: the asyncio subprocess of the submitted job
     """
     import os
-    import subprocess
-    import time
+    import asyncio
 
     from . import aptscript
 
-    def done(p):
-        return p.poll() == 0
-
-    def success(p):
-        return p.returncode == 0
-
-    processes = list()
-    apt_script_files = list()
-
-    # Open the exec.info file to be appended
-    info_file = open(info_filename, "a")
-
-    # Loop over the runs in the batch and create an aptplot process
-    for run_name, run_dirname in zip(run_names, run_dirnames):
-
-        # Create a string of apt command
-        apt_script = aptscript.make_apt(run_name, xtv_vars_name, xtv_vars)
-
-        # Write the aptscript into a temporary files
-        apt_script_filename = "{}-{}.apt" .format(run_name, xtv_vars_name)
-        apt_script_fullname = "{}/{}" .format(run_dirname, apt_script_filename)
-        with open(apt_script_fullname, "w") as apt_script_file:
-            for line in apt_script:
-                apt_script_file.writelines("{}\n" .format(line))
-
-        # Create a process and collect them in a list
-        process = subprocess.Popen(
-            [aptplot_executable, "-batch", apt_script_filename, "-nowin"], 
-            cwd=run_dirname
-        )
-        processes.append(process)
-
-        # Create list of files to be cleanup later
-        apt_script_files.append(apt_script_fullname)
-
-    # Loop over processes and wait for them to finish
-    while True:
-        for i, process in enumerate(processes):
-            cmd_str = subprocess.list2cmdline(process.args)  # the string cmd
-            try:
-                process.wait(timeout=8000)
-            except subprocess.TimeoutExpired:
-                process.kill()
-
-            if done(process):
-                if not success(process):
-                    info_file.writelines("Execution Failed: {}\n"
-                                         .format(cmd_str))
-                else:
-                    info_file.writelines("Execution Successful: {}\n"
-                                         .format(cmd_str))
-
-                # remove the process
-                processes.remove(process)
-
-        if not processes:
-            break
+    # Create a string of apt command, the files relative to the session
+    work_dirname = os.path.dirname(run_dirnames[0])
+    apt_script = aptscript.make_apt(
+        [os.path.join(os.path.basename(run_dirname), run_name)
+         for run_name, run_dirname in zip(run_names, run_dirnames)],
+        xtv_vars_name, xtv_vars)
+
+    # Write the aptscript into a temporary files
+    apt_script_filename = make_apt_filename(make_session_name(run_names),
+                                            xtv_vars_name)
+    apt_script_fullname = os.path.join(work_dirname, apt_script_filename)
+    with open(apt_script_fullname, "w") as apt_script_file:
+        for line in apt_script:
+            apt_script_file.writelines("{}\n" .format(line))
+
+    # Create a process
+    process = await asyncio.create_subprocess_exec(
+        aptplot_executable, "-batch", apt_script_filename, "-nowin",
+        cwd=work_dirname
+    )
+
+    return process
+
+
+def report(aptplot_executable: str, xtv_vars_name: str, returncode: int,
+           run_names: list, run_dirnames: list, info_filename: str) -> list:
+    """Report the outcome of a finished aptplot session and clean up its script
+
+    A run of the session is successful if the session is and its csv file
+    has been exported. The failed runs are listed after the session.
+
+    :param aptplot_executable: the fullname of aptplot executable
+    :param xtv_vars_name: the name of the list of graphic variables file
+    :param returncode: the return code of the finished process
+    :param run_names: The run names of the session = case_name + sample_num
+    :param run_dirnames: the run directory names of the session, relative to
+        driver script
+    :param info_filename: the postpro.info file to be appended
+    :return: (list, int) the return code of each run of the session, 1 for a
+        run without csv file after a successful session
+    """
+    import os
+    import subprocess
+
+    apt_script_filename = make_apt_filename(make_session_name(run_names),
+                                            xtv_vars_name)
+    cmd_str = subprocess.list2cmdline(
+        [aptplot_executable, "-batch", apt_script_filename, "-nowin"])
+
+    returncodes = list()
+    with open(info_filename, "a") as info_file:
+        if returncode != 0:
+            info_file.writelines("Execution Failed: {}\n" .format(cmd_str))
         else:
-            time.sleep(0.05)
+            info_file.writelines("Execution Successful: {}\n"
+                                 .format(cmd_str))
+
+        for run_name, run_dirname in zip(run_names, run_dirnames):
+            csv_fullname = os.path.join(
+                run_dirname, "{}-{}.csv" .format(run_name, xtv_vars_name))
+            if os.path.isfile(csv_fullname):
+                returncodes.append(returncode)
+            else:
+                returncodes.append(returncode if returncode != 0 else 1)
+            if returncodes[-1] != 0:
+                info_file.writelines("Extraction Failed: {}\n"
+                                     .format(run_name))
 
     # Clean up temporary aptscript file
-    for apt_script_file in apt_script_files:
-        os.remove(apt_script_file)
+    os.remove(os.path.join(os.path.dirname(run_dirnames[0]),
+                           apt_script_filename))
+
+    return returncodes
 
-    # Close the appended exec.info file
-    info_file.close()
+
+def make_session_name(run_names: list) -> str:
+    """Create the name of an aptplot session, unique to the current process
+
+    :param run_names: The run names of the session = case_name + sample_num
+    :return: the session name, after the first run of the session
+    """
+    import os
+
+    return "{}-session_{}" .format(run_names[0], os.getpid())
+
+
+def make_apt_filename(run_name: str, xtv_vars_name: str) -> str:
+    """Create the filename of the temporary aptscript of a run or a session
+
+    :param run_name: The run name = case_name + sample_num, or the session
+        name, see make_session_name()
+    :param xtv_vars_name: the name of the list of graphic variables file
+    :return: the aptscript filename
+    """
+    return "{}-{}.apt" .format(run_name, xtv_vars_name)
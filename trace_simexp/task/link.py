@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.task.link
+    **********************
+
+    Module to create the symbolic links between the files in the run
+    directories and their actual location (e.g., in the scratch directory)
+
+    The links are created in-process for a whole set of samples in one pass.
+    Each link is first created under a temporary name and then renamed over
+    the old one, so a link is never missing or half-written for the job using
+    it.
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def make(targets: list, link_names: list, remove_targets: bool=False) -> list:
+    """Create symbolic links to the targets, replacing existing ones atomically
+
+    The directories of the targets and of the links are created beforehand if
+    they do not exist, each of them only once.
+
+    :param targets: the list of fullnames the links point to
+    :param link_names: the list of fullnames of the links
+    :param remove_targets: flag to remove existing targets (e.g., the xtv
+        file of a previous run) so that the links are fresh
+    :return: (list, str) the links whose target cannot be resolved, i.e., its
+        directory does not exist, see get_dangling()
+    """
+    import os
+
+    # Create all the required directories in a single pass
+    dirnames = set(os.path.dirname(name) for name in targets + link_names)
+    for dirname in sorted(dirnames):
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+    for target, link_name in zip(targets, link_names):
+
+        # Remove the leftover of a previous run, but never a directory
+        if remove_targets and os.path.lexists(target) \
+                and not os.path.isdir(target):
+            os.unlink(target)
+
+        # Create the link under a temporary name and swap it in place
+        tmp_name = "{}.{}.tmp" .format(link_name, os.getpid())
+        if os.path.lexists(tmp_name):
+            os.unlink(tmp_name)
+        os.symlink(target, tmp_name)
+        os.replace(tmp_name, link_name)
+
+    return get_dangling(link_names, pending=True)
+
+
+def get_dangling(link_names: list, pending: bool=False) -> list:
+    """Get the links pointing to a non-existing target
+
+    :param link_names: the list of fullnames of the links
+    :param pending: flag to accept targets not yet written (e.g., the xtv
+        file before TRACE is executed) as long as their directory exists
+    :return: (list, str) the dangling links, missing links are included
+    """
+    import os
+
+    dangling = list()
+    for link_name in link_names:
+        if not os.path.islink(link_name):
+            dangling.append(link_name)
+            continue
+
+        target = os.path.join(os.path.dirname(link_name),
+                              os.readlink(link_name))
+        if pending:
+            target = os.path.dirname(target)
+        if not os.path.exists(target):
+            dangling.append(link_name)
+
+    return dangling
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.task.pipeline
+    **************************
+
+    Module to move a set of jobs through a chain of stages, each job advancing
+    to the next stage as soon as its previous stage is finished.
+
+    The jobs are run as asyncio subprocesses, the completion of a process is
+    signaled by the event loop (instead of polling) so that a freed slot is
+    refilled right away. A process which exceeds the timeout of its stage, or
+    whose job is cancelled, is killed.
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def run(num_jobs: int, stages: list):
+    """Run all jobs through the chain of stages and wait until all are done
+
+    Each stage is specified as a dictionary:
+
+    +-----------+-------------------------------------------------------------+
+    | Key       | Value                                                       |
+    +===========+=============================================================+
+    | name      | (str) The name of the stage                                 |
+    +-----------+-------------------------------------------------------------+
+    | num_procs | (int or None) The maximum number of jobs simultaneously in  |
+    |           | the stage, if None there is no limit                        |
+    +-----------+-------------------------------------------------------------+
+    | start     | (function) Called with the job index to start the stage of  |
+    |           | the job. Returns either an awaitable of an asyncio          |
+    |           | subprocess or None if the stage was carried out directly    |
+    |           | (in-process)                                                |
+    +-----------+-------------------------------------------------------------+
+    | finish    | (function or None) Called with the job index and the return |
+    |           | code of the process (or None) once the stage is done        |
+    +-----------+-------------------------------------------------------------+
+    | timeout   | (float or None, optional) The time a process of the stage   |
+    |           | may run, in seconds, before it is killed (the return code   |
+    |           | is then negative). If None, there is no limit.              |
+    +-----------+-------------------------------------------------------------+
+
+    Jobs enter the first stage in the order of their indices. A job enters
+    the next stage as soon as it is finished with the previous one, regardless
+    of the other jobs. The stages therefore overlap, e.g., a conversion of one
+    job runs while the simulations of other jobs are still running.
+
+    :param num_jobs: the number of jobs, indexed from 0 to num_jobs - 1
+    :param stages: the list of stage specification, in the order of execution
+    """
+    drain(iterate(num_jobs, stages))
+
+
+def drain(events):
+    """Run an asynchronous iterator of events to completion in a new event loop
+
+    This is the blocking entry point for the command line interfaces, the
+    events themselves are discarded. If it is interrupted (e.g., by Ctrl+C),
+    the iterator is closed so that its running processes are killed.
+
+    :param events: the asynchronous generator, e.g., from iterate()
+    """
+    import asyncio
+
+    async def consume():
+        try:
+            async for _ in events:
+                pass
+        finally:
+            await events.aclose()
+
+    asyncio.run(consume())
+
+
+async def iterate(num_jobs: int, stages: list):
+    """Run the jobs through the stages and yield an event per finished stage
+
+    The stages are specified as in run(). An event is a dictionary:
+
+    +------------+------------------------------------------------------------+
+    | Key        | Value                                                      |
+    +============+============================================================+
+    | job        | (int) The index of the job                                 |
+    +------------+------------------------------------------------------------+
+    | stage      | (str) The name of the stage the job has just finished      |
+    +------------+------------------------------------------------------------+
+    | returncode | (int or None) The return code of the process of the stage, |
+    |            | None if the stage was carried out in-process               |
+    +------------+------------------------------------------------------------+
+
+    The events are yielded in the order the stages finish. A job is complete
+    once the event of the last stage is yielded. If a job fails or the
+    generator is closed before all jobs are complete (e.g., the consumer
+    stops early), the other jobs are cancelled and their processes killed.
+
+    :param num_jobs: the number of jobs, indexed from 0 to num_jobs - 1
+    :param stages: the list of stage specification, in the order of execution
+    """
+    import asyncio
+
+    if num_jobs <= 0 or not stages:
+        return
+
+    # Each stage has its own limit of simultaneous jobs
+    limits = list()
+    for stage in stages:
+        num_procs = stage.get("num_procs")
+        limits.append(asyncio.Semaphore(
+            num_jobs if num_procs is None else num_procs))
+
+    events = asyncio.Queue()
+    jobs = [asyncio.ensure_future(run_job(i, stages, limits, events))
+            for i in range(num_jobs)]
+
+    async def run_all():
+        try:
+            await asyncio.gather(*jobs)
+        finally:
+            # Mark the end of the events
+            events.put_nowait(None)
+
+    runner = asyncio.ensure_future(run_all())
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        # Raise the exception of a failed job, if any
+        await runner
+    finally:
+        # Do not leave the other jobs behind if one of them fails or
+        # the consumer stops early, wait until their processes are killed
+        for job in jobs:
+            job.cancel()
+        runner.cancel()
+        await asyncio.gather(runner, *jobs, return_exceptions=True)
+
+
+async def run_job(i: int, stages: list, limits: list, events):
+    """Coroutine to move a single job through the chain of stages
+
+    :param i: the index of the job
+    :param stages: the list of stage specification, in the order of execution
+    :param limits: the list of semaphore limiting the jobs in each stage
+    :param events: the asyncio.Queue to put the event of each finished stage
+    """
+    import asyncio
+    import inspect
+
+    for stage, limit in zip(stages, limits):
+        async with limit:
+            process = stage["start"](i)
+            if inspect.isawaitable(process):
+                process = await process
+            if process is None:
+                returncode = None
+            else:
+                try:
+                    # Suspend until the event loop reaps the process
+                    returncode = await asyncio.wait_for(process.wait(),
+                                                        stage.get("timeout"))
+                except asyncio.TimeoutError:
+                    returncode = await kill(process)
+                except BaseException:
+                    # The job is cancelled, do not leave the process behind
+                    await kill(process)
+                    raise
+
+        if stage.get("finish") is not None:
+            stage["finish"](i, returncode)
+
+        events.put_nowait({"job": i,
+                           "stage": stage["name"],
+                           "returncode": returncode})
+
+
+async def kill(process) -> int:
+    """Coroutine to kill a process, if it is still running, and reap it
+
+    :param process: the asyncio subprocess
+    :return: the return code of the process
+    """
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            # The process has just finished
+            pass
+
+    return await process.wait()
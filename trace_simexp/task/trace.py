@@ -3,88 +3,67 @@
     trace_simexp.task.trace
     ***********************
 
-    Module to execute TRACE tasks simultaneously for task within a batch and
-    sequentially between batches
+    Module to submit TRACE jobs and report their outcome, the simulate stage
+    of the execute phase pipeline (see task.pipeline and execute.run_samples())
 """
 
 __author__ = "Damar Wicaksono"
 
+# The time a TRACE job may run before it is killed, in seconds
+TIMEOUT = 8000
 
-def run(trace_commands: list, log_files: list, 
-        run_dirnames: list, info_filename: str):
-    """Submit multiple trace jobs and wait until finish
 
-    :param trace_commands: the list of trace shell commands
-    :param log_files: the list of logfullnames
-    :param run_dirnames: list of run directory names,
+async def submit(trace_command: list, log_file: str, run_dirname: str):
+    """Submit a single trace job without waiting for it to finish
+
+    :param trace_command: the trace shell command
+    :param log_file: the log fullname, the standard output of the job
+    :param run_dirname: the run directory name,
         used as the working directory for the shell command execution
+    :return: the asyncio subprocess of the submitted job
+    """
+    import asyncio
+    import subprocess
+
+    with open(log_file, "wt") as log:
+        # Make some description in the log file
+        log.write("###\n")
+        log.write("Executing: {}\n"
+                  .format(subprocess.list2cmdline(trace_command)))
+        log.flush()
+
+        # Create a process, the process keeps its own handle of the log file
+        process = await asyncio.create_subprocess_exec(*trace_command,
+                                                       stdout=log,
+                                                       cwd=run_dirname)
+
+    return process
+
+
+def report(trace_command: list, returncode: int,
+           log_file: str, info_filename: str):
+    """Report the outcome of a finished trace job in the log and info file
+
+    :param trace_command: the trace shell command of the job
+    :param returncode: the return code of the finished job
+    :param log_file: the log fullname of the job
     :param info_filename: exec infofile to be appended
     """
     import subprocess
-    import time
 
-    # Preserve some lists for re-use
-    run_dirnames_cp = run_dirnames.copy()
-    log_files_cp = log_files.copy()
-    
-    if not trace_commands:
-        return
-
-    def done(p):
-        return p.poll() == 0
-
-    def success(p):
-        return p.returncode == 0
-
-    processes = []
-
-    # Open the info filename to be appended
-    info_file = open(info_filename, "a")
-
-    while True:
-        while trace_commands:
-            
-            # Loop over all the passed arguments
-            task = trace_commands.pop(0)
-            log_file = open(log_files_cp.pop(0), "wt")
-            run_dirname = run_dirnames_cp.pop(0)
-            
-            # Create a process and collect them in a list
-            process = subprocess.Popen(task, stdout=log_file, cwd=run_dirname)
-            processes.append(process)
-            
-            # Make some description in the log file
-            log_file.write("###\n")
-            log_file.write("Executing: {}\n"
-                           .format(subprocess.list2cmdline(process.args)))
-        
-        # Loop over process and wait them to finish    
-        for process in processes:
-            try:
-                process.wait(timeout=8000)
-            except subprocess.TimeoutExpired:
-                process.kill()
-
-            if done(process):
-                if not success(process):
-                    log_file.write("TRACE execution is killed - TimeOutError")
-                    info_file.writelines(
-                        "Execution Failed: {}\n"
-                            .format(subprocess.list2cmdline(process.args)))
+    cmd_str = subprocess.list2cmdline(trace_command)
+
+    with open(info_filename, "a") as info_file:
+        if returncode != 0:
+            with open(log_file, "at") as log:
+                if returncode < 0:
+                    log.write("TRACE execution is killed - TimeOutError")
                 else:
-                    info_file.writelines(
-                        "Execution Successful: {}\n"
-                              .format(subprocess.list2cmdline(process.args)))
-                log_file.close()
-                processes.remove(process)
-
-        if not processes:
-            break
+                    log.write("TRACE execution failed")
+            info_file.writelines("Execution Failed: {}\n" .format(cmd_str))
         else:
-            time.sleep(0.05)
-
-    # Close the info file 
-    info_file.close()
+            info_file.writelines("Execution Successful: {}\n"
+                                 .format(cmd_str))
 
 
 def make_commands(trace_executable: str, tracin_filenames: list) -> list:
@@ -107,25 +86,22 @@ def link_xtv(scratch_dirnames: list, run_xtvs: list, scratch_xtvs: list):
     """Create a soft link between xtv in the run directories and in the scratch
 
     The actual xtv file is located in the scratch to save space in the more 
-    limited activity folder
+    limited activity folder. All the links are created in a single pass, an
+    existing xtv in the scratch is removed.
     
     :param scratch_dirnames: the list of the scratch directory names, 
         will be created if they do not exist 
     :param run_xtvs: the list of xtv fullnames in the run directory
     :param scratch_xtvs: the list of xtv fullnames in the scratch
     """
-    import subprocess
     import os
+    from . import link
 
     for scratch_dirname in scratch_dirnames:
+        os.makedirs(scratch_dirname, exist_ok=True)
 
-        if not os.path.exists(scratch_dirname):
-            os.makedirs(scratch_dirname)
-
-    for scratch_xtv, run_xtv in zip(scratch_xtvs, run_xtvs):
-        if os.path.isfile(scratch_xtv):
-            subprocess.call(["rm", "-f", scratch_xtv])
-        if os.path.islink(run_xtv):
-            subprocess.call(["rm", "-f", run_xtv])
-            
-        subprocess.call(["ln", "-s", scratch_xtv, run_xtv])
+    dangling = link.make(scratch_xtvs, run_xtvs, remove_targets=True)
+    if dangling:
+        for run_xtv in dangling:
+            print("{} is a dangling link!" .format(run_xtv))
+        raise ValueError("Some xtv link cannot be resolved!")
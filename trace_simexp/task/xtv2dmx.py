@@ -3,91 +3,65 @@
     trace_simexp.task.xtv2dmx
     *************************
 
-    Module to execute XTV2DMX tasks simultaneously for task within a batch and
-    sequentially between batches
+    Module to submit XTV2DMX jobs and report their outcome, the convert stage
+    of the execute phase pipeline (see task.pipeline and execute.run_samples())
 """
 
 __author__ = "Damar Wicaksono"
 
+# The time a conversion job may run before it is killed, in seconds
+TIMEOUT = 8000
 
-def run(xtv2dmx_commands: list, log_files: list, 
-        run_dirnames: list, info_filename: str):
-    """Submit multiple xtv to dmx conversion jobs and wait until finish
-    
-    :param xtv2dmx_commands: list of xtv2dmx shell commands
-    :param log_files: list of log fullnames
-    :param run_dirnames: list of run directory names, 
+
+async def submit(xtv2dmx_command: list, log_file: str, run_dirname: str):
+    """Submit a single xtv to dmx conversion job without waiting for it
+
+    :param xtv2dmx_command: the xtv2dmx shell command
+    :param log_file: the log fullname, appended with the output of the job
+    :param run_dirname: the run directory name,
         used as the working directory for the shell command execution
+    :return: the asyncio subprocess of the submitted job
+    """
+    import asyncio
+    import subprocess
+
+    with open(log_file, "at") as log:
+        # Make some description in the log file
+        log.write("###\n")
+        log.write("Executing: {}\n"
+                  .format(subprocess.list2cmdline(xtv2dmx_command)))
+        log.flush()
+
+        # Create a process, the process keeps its own handle of the log file
+        process = await asyncio.create_subprocess_exec(*xtv2dmx_command,
+                                                       stdout=log,
+                                                       stderr=log,
+                                                       cwd=run_dirname)
+
+    return process
+
+
+def report(xtv2dmx_command: list, returncode: int,
+           log_file: str, info_filename: str):
+    """Report the outcome of a finished conversion job in the log and info file
+
+    :param xtv2dmx_command: the xtv2dmx shell command of the job
+    :param returncode: the return code of the finished job
+    :param log_file: the log fullname of the job
     :param info_filename: (str) the exec.info file to be appended
     """
     import subprocess
-    import time
-    
-    # Preserve some lists for re-use
-    run_dirnames_cp = run_dirnames.copy()
-    log_files_cp = log_files.copy()
-    
-    if not xtv2dmx_commands:
-        return
-    
-    def done(p):
-        return p.poll() == 0
 
-    def success(p):
-        return p.returncode == 0
-        
-    processes = []
+    cmd_str = subprocess.list2cmdline(xtv2dmx_command)
 
-    # Open the exec.info file to be appended
-    info_file = open(info_filename, "a")
-    
-    while True:
-        # Submit all the jobs
-        while xtv2dmx_commands:
-            
-            # Loop over all the passed arguments
-            task = xtv2dmx_commands.pop(0)
-            log_file = open(log_files_cp.pop(0), "at")
-            run_dirname = run_dirnames_cp.pop(0)
-            
-            # Create a process and collect them in a list
-            process = subprocess.Popen(task, 
-                                       stdout=log_file, 
-                                       stderr=log_file, 
-                                       cwd=run_dirname)
-            processes.append(process)
-            
-            # Make some description in the log file
-            log_file.write("###\n")
-            log_file.write("Executing: {}\n" 
-                .format(subprocess.list2cmdline(process.args)))
-            
-        # Loop over process and wait for them to finish
-        for process in processes:
-            try:
-                process.wait(timeout=8000)
-            except subprocess.TimeoutExpired:
-                process.kill()
-            
-            if done(process):
-                if not success(process):
-                    log_file.write("XTV2DMX Conversion failed")
-                    info_file.writelines("Execution Failed: {}\n"
-                        .format(subprocess.list2cmdline(process.args)))
-                else:
-                    info_file.writelines("Execution Successful: {}\n"
-                        .format(subprocess.list2cmdline(process.args)))
-
-                log_file.close()
-                processes.remove(process)
-    
-        if not processes:
-            break
+    with open(info_filename, "a") as info_file:
+        if returncode != 0:
+            with open(log_file, "at") as log:
+                log.write("XTV2DMX Conversion failed")
+            info_file.writelines("Execution Failed: {}\n" .format(cmd_str))
         else:
-            time.sleep(0.05)
-
-    # Close the appended exec.info file
-    info_file.close()
+            info_file.writelines("Execution Successful: {}\n"
+                                 .format(cmd_str))
     
 
 def make_commands(xtv2dmx_executable: str,
@@ -115,20 +89,18 @@ def make_commands(xtv2dmx_executable: str,
     
 def link_dmx(run_dmxs: list, scratch_dmxs: list):
     """Create a soft link between rundir dmx and scratchdir dmx
+
+    All the links are created in a single pass, an existing dmx in the
+    scratch is removed.
     
     :param run_dmxs: list of dmx fullname in the run directory
     :param scratch_dmxs: list of dmx fullname in the scratch directory
     :return: -
     """
-    import subprocess
-    import os
-    
-    for run_dmx, scratch_dmx in zip(run_dmxs, scratch_dmxs):
-        
-        # Delete file and link if they exist
-        if os.path.islink(run_dmx):
-            subprocess.call(["rm", "-f", run_dmx])
-        if os.path.isfile(scratch_dmx):
-            subprocess.call(["rm", "-f", scratch_dmx])
-        
-        subprocess.call(["ln", "-s", scratch_dmx, run_dmx])
+    from . import link
+
+    dangling = link.make(scratch_dmxs, run_dmxs, remove_targets=True)
+    if dangling:
+        for run_dmx in dangling:
+            print("{} is a dangling link!" .format(run_dmx))
+        raise ValueError("Some dmx link cannot be resolved!")
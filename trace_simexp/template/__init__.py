@@ -7,6 +7,7 @@
     keys ready to be substituted with actual values from rescaled design matrix
 """
 from . import tracin_comp
+from . import tracin_index
 from . import tracin_matprop
 from . import tracin_senscoef
 from . import tracin_spacer
@@ -10,28 +10,32 @@
 __author__ = "Damar Wicaksono"
 
 
-def get_nom_val(tracin_lines: list, param_dict: dict):
+def get_nom_val(tracin_lines: list, param_dict: dict,
+                deck_index: dict=None):
     r"""Get the nominal values of component parameters from tracin base file
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the comp parameter
     """
 
     # select the type of variable
     if param_dict["var_type"] == "scalar":
-        nom_val = read_scalar(tracin_lines, param_dict)
+        nom_val = read_scalar(tracin_lines, param_dict, deck_index)
     elif param_dict["var_type"] == "table":
-        nom_val = read_table(tracin_lines, param_dict)
+        nom_val = read_table(tracin_lines, param_dict, deck_index)
     elif param_dict["var_type"] == "array":
-        nom_val = read_array(tracin_lines, param_dict)
+        nom_val = read_array(tracin_lines, param_dict, deck_index)
     else:
         raise TypeError("Component parameter variable type not recognized!")
 
     return nom_val
 
 
-def read_scalar(tracin_lines: list, param_dict: dict):
+def read_scalar(tracin_lines: list, param_dict: dict,
+                deck_index: dict=None):
     r"""Get the nominal values of scalar-type component parameters
 
     Scalar-type component parameters are straightforward. Their location is
@@ -39,40 +43,45 @@ def read_scalar(tracin_lines: list, param_dict: dict):
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the comp parameter specified as scalar.
         Possible types - float and integer
     """
-    nom_val = None
+    from . import tracin_index
 
-    # loop over lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-        if tracin_line.startswith(param_dict["data_type"]):
-            # Check if the number corresponds to what specified
-            if str(param_dict["var_num"]) in tracin_line:
-                # "var_card" specify the line
-                offset = 2 * param_dict["var_card"] - 2
-                # "var_word" specify the element
-                word = param_dict["var_word"] - 1
-                # grab the nominal value
-                nom_val = tracin_lines[line_num+offset].split()[word]
-
-                # check what kind of numeric is nom_val
-                if "E" in nom_val or "e" in nom_val:
-                    # float in scientific notation
-                    nom_val = float(nom_val)
-                elif "." in nom_val:
-                    # float
-                    nom_val = float(nom_val)
-                else:
-                    # integer
-                    nom_val = int(nom_val)
+    nom_val = None
 
-                break
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the component is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        # "var_card" specify the line
+        offset = 2 * param_dict["var_card"] - 2
+        # "var_word" specify the element
+        word = param_dict["var_word"] - 1
+        # grab the nominal value
+        nom_val = tracin_lines[line_num+offset].split()[word]
+
+        # check what kind of numeric is nom_val
+        if "E" in nom_val or "e" in nom_val:
+            # float in scientific notation
+            nom_val = float(nom_val)
+        elif "." in nom_val:
+            # float
+            nom_val = float(nom_val)
+        else:
+            # integer
+            nom_val = int(nom_val)
 
     return nom_val
 
 
-def read_table(tracin_lines: list, param_dict: dict) -> list:
+def read_table(tracin_lines: list, param_dict: dict,
+               deck_index: dict=None) -> list:
     r"""Get the nominal values of tabular-type component parameters
 
     Tabular-type refers to the type that is a set of multiple values of
@@ -82,43 +91,48 @@ def read_table(tracin_lines: list, param_dict: dict) -> list:
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the comp parameter specified as table
     """
     import re
+    from . import tracin_index
 
     nom_val = []
 
-    # loop over lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-        if tracin_line.startswith(param_dict["data_type"]):
-            # Check if the number corresponds to what specified
-            if str(param_dict["var_num"]) in tracin_line:
-                offset = 0
-                while True:
-                    # loop to go the line where the parameter is 1st specified
-                    if param_dict["var_name"] in tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        pass
-                    offset += 1
-                while True:
-                    # loop to read all the available nominal values
-                    if param_dict["var_name"] not in \
-                            tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        # grab the line and take only numerical values
-                        vals = re.findall(r"\d+[\.]?\d*[Ee]?\d+",
-                                          tracin_lines[line_num+offset])
-                        # grab the value according to the "var_word"
-                        nom_val.append(float(vals[param_dict["var_card"]-1]))
-                    offset += 1
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the component is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        offset = 0
+        while True:
+            # loop to go the line where the parameter is 1st specified
+            if param_dict["var_name"] in tracin_lines[line_num+offset]:
                 break
+            else:
+                pass
+            offset += 1
+        while True:
+            # loop to read all the available nominal values
+            if param_dict["var_name"] not in \
+                    tracin_lines[line_num+offset]:
+                break
+            else:
+                # grab the line and take only numerical values
+                vals = re.findall(r"\d+[\.]?\d*[Ee]?\d+",
+                                  tracin_lines[line_num+offset])
+                # grab the value according to the "var_word"
+                nom_val.append(float(vals[param_dict["var_card"]-1]))
+            offset += 1
 
     return nom_val
 
 
-def read_array(tracin_lines: list, param_dict: dict) -> list:
+def read_array(tracin_lines: list, param_dict: dict,
+               deck_index: dict=None) -> list:
     r"""Get the nominal values of array-type component parameters
 
     Array time simply means that all values are of single type, not a set of
@@ -127,34 +141,40 @@ def read_array(tracin_lines: list, param_dict: dict) -> list:
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the comp parameter specified as array
     """
     # TODO: Complete read_array function()
     return []
 
 
-def put_key(tracin_lines: list, param_dict: dict) -> list:
+def put_key(tracin_lines: list, param_dict: dict,
+            deck_index: dict=None) -> list:
     r"""Replace the nominal value of component parameter with key
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :returns: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
     # select the type of variable
     if param_dict["var_type"] == "scalar":
-        tracin_lines = edit_scalar(tracin_lines, param_dict)
+        tracin_lines = edit_scalar(tracin_lines, param_dict, deck_index)
     elif param_dict["var_type"] == "table":
-        tracin_lines = edit_table(tracin_lines, param_dict)
+        tracin_lines = edit_table(tracin_lines, param_dict, deck_index)
     elif param_dict["var_type"] == "array":
-        tracin_lines = edit_array(tracin_lines, param_dict)
+        tracin_lines = edit_array(tracin_lines, param_dict, deck_index)
     else:
         raise TypeError("Component parameter variable type not recognized!")
 
     return tracin_lines
 
 
-def edit_scalar(tracin_lines: list, param_dict: dict) -> list:
+def edit_scalar(tracin_lines: list, param_dict: dict,
+                deck_index: dict=None) -> list:
     r"""Replace the nominal value of scalar-type component parameters with key
 
     Scalar-type component parameters are straightforward. Their location is
@@ -162,96 +182,104 @@ def edit_scalar(tracin_lines: list, param_dict: dict) -> list:
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter, scalar type
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
     from ..tracin_util import keygen
-
-    # loop over lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-        if tracin_line.startswith(param_dict["data_type"]):
-            # Check if the number corresponds to what specified
-            if str(param_dict["var_num"]) in tracin_line:
-                # "var_card" specify the line, grab the card
-                offset = 2 * param_dict["var_card"] - 2
-                card = tracin_lines[line_num+offset].split()
-                # "var_word" specify the element
-                word = param_dict["var_word"] - 1
-                # Replace the word in the card
-                card[word] = keygen.create(param_dict, 
-                                           template=True, 
-                                           index=None)
-                # concatenate the list of string to remake the card
-                card = "".join("%14s" % k for k in card)
-                # replace the input with modified card
-                tracin_lines[line_num+offset] = card
-
-                break
+    from . import tracin_index
+
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the component is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        # "var_card" specify the line, grab the card
+        offset = 2 * param_dict["var_card"] - 2
+        card = tracin_lines[line_num+offset].split()
+        # "var_word" specify the element
+        word = param_dict["var_word"] - 1
+        # Replace the word in the card
+        card[word] = keygen.create(param_dict, 
+                                   template=True, 
+                                   index=None)
+        # concatenate the list of string to remake the card
+        card = "".join("%14s" % k for k in card)
+        # replace the input with modified card
+        tracin_lines[line_num+offset] = card
 
     return tracin_lines
 
 
-def edit_table(tracin_lines: list, param_dict: dict) -> list:
+def edit_table(tracin_lines: list, param_dict: dict,
+               deck_index: dict=None) -> list:
     r"""Replace the nominal values of table-type component parameters with keys
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter, table type
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
     import re
     from ..tracin_util import keygen
-
-    # loop over lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-        if tracin_line.startswith(param_dict["data_type"]):
-            # Check if the number corresponds to what specified
-            if str(param_dict["var_num"]) in tracin_line:
-                i = 0   # table multiple values identifier
-                offset = 0
-                while True:
-                    # loop to go the line where the parameter is 1st specified
-                    if param_dict["var_name"] in tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        pass
-                    offset += 1
-                while True:
-                    # loop to replace all the available nominal values
-                    if param_dict["var_name"] not in \
-                            tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        # grab the comment in the line
-                        comment = re.findall(r"\*\s*\w*\s*\*",
-                                             tracin_lines[line_num+offset])[0]
-                        # grab the line and take only numerical values
-                        vals = re.findall(r"\d+[\.]?\d*[Ee]?\d+",
-                                          tracin_lines[line_num+offset])
-                        # grab the continuation character
-                        cont = re.findall(r".$",
-                                          tracin_lines[line_num+offset])[0]
-                        # Create key, enclosed because of the continuation char
-                        # three-value key due to enumeration of tabular values
-                        key = keygen.create(param_dict, template=True, index=i)
-                        # replace the value according to the "var_word" w/ key
-                        vals[param_dict["var_card"]-1] = key
-                        vals = "".join("%15s" % k for k in vals)
-
-                        # Replace the line with modified line
-                        tracin_lines[line_num+offset] = "{} {}{}" .format(
-                            comment, vals, cont
-                        )
-
-                    i += 1
-                    offset += 1
-
+    from . import tracin_index
+
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the component is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        i = 0   # table multiple values identifier
+        offset = 0
+        while True:
+            # loop to go the line where the parameter is 1st specified
+            if param_dict["var_name"] in tracin_lines[line_num+offset]:
+                break
+            else:
+                pass
+            offset += 1
+        while True:
+            # loop to replace all the available nominal values
+            if param_dict["var_name"] not in \
+                    tracin_lines[line_num+offset]:
                 break
+            else:
+                # grab the comment in the line
+                comment = re.findall(r"\*\s*\w*\s*\*",
+                                     tracin_lines[line_num+offset])[0]
+                # grab the line and take only numerical values
+                vals = re.findall(r"\d+[\.]?\d*[Ee]?\d+",
+                                  tracin_lines[line_num+offset])
+                # grab the continuation character
+                cont = re.findall(r".$",
+                                  tracin_lines[line_num+offset])[0]
+                # Create key, enclosed because of the continuation char
+                # three-value key due to enumeration of tabular values
+                key = keygen.create(param_dict, template=True, index=i)
+                # replace the value according to the "var_word" w/ key
+                vals[param_dict["var_card"]-1] = key
+                vals = "".join("%15s" % k for k in vals)
+
+                # Replace the line with modified line
+                tracin_lines[line_num+offset] = "{} {}{}" .format(
+                    comment, vals, cont
+                )
+
+            i += 1
+            offset += 1
 
     return tracin_lines
 
 
-def edit_array(tracin_lines: list, param_dict: dict) -> list:
+def edit_array(tracin_lines: list, param_dict: dict,
+               deck_index: dict=None) -> list:
     r"""Get the nominal values of array-type component parameters
 
     Array time simply means that all values are of single type, not a set of
@@ -260,6 +288,8 @@ def edit_array(tracin_lines: list, param_dict: dict) -> list:
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the comp parameter, array type
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
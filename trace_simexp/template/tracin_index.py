@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.template.tracin_index
+    **********************************
+
+    Module to index the base TRACE input deck in a single pass, mapping each
+    component, material property block, sensitivity coefficient, and spacer
+    grid to the line where it is defined. The parameters are then located in
+    the deck by a lookup instead of a scan of all lines for each of them.
+"""
+
+__author__ = "Damar Wicaksono"
+
+COMPONENTS = ["pipe", "vessel", "power", "fill", "break"]
+
+
+def create(tracin_lines: list) -> dict:
+    r"""Index the base TRACE input deck
+
+    Only the first definition of each entry is indexed, the later ones are
+    ignored as in a top-down search.
+
+    +----------+--------------------------------------------------------------+
+    | Key      | Value                                                        |
+    +==========+==============================================================+
+    | comp     | (dict) line number of the component card, keyed by a tuple  |
+    |          | of the component type and number, e.g., ("pipe", 30)         |
+    +----------+--------------------------------------------------------------+
+    | matprop  | (dict) line number of the "User Defined Material" comment,   |
+    |          | keyed by the material number                                 |
+    +----------+--------------------------------------------------------------+
+    | senscoef | (dict) line number of the first line beginning with a given  |
+    |          | word, keyed by that word (the sensitivity coefficient ID)    |
+    +----------+--------------------------------------------------------------+
+    | spacer   | (dict) line number of the "gridid" comment, keyed by the     |
+    |          | grid ID in the following line                                |
+    +----------+--------------------------------------------------------------+
+
+    :param tracin_lines: the base TRACE input deck
+    :return: the index as a dictionary of dictionaries
+    """
+    from .tracin_matprop import MATPROP_TRACIN_KEY
+
+    deck_index = {"comp": dict(), "matprop": dict(),
+                  "senscoef": dict(), "spacer": dict()}
+
+    for line_num, tracin_line in enumerate(tracin_lines):
+        words = tracin_line.split()
+        if not words:
+            continue
+
+        # The first word at the beginning of line (senscoef identifier)
+        deck_index["senscoef"].setdefault(words[0], line_num)
+
+        # The component card, "<type> <number> ..."
+        if words[0] in COMPONENTS and len(words) > 1 \
+                and tracin_line.startswith(words[0]):
+            number = to_int(words[1])
+            if number is not None:
+                deck_index["comp"].setdefault((words[0], number), line_num)
+
+        # The material property block, "*  User Defined Material : <number>"
+        elif MATPROP_TRACIN_KEY in tracin_line:
+            number = to_int(tracin_line.split(":")[-1].strip())
+            if number is not None:
+                deck_index["matprop"].setdefault(number, line_num)
+
+        # The spacer grid block, the grid ID is in the following line
+        elif "gridid" in tracin_line.lower() \
+                and line_num + 1 < len(tracin_lines):
+            next_words = tracin_lines[line_num+1].split()
+            number = to_int(next_words[0]) if next_words else None
+            if number is not None:
+                deck_index["spacer"].setdefault(number, line_num)
+
+    return deck_index
+
+
+def get_line(deck_index: dict, param_dict: dict):
+    r"""Look up the line where the block of a parameter is defined
+
+    :param deck_index: the index of the base TRACE input deck from create()
+    :param param_dict: specification of the parameter
+    :return: (int) the line number, None if it is not defined in the deck
+    """
+    data_type = param_dict["data_type"]
+
+    if data_type in COMPONENTS:
+        return deck_index["comp"].get((data_type, param_dict["var_num"]))
+    elif data_type == "matprop":
+        return deck_index["matprop"].get(param_dict["var_num"])
+    elif data_type == "senscoef":
+        return deck_index["senscoef"].get(str(param_dict["var_num"]))
+    elif data_type == "spacer":
+        return deck_index["spacer"].get(param_dict["var_num"])
+    else:
+        raise TypeError("Not a recognized data type")
+
+
+def to_int(word: str):
+    r"""Convert a word of the deck into an integer, if possible
+
+    :param word: the word
+    :return: (int) the integer value, None if the word is not an integer
+    """
+    try:
+        return int(word)
+    except ValueError:
+        return None
@@ -42,169 +42,190 @@ def get_col_num(param_dict: dict) -> int:
     return col_var
 
 
-def get_nom_val(tracin_lines: list, param_dict: dict) -> list:
+def get_nom_val(tracin_lines: list, param_dict: dict,
+                deck_index: dict=None) -> list:
     r"""Get the nominal value of material property parameter from tracin base
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the matprop parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the matprop parameter
     """
     nom_val = []
 
     if param_dict["var_type"] == "table":
-        nom_val = read_table(tracin_lines, param_dict)
+        nom_val = read_table(tracin_lines, param_dict, deck_index)
     elif param_dict["var_type"] == "fit":
-        nom_val = read_fit(tracin_lines, param_dict)
+        nom_val = read_fit(tracin_lines, param_dict, deck_index)
     else:
         raise TypeError("Not recognized material property type variable")
 
     return nom_val
 
 
-def read_table(tracin_lines: list, param_dict: dict) -> list:
+def read_table(tracin_lines: list, param_dict: dict,
+               deck_index: dict=None) -> list:
     r"""Get the nominal value of table-type material property parameter
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the matprop parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the matprop parameter specified as table
     """
+    from . import tracin_index
+
     nom_val = []
     
     # Grab the column number based on var_name
     col_num = get_col_num(param_dict)
 
-    # loop over tracin lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-        if MATPROP_TRACIN_KEY in tracin_line:
-            # match the keyword for material property specification block
-            if str(param_dict["var_num"]) in tracin_line:
-                # match the specified material number
-                offset = 0
-                while True:
-                    # loop to go to where the values defined
-                    if MATPROP_TABLE_KEY in tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        pass
-                    offset += 1
-                offset += 1     # one more line as the first prptb is a header
-                while True:
-                    # loop to get the values
-                    if MATPROP_TABLE_KEY not in tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        # Grab the specified parameter based on the "var_name"
-                        val = tracin_lines[line_num+offset].split()[col_num]
-                        if col_num != 6:
-                            # no continuation, not the last column
-                            nom_val.append(float(val))
-                        else:
-                            # last column has a continuation symbol, skip it
-                            nom_val.append(float(val[:-1]))
-                    offset += 1
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the material property block is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        offset = 0
+        while True:
+            # loop to go to where the values defined
+            if MATPROP_TABLE_KEY in tracin_lines[line_num+offset]:
+                break
+            else:
+                pass
+            offset += 1
+        offset += 1     # one more line as the first prptb is a header
+        while True:
+            # loop to get the values
+            if MATPROP_TABLE_KEY not in tracin_lines[line_num+offset]:
                 break
+            else:
+                # Grab the specified parameter based on the "var_name"
+                val = tracin_lines[line_num+offset].split()[col_num]
+                if col_num != 6:
+                    # no continuation, not the last column
+                    nom_val.append(float(val))
+                else:
+                    # last column has a continuation symbol, skip it
+                    nom_val.append(float(val[:-1]))
+            offset += 1
     return nom_val
 
 
-def read_fit(tracin_lines: list, param_dict: dict) -> list:
+def read_fit(tracin_lines: list, param_dict: dict,
+             deck_index: dict=None) -> list:
     r"""Get the nominal value of curve fit-type material property parameter
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the matprop parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal values of the matprop parameter specified as curve fit
     """
     # TODO: Complete the specification of parsing fit material type
     return []
 
 
-def put_key(tracin_lines: list, param_dict: dict) -> list:
+def put_key(tracin_lines: list, param_dict: dict,
+            deck_index: dict=None) -> list:
     r"""Replace the nominal value of matprop parameter with key
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the matprop parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
 
     if param_dict["var_type"] == "table":
-        tracin_lines = edit_table(tracin_lines, param_dict)
+        tracin_lines = edit_table(tracin_lines, param_dict, deck_index)
     elif param_dict["var_type"] == "fit":
-        tracin_lines = edit_fit(tracin_lines, param_dict)
+        tracin_lines = edit_fit(tracin_lines, param_dict, deck_index)
     else:
         raise TypeError("Not recognized material property type variable")
 
     return tracin_lines
 
 
-def edit_table(tracin_lines: list, param_dict: dict) -> list:
+def edit_table(tracin_lines: list, param_dict: dict,
+               deck_index: dict=None) -> list:
     r"""Replace the table type material property with key to be substituted
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the matprop parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
     from ..tracin_util import keygen
+    from . import tracin_index
 
     # Grab the column number based on var_name
     col_num = get_col_num(param_dict)
 
-    # loop over tracin lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-        if MATPROP_TRACIN_KEY in tracin_line:
-            # match the keyword for material property specification block
-            if str(param_dict["var_num"]) in tracin_line:
-                # match the specified material number
-                i = 0           # multiple values identifier in tabular format
-                offset = 0
-                while True:
-                    # loop to go to where the values defined
-                    if MATPROP_TABLE_KEY in tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        pass
-                    offset += 1
-                offset += 1     # one more line as the first prptb is a header
-                while True:
-                    # loop to get the values
-                    if MATPROP_TABLE_KEY not in tracin_lines[line_num+offset]:
-                        break
-                    else:
-                        # Grab the card and split the string
-                        cards = tracin_lines[line_num+offset]
-                        cont = cards[-1]     # the continuation character
-                        cards = cards.split()
-
-                        # Create key, enclosed because of the continuation char
-                        # three-value key due to enumeration of tabular values
-                        key = keygen.create(param_dict, template=True, index=i)
-                        # Replace the nominal value with key
-                        cards[col_num] = key
-                        # Replace the whole line with modified line with key                          
-                        if col_num != 6:
-                            # no continuation, not the last column
-                            tracin_lines[line_num+offset] = \
-                                "{} {}{:>14s}{:>15s}{:>15s}{:>15s}{:>15s}" \
-                                .format(*cards)
-                        else:
-                            # last column has a continuation symbol
-                            cards.append(cont)
-                            tracin_lines[line_num+offset] = \
-                                "{} {}{:>14s}{:>15s}{:>15s}{:>15s}{:>15s}{}" \
-                                .format(*cards)
-                    
-                    offset += 1
-                    i += 1
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the material property block is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        i = 0           # multiple values identifier in tabular format
+        offset = 0
+        while True:
+            # loop to go to where the values defined
+            if MATPROP_TABLE_KEY in tracin_lines[line_num+offset]:
+                break
+            else:
+                pass
+            offset += 1
+        offset += 1     # one more line as the first prptb is a header
+        while True:
+            # loop to get the values
+            if MATPROP_TABLE_KEY not in tracin_lines[line_num+offset]:
                 break
+            else:
+                # Grab the card and split the string
+                cards = tracin_lines[line_num+offset]
+                cont = cards[-1]     # the continuation character
+                cards = cards.split()
+
+                # Create key, enclosed because of the continuation char
+                # three-value key due to enumeration of tabular values
+                key = keygen.create(param_dict, template=True, index=i)
+                # Replace the nominal value with key
+                cards[col_num] = key
+                # Replace the whole line with modified line with key                          
+                if col_num != 6:
+                    # no continuation, not the last column
+                    tracin_lines[line_num+offset] = \
+                        "{} {}{:>14s}{:>15s}{:>15s}{:>15s}{:>15s}" \
+                        .format(*cards)
+                else:
+                    # last column has a continuation symbol
+                    cards.append(cont)
+                    tracin_lines[line_num+offset] = \
+                        "{} {}{:>14s}{:>15s}{:>15s}{:>15s}{:>15s}{}" \
+                        .format(*cards)
+
+            offset += 1
+            i += 1
 
     return tracin_lines
 
 
-def edit_fit(tracin_lines: list, param_dict: dict) -> list:
+def edit_fit(tracin_lines: list, param_dict: dict,
+             deck_index: dict=None) -> list:
     r"""Get the nominal values of curve fit-type matprop parameters
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the matprop parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :returns: the modified base TRACE input deck with key for the parameter
         as specified by param_dict
     """
@@ -10,57 +10,65 @@
 __author__ = "Damar Wicaksono"
 
 
-def get_nom_val(tracin_lines: list, param_dict: dict) -> float:
+def get_nom_val(tracin_lines: list, param_dict: dict,
+                deck_index: dict=None) -> float:
     r"""Get the nominal value of sensitivity coefficient from tracin base
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the senscoef parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the nominal value of the sensitivity coefficients
     """
+    from . import tracin_index
 
     nom_val = None
 
-    # loop over tracin lines
-    for line_num, tracin_line in enumerate(tracin_lines):
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
 
-        var_num = tracin_line.split()[0]        # safer to keep it as string
-        if var_num == str(param_dict["var_num"]):
-            # the sensitivity coefficient identifier is the beginning of line
-            nom_val = float(tracin_line.split()[2])
-            break
-        else:
-            continue
+    # Look up the line where the sensitivity coefficient is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        # the sensitivity coefficient identifier is the beginning of line
+        tracin_line = tracin_lines[line_num]
+        nom_val = float(tracin_line.split()[2])
 
     return nom_val
 
 
-def put_key(tracin_lines: list, param_dict: dict) -> list:
+def put_key(tracin_lines: list, param_dict: dict,
+            deck_index: dict=None) -> list:
     r"""Function to replace the nominal value of senscoef parameters with key
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the senscoef parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the base TRACE input deck with line(s) modified according to
         the senscoef parameter key
     """
     from ..tracin_util import keygen
+    from . import tracin_index
 
     word = 2    # the parameter values for senscoef is always at the 3rd values
     
-    # loop over tracin lines
-    for line_num, tracin_line in enumerate(tracin_lines):
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
 
-        var_num = tracin_line.split()[0]        # safer to keep it as string
-        if var_num == str(param_dict["var_num"]):
-            # the sensitivity coefficient identifier is the beginning of line
-            card = tracin_line.split()
-            # Create the key and replace the word in the card
-            card[word] = keygen.create(param_dict, template=True, index=None)
-            # Sensitivity coefficient always have 3 cards
-            card = "{:<8s}{:1s}{:>14s} " .format(card[0], card[1], card[2])
-            # replace the line in tracin with the modified line
-            tracin_lines[line_num] = card
-            break
-        else:
-            continue
+    # Look up the line where the sensitivity coefficient is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        # the sensitivity coefficient identifier is the beginning of line
+        tracin_line = tracin_lines[line_num]
+        card = tracin_line.split()
+        # Create the key and replace the word in the card
+        card[word] = keygen.create(param_dict, template=True, index=None)
+        # Sensitivity coefficient always have 3 cards
+        card = "{:<8s}{:1s}{:>14s} " .format(card[0], card[1], card[2])
+        # replace the line in tracin with the modified line
+        tracin_lines[line_num] = card
 
     return tracin_lines
@@ -10,36 +10,33 @@
 __author__ = "Damar Wicaksono"
 
 
-def get_nom_val(tracin_lines: list, param_dict: dict):
+def get_nom_val(tracin_lines: list, param_dict: dict,
+                deck_index: dict=None):
     r"""Get nominal value of spacer grid parameters from the tracin base
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of the spacer grid parameter
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: (float) for all spacer grid parameters except "spmatid",
         (int) spacer grid material choices "spmatid"
     """
-    import re
+    from . import tracin_index
 
     nom_val = None
 
-    # loop over lines
-    for line_num, tracin_line in enumerate(tracin_lines):
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
 
-        match = re.search(r"gridid", tracin_line, re.IGNORECASE)
-        if match:
-
-            gridid = int(tracin_lines[line_num+1].split()[0])
-            # Check if the gridid is the correct
-            if gridid == param_dict["var_num"]:
-
-                # "var_card" specifies the line
-                offset = 2 * param_dict["var_card"] - 1
-                # "var_word" specifies the element in a line
-                word = param_dict["var_word"] - 1
-                nom_val = tracin_lines[line_num+offset].split()[word]
-                break
-        else:
-            pass
+    # Look up the line where the spacer grid is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        # "var_card" specifies the line
+        offset = 2 * param_dict["var_card"] - 1
+        # "var_word" specifies the element in a line
+        word = param_dict["var_word"] - 1
+        nom_val = tracin_lines[line_num+offset].split()[word]
 
     # all except "spmatid" (integer) are float
     if param_dict["var_name"] == "spmatid":
@@ -48,7 +45,8 @@ def get_nom_val(tracin_lines: list, param_dict: dict):
         return float(nom_val)
 
 
-def put_key(tracin_lines: list, param_dict: dict) -> list:
+def put_key(tracin_lines: list, param_dict: dict,
+            deck_index: dict=None) -> list:
     r"""Function to replace the nominal value of grid parameters with key
 
     the key is used for templating purpose and will later be substituted with
@@ -56,36 +54,32 @@ def put_key(tracin_lines: list, param_dict: dict) -> list:
 
     :param tracin_lines: the base TRACE input deck
     :param param_dict: specification of spacer grid related parameters
+    :param deck_index: the index of the base TRACE input deck, see
+        tracin_index.create(). The deck is indexed if not given.
     :return: the base TRACE input deck with line(s) replaced with key according
         to the grid parameters specification
     """
-    import re
     from ..tracin_util import keygen
-
-    # loop over lines
-    for line_num, tracin_line in enumerate(tracin_lines):
-
-        match = re.search(r"gridid", tracin_line, re.IGNORECASE)
-        if match:
-
-            gridid = int(tracin_lines[line_num+1].split()[0])
-            # Check if the gridid is the correct
-            if gridid == param_dict["var_num"]:
-
-                # "var_card" specifies the line
-                offset = 2 * param_dict["var_card"] - 1
-                # "var_word" specifies the element in a line
-                word = param_dict["var_word"] - 1
-                # Replace the particular word with keys
-                card = tracin_lines[line_num+offset].split()
-                card[word] = keygen.create(param_dict, 
-                                           template=True, 
-                                           index=None)
-                card = "".join("%14s" % k for k in card)
-                # replace the line of tracin with the new one
-                tracin_lines[line_num+offset] = card
-                break
-        else:
-            pass
+    from . import tracin_index
+
+    # Index the deck only if no index is given
+    if deck_index is None:
+        deck_index = tracin_index.create(tracin_lines)
+
+    # Look up the line where the spacer grid is defined
+    line_num = tracin_index.get_line(deck_index, param_dict)
+    if line_num is not None:
+        # "var_card" specifies the line
+        offset = 2 * param_dict["var_card"] - 1
+        # "var_word" specifies the element in a line
+        word = param_dict["var_word"] - 1
+        # Replace the particular word with keys
+        card = tracin_lines[line_num+offset].split()
+        card[word] = keygen.create(param_dict, 
+                                   template=True, 
+                                   index=None)
+        card = "".join("%14s" % k for k in card)
+        # replace the line of tracin with the new one
+        tracin_lines[line_num+offset] = card
 
     return tracin_lines
@@ -17,38 +17,55 @@ COMPONENTS = ["pipe", "vessel", "power", "fill", "break"]
 def create(template_lines, params_dict, norm_pert_factors):
     r"""Function to create a trace input as string based on perturbed values
 
-    :param template_lines: (str.Template) the template based on base tracin
+    :param template_lines: (dict) the compiled template based on base tracin,
+        see create_template()
     :param params_dict: (list of dict) the list of parameters in a dictionary
     :param norm_pert_factors: (array) an array of normalized perturbed factor
     :return: (str) a tracin with template keys substituted with the actual
         perturbed model parameter values
     """
-    from .tracin_util import perturb
+    import numpy as np
 
     # A simple dimension checking
     if len(params_dict) != len(norm_pert_factors):
         raise ValueError(
             "The # of sampled values and # of parameters unequal!")
 
-    perturb_dict = dict()
+    tracin, = create_samples(template_lines, params_dict,
+                             np.atleast_2d(norm_pert_factors))
 
-    # Loop over all parameters in the list of dictionaries
-    for i, param in enumerate(params_dict):
+    return tracin
 
-        # Rescale the pert_factors according to the params_dict
-        rescaled_factor = perturb.rescale_perturb(param, norm_pert_factors[i])
 
-        # Perturbed the model parameters
-        perturb_param = perturb.perturb_param(param, rescaled_factor)
+def create_samples(template_lines, params_dict, norm_pert_factors):
+    r"""Generator of trace inputs as string for a set of samples
 
-        # Create dictionary with keys correspond to template lines & perturbed
-        # model parameter values
-        perturb_dict.update(perturb.create_dict(param, perturb_param))
+    The perturbation plan is compiled once and the perturbed values of all
+    samples are computed in a single vectorized pass per parameter. Each
+    input deck is then rendered by joining the literal chunks of the compiled
+    template with the values of the sample.
 
-    # replace the key in template with perturbed values
-    tracin = template_lines.substitute(perturb_dict)
+    :param template_lines: (dict) the compiled template based on base tracin,
+        see create_template()
+    :param params_dict: (list of dict) the list of parameters in a dictionary
+    :param norm_pert_factors: (array) the normalized perturbed factors, one
+        row per sample (e.g., the rows of the design matrix of the samples)
+    :return: an iterator of tracin (str), one per row of norm_pert_factors
+    """
+    from .tracin_util import plan
+    from .tracin_util import render
 
-    return tracin
+    # Compile the plan and compute the values of all samples at once
+    perturb_plan = plan.create(params_dict)
+    values = plan.evaluate(perturb_plan, norm_pert_factors)
+
+    # The position of the value of each key slot in the template
+    slots = render.get_slots(template_lines, plan.get_keys(perturb_plan))
+    parts = render.create_buffer(template_lines)
+
+    for row in values.tolist():
+        # replace the key in template with perturbed values
+        yield render.fill(template_lines, slots, row, parts)
 
 
 def get_nominal_values(tracin_lines: list, params_dict: list):
@@ -65,6 +82,10 @@ def get_nominal_values(tracin_lines: list, params_dict: list):
     from .template import tracin_senscoef
     from .template import tracin_matprop
     from .template import tracin_comp
+    from .template import tracin_index
+
+    # Index the deck once, the parameters are then looked up directly
+    deck_index = tracin_index.create(tracin_lines)
 
     # Loop over all parameters specified in params_dict
     for num, param in enumerate(params_dict):
@@ -72,25 +93,25 @@ def get_nominal_values(tracin_lines: list, params_dict: list):
         if param["data_type"] == "spacer":
             # spacer specified, look for it in the tracin
             params_dict[num]["nom_val"] = tracin_spacer.get_nom_val(
-                tracin_lines, param
+                tracin_lines, param, deck_index
             )
 
         elif param["data_type"] == "matprop":
             # material property specified, look for it in the tracin
             params_dict[num]["nom_val"] = tracin_matprop.get_nom_val(
-                    tracin_lines, param
+                    tracin_lines, param, deck_index
             )
 
         elif param["data_type"] == "senscoef":
             # sensitivity coefficient specified, look for it in the tracin
             params_dict[num]["nom_val"] = tracin_senscoef.get_nom_val(
-                tracin_lines, param
+                tracin_lines, param, deck_index
             )
 
         # component parameters specified, look for it in the tracin
         elif param["data_type"] in COMPONENTS:
             params_dict[num]["nom_val"] = tracin_comp.get_nom_val(
-                tracin_lines, param
+                tracin_lines, param, deck_index
             )
 
         else:
@@ -103,16 +124,24 @@ def create_template(params_dict: list, tracin_lines: list):
     The string contains `keys` to be substituted with values based on the
     design matrix.
 
+    The template is compiled once into the literal chunks between the keys,
+    see tracin_util.render.
+
     :param params_dict: (list) the list of parameters in the dictionary
     :param tracin_lines: (list) the contents of base case tracin file
-    :returns: (str template) the template of tracin in string format
+    :returns: (dict) the compiled template of tracin
     """
-    import string
+    from .tracin_util import render
 
     from .template import tracin_spacer
     from .template import tracin_senscoef
     from .template import tracin_comp
     from .template import tracin_matprop
+    from .template import tracin_index
+
+    # Index the deck once, the keys replace the values line by line so the
+    # line numbers of the index remain valid
+    deck_index = tracin_index.create(tracin_lines)
 
     tracin_tmp_lines = tracin_lines
     # Loop over all specified parameters and replace the base tracin with key
@@ -120,22 +149,26 @@ def create_template(params_dict: list, tracin_lines: list):
 
         if param["data_type"] == "spacer":
             # spacer specified, look for it in the tracin
-            tracin_tmp_lines = tracin_spacer.put_key(tracin_tmp_lines, param)
+            tracin_tmp_lines = tracin_spacer.put_key(tracin_tmp_lines, param,
+                                                     deck_index)
 
         elif param["data_type"] == "matprop":
             # material property specified, look for it in the tracin
-            tracin_tmp_lines = tracin_matprop.put_key(tracin_lines, param)
+            tracin_tmp_lines = tracin_matprop.put_key(tracin_lines, param,
+                                                      deck_index)
 
         if param["data_type"] == "senscoef":
             # spacer specified, look for it in the tracin
-            tracin_tmp_lines = tracin_senscoef.put_key(tracin_tmp_lines, param)
+            tracin_tmp_lines = tracin_senscoef.put_key(tracin_tmp_lines, param,
+                                                       deck_index)
 
         if param["data_type"] in COMPONENTS:
             # spacer specified, look for it in the tracin
-            tracin_tmp_lines = tracin_comp.put_key(tracin_tmp_lines, param)
+            tracin_tmp_lines = tracin_comp.put_key(tracin_tmp_lines, param,
+                                                   deck_index)
 
     # Join the list of strings again with newline
     tracin_tmp_lines = " \n".join(tracin_lines)
 
-    return string.Template(tracin_tmp_lines)
+    return render.create(tracin_tmp_lines)
 
@@ -8,6 +8,8 @@
 """
 from . import keygen
 from . import perturb
+from . import plan
+from . import render
 from . import rescale
 
 __author__ = "Damar Wicaksono"
@@ -9,7 +9,7 @@
 __author__ = "Damar Wicaksono"
 
 
-def rescale_perturb(param_dict: dict, norm_value: float):
+def rescale_perturb(param_dict: dict, norm_value):
     r"""Rescale the perturbation factor according to the specified distribution
 
     The perturbation factor is taken from a design matrix normalized between
@@ -17,8 +17,9 @@ def rescale_perturb(param_dict: dict, norm_value: float):
     specified in the dictionary.
 
     :param param_dict: the perturbed parameter specification
-    :param norm_value: the normalized [0,1] perturbation factor
-    :returns: the rescaled value of the perturbation factor
+    :param norm_value: the normalized [0,1] perturbation factor, either a
+        single value or an array (e.g., a column of the design matrix)
+    :returns: the rescaled value(s) of the perturbation factor
     """
     from . import rescale
 
@@ -52,53 +53,98 @@ def rescale_perturb(param_dict: dict, norm_value: float):
     return value
 
 
-def perturb_param(param_dict: dict, scaled_val) -> list:
-    r"""Perturb the model parameter according to the mode of perturbation
-
-    The function will perturb the nominal value of model parameter with the
-    scaled value of perturbation factor according to the specified mode of
-    variation. There are 3 available modes of perturbation:
-        1. `1`: Substitutive perturbation
-        2. `2`: Additive perturbation
-        3. `3`: Multiplicative perturbation
+def get_nom_vals(param_dict: dict):
+    r"""Get the nominal value(s) of the model parameter as a 1D array
 
     :param param_dict: the perturbed parameter specification
-    :param scaled_val: (float or int) the scaled perturbation factor
-    :returns: the perturbed parameter value written in formatted string
+    :returns: (array) the nominal value(s), a single one if scalar
     """
     import numpy as np
 
     # If the type is scalar, force it to be a 1D array
     if param_dict["var_type"] == "table":
-        nom_val = np.array(param_dict["nom_val"])
+        return np.array(param_dict["nom_val"])
     else:
-        nom_val = np.array([param_dict["nom_val"]])
+        return np.array([param_dict["nom_val"]])
+
+
+def perturb_params(param_dict: dict, scaled_vals, nom_val=None):
+    r"""Perturb the model parameter for all samples at once
+
+    Vectorized version of perturb_param(), the perturbed values of all samples
+    are computed and formatted in a single pass.
+
+    :param param_dict: the perturbed parameter specification
+    :param scaled_vals: (array) the scaled perturbation factors, one per sample
+    :param nom_val: (array) the nominal value(s) from get_nom_vals(), computed
+        if not given
+    :returns: (array of str) the formatted perturbed values, one row per sample
+        and one column per nominal value
+    """
+    import numpy as np
+
+    if nom_val is None:
+        nom_val = get_nom_vals(param_dict)
+    scaled_vals = np.asarray(scaled_vals).reshape(-1, 1)
 
     # Perturb the nominal value according to the mode of perturbation
     var_mode = param_dict["var_mode"]
     if var_mode == 1:
         # Mode 1 - Substitutive
-        pert_val = np.repeat(scaled_val, len(nom_val))
+        pert_val = np.repeat(scaled_vals, len(nom_val), axis=1)
 
     elif var_mode == 2:
         # Mode 2 - Additive
-        pert_val = nom_val + scaled_val
+        pert_val = nom_val[np.newaxis, :] + scaled_vals
 
     elif var_mode == 3:
         # Mode 3 - Multiplicative
-        pert_val = nom_val * scaled_val
+        pert_val = nom_val[np.newaxis, :] * scaled_vals
     else:
         raise ValueError(
             "Mode of variation is 1, 2, or 3, but {}!".format(var_mode))
 
-    str_output = []
-    # Write down the perturbed value
-    for i in range(len(pert_val)):
-        str_val = "%{}".format(param_dict["str_fmt"])
-        str_val = str_val % pert_val[i]
-        str_output.append(str_val)
+    # Write down the perturbed value, formatting Python scalars is faster
+    str_fmt = "%{}" .format(param_dict["str_fmt"])
+    return np.array([[str_fmt % val for val in row]
+                     for row in pert_val.tolist()],
+                    dtype=str).reshape(pert_val.shape)
+
+
+def perturb_param(param_dict: dict, scaled_val) -> list:
+    r"""Perturb the model parameter according to the mode of perturbation
+
+    The function will perturb the nominal value of model parameter with the
+    scaled value of perturbation factor according to the specified mode of
+    variation. There are 3 available modes of perturbation:
+        1. `1`: Substitutive perturbation
+        2. `2`: Additive perturbation
+        3. `3`: Multiplicative perturbation
+
+    :param param_dict: the perturbed parameter specification
+    :param scaled_val: (float or int) the scaled perturbation factor
+    :returns: the perturbed parameter value written in formatted string
+    """
+    return perturb_params(param_dict, [scaled_val])[0].tolist()
+
+
+def get_keys(param_dict: dict) -> list:
+    r"""Get the template keys of a parameter, in the order of its values
+
+    :param param_dict: the perturbed parameter specification
+    :returns: (list, str) the keys, as in create_dict()
+    """
+    from . import keygen
+
+    if param_dict["var_type"] == "scalar":
+        return [keygen.create(param_dict, template=False, index=None)]
+
+    elif param_dict["var_type"] == "table" or \
+            param_dict["var_type"] == "array":
+        return [keygen.create(param_dict, template=False, index=i)
+                for i in range(len(get_nom_vals(param_dict)))]
 
-    return str_output
+    return []
 
 
 def create_dict(param_dict: dict, perturbed_param) -> dict:
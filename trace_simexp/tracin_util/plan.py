@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.tracin_util.plan
+    *****************************
+
+    Module to compile the perturbation of all parameters into a plan, which
+    turns (a subset of) the design matrix into the perturbed values of all
+    template keys in a single vectorized pass per parameter
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def create(params_dict: list) -> list:
+    r"""Compile the perturbation plan of the parameters
+
+    Everything independent of the samples (the nominal values as arrays and
+    the template keys) is prepared once.
+
+    :param params_dict: (list of dict) the list of parameters in a dictionary
+    :returns: (list of dict) the plan, one entry per parameter with keys
+        "param", "nom_val", and "keys"
+    """
+    from . import perturb
+
+    plan = list()
+    for param in params_dict:
+        plan.append({
+            "param": param,
+            "nom_val": perturb.get_nom_vals(param),
+            "keys": perturb.get_keys(param)
+        })
+
+    return plan
+
+
+def get_keys(plan: list) -> list:
+    r"""Get all the template keys of a plan, in the order of evaluate() columns
+
+    :param plan: (list of dict) the plan from create()
+    :returns: (list, str) the template keys
+    """
+    keys = list()
+    for entry in plan:
+        keys.extend(entry["keys"])
+
+    return keys
+
+
+def evaluate(plan: list, norm_pert_factors):
+    r"""Rescale and perturb the parameters of all samples following the plan
+
+    :param plan: (list of dict) the plan from create()
+    :param norm_pert_factors: (array) the normalized perturbation factors, one
+        row per sample and one column per parameter (e.g., the rows of the
+        design matrix of the selected samples)
+    :returns: (array of str) the perturbed values, one row per sample and one
+        column per template key, see get_keys()
+    """
+    import numpy as np
+
+    from . import perturb
+
+    norm_pert_factors = np.atleast_2d(norm_pert_factors)
+
+    # A simple dimension checking
+    if norm_pert_factors.shape[1] != len(plan):
+        raise ValueError(
+            "The # of sampled values and # of parameters unequal!")
+
+    columns = list()
+    for i, entry in enumerate(plan):
+        if not entry["keys"]:
+            # No key in the template, nothing to substitute
+            continue
+
+        # Rescale the whole column according to the distribution
+        rescaled_factors = perturb.rescale_perturb(entry["param"],
+                                                   norm_pert_factors[:, i])
+
+        # Perturb the model parameters of all samples at once
+        columns.append(perturb.perturb_params(entry["param"],
+                                              rescaled_factors,
+                                              entry["nom_val"]))
+
+    if not columns:
+        return np.empty((norm_pert_factors.shape[0], 0), dtype=str)
+
+    return np.hstack(columns)
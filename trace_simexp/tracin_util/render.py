@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+    trace_simexp.tracin_util.render
+    *******************************
+
+    Module to precompile the tracin template into literal chunks and key slots
+    so that a perturbed input deck is rendered by a single join, without
+    searching the whole template text for keys again for every sample
+"""
+
+__author__ = "Damar Wicaksono"
+
+
+def create(template_text: str) -> dict:
+    r"""Compile a template text with "$key" or "${key}" placeholders
+
+    The placeholders follow the syntax of string.Template ("$$" is an escaped
+    "$"), the text is split once into the literal chunks between the keys.
+
+    :param template_text: the template text
+    :returns: (dict) the compiled template with keys "chunks", the literal
+        text around the slots (one more than the slots), and "keys", the key
+        of each slot in the order they appear
+    """
+    import string
+
+    chunks = list()
+    keys = list()
+    literal = list()
+    position = 0
+
+    for match in string.Template.pattern.finditer(template_text):
+        literal.append(template_text[position:match.start()])
+        position = match.end()
+
+        if match.group("escaped") is not None:
+            literal.append("$")
+        elif match.group("invalid") is not None:
+            line_num = template_text.count("\n", 0, match.start("invalid")) + 1
+            raise ValueError("Invalid placeholder in the template: line {}"
+                             .format(line_num))
+        else:
+            chunks.append("".join(literal))
+            literal = list()
+            keys.append(match.group("named") or match.group("braced"))
+
+    literal.append(template_text[position:])
+    chunks.append("".join(literal))
+
+    return {"chunks": chunks, "keys": keys}
+
+
+def get_slots(template: dict, keys: list) -> list:
+    r"""Get the position of the value of each slot in a row of values
+
+    :param template: (dict) the compiled template from create()
+    :param keys: (list, str) the keys, in the order of the values in a row
+    :returns: (list, int) for each slot, the position of its value in the row
+    """
+    positions = {key: i for i, key in enumerate(keys)}
+
+    try:
+        return [positions[key] for key in template["keys"]]
+    except KeyError as key:
+        raise KeyError("No value for the template key {}" .format(key))
+
+
+def create_buffer(template: dict) -> list:
+    r"""Create a buffer of parts to render the template, with the chunks set
+
+    :param template: (dict) the compiled template from create()
+    :returns: (list, str) the buffer, the chunks alternating with the slots
+    """
+    parts = [""] * (2 * len(template["chunks"]) - 1)
+    parts[0::2] = template["chunks"]
+
+    return parts
+
+
+def fill(template: dict, slots: list, values, parts: list=None) -> str:
+    r"""Render the template with the values of a single sample
+
+    :param template: (dict) the compiled template from create()
+    :param slots: (list, int) the position of the value of each slot in the
+        row, from get_slots()
+    :param values: (list of str) the values of a single sample, as a row
+    :param parts: (list, str) the buffer from create_buffer(), reused from one
+        sample to the next. Created if not given.
+    :returns: (str) the rendered text
+    """
+    if parts is None:
+        parts = create_buffer(template)
+    parts[1::2] = [values[i] for i in slots]
+
+    return "".join(parts)
+
+
+def substitute(template: dict, mapping: dict) -> str:
+    r"""Render the template with values given by key, like string.Template
+
+    :param template: (dict) the compiled template from create()
+    :param mapping: (dict) the value (str) of each key
+    :returns: (str) the rendered text
+    """
+    keys = list(mapping.keys())
+
+    return fill(template, get_slots(template, keys),
+                [mapping[key] for key in keys])
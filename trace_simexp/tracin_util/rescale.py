@@ -11,101 +11,118 @@
 __author__ = "Damar Wicaksono"
 
 
-def uniform(quantile: float, min_val: float, max_val: float) -> float:
+def check_quantile(quantile):
+    """Check that the quantile(s) lie in [0, 1]
+
+    :param quantile: the sample(s) taken from uniform distribution [0,1],
+        either a single value or an array
+    :return: the quantile(s) as a numpy array
+    """
+    import numpy as np
+
+    quantile = np.asarray(quantile, dtype=float)
+
+    invalid = (quantile > 1.0) | (quantile < 0.0)
+    if np.any(invalid):
+        raise ValueError("{} is not a valid [0, 1] quantile"
+                         .format(quantile[invalid].flat[0]))
+
+    return quantile
+
+
+def uniform(quantile, min_val: float, max_val: float):
     """Rescale uniform random number into a uniform dist. of a given support
 
     Rescale the uniformly sampled value [0,1] into a value taken of a
     uniform distribution with support of [min_val, max_val].
 
-    :param quantile: the sample taken from uniform distribution [0,1]
+    :param quantile: the sample taken from uniform distribution [0,1], either
+        a single value or an array (e.g., a column of the design matrix)
     :param min_val: the minimum value of the uniform distribution
     :param max_val: the maximum value of the uniform distribution
-    :return: the rescaled value in the specified uniform distribution
+    :return: the rescaled value(s) in the specified uniform distribution, of
+        the same shape as the quantile
     """
-    if quantile > 1.0:
-        raise ValueError("{} is not a valid [0, 1] quantile" .format(quantile))
-    if quantile < 0.0:
-        raise ValueError("{} is not a valid [0, 1] quantile" .format(quantile))
+    quantile = check_quantile(quantile)
     if min_val >= max_val:
         raise ValueError("min value is greater than or the same as the max")
     else:
         unif = quantile * (max_val - min_val) + min_val
 
-    return unif
+    return unif[()]
 
 
-def discrete(quantile: float, choices: dict):
+def discrete(quantile, choices: dict):
     r"""Make a random selection between choices based on their probabilities
 
-    :param quantile: the sample taken from uniform distribution [0,1]
+    :param quantile: the sample taken from uniform distribution [0,1], either
+        a single value or an array (e.g., a column of the design matrix)
     :param choices: the choices (key) and their probability (value)
-    :return: the choice picked based on the sampled quantile
+    :return: the choice(s) picked based on the sampled quantile(s), None for
+        a quantile above the total probability of the choices
     """
     import numpy as np
 
-    choice = None
-
-    if quantile > 1.0:
-        raise ValueError("{} is not a valid [0, 1] quantile" .format(quantile))
-    elif quantile < 0.0:
-        raise ValueError("{} is not a valid [0, 1] quantile" .format(quantile))
-    elif not isinstance(choices, dict):
+    quantile = check_quantile(quantile)
+    if not isinstance(choices, dict):
         raise ValueError("{} is not a valid dict of choices" .format(choices))
-    else:
-        # Convert everything to lists and create cumulative sum of probability
-        keys_list = []
-        vals_list = []
-        vals_cum = 0.0
-        for key, val in choices.items():
-            vals_cum += val
-            vals_list.append(vals_cum)
-            keys_list.append(key)
-
-        # Sort the values and the keys accordingly
-        keys_array = np.array(keys_list)
-        vals_array = np.array(vals_list)
-        keys_array = keys_array[vals_array.argsort()]
-        vals_array.sort()   # ascending order
-
-        # Make selection of the choices based on the sampled quantile value
-        for i, val in enumerate(vals_array):
-            if quantile <= val:
-                choice = keys_array[i]
-                break
-
-    return choice
-
-
-def loguniform(quantile: float, min_val: float, max_val: float) -> float:
+
+    # Convert everything to lists and create cumulative sum of probability
+    keys_list = []
+    vals_list = []
+    vals_cum = 0.0
+    for key, val in choices.items():
+        vals_cum += val
+        vals_list.append(vals_cum)
+        keys_list.append(key)
+
+    # Sort the values and the keys accordingly
+    keys_array = np.array(keys_list)
+    vals_array = np.array(vals_list)
+    keys_array = keys_array[vals_array.argsort()]
+    vals_array.sort()   # ascending order
+
+    # Select the first choice of which the cumulative probability is not
+    # exceeded by the sampled quantile value
+    index = np.searchsorted(vals_array, quantile, side="left")
+    beyond = index == len(vals_array)
+    choice = keys_array[np.minimum(index, len(vals_array) - 1)]
+    if np.any(beyond):
+        choice = np.where(beyond, None, choice.astype(object))
+
+    return choice[()]
+
+
+def loguniform(quantile, min_val: float, max_val: float):
     """Rescale uniform random number into a value from a log-uniform dist.
 
     Rescale the uniformly sampled value [0,1] into a value taken of a
     log-uniform distribution with support of [min_val, max_val].
 
-    :param quantile: the sample taken from uniform distribution [0,1]
+    :param quantile: the sample taken from uniform distribution [0,1], either
+        a single value or an array (e.g., a column of the design matrix)
     :param min_val: the minimum value of this log-uniform distribution
     :param max_val: the maximum value of this log-uniform distribution
-    :return: the rescaled value in the specified log-uniform distribution
+    :return: the rescaled value(s) in the specified log-uniform distribution,
+        of the same shape as the quantile
     """
-    from math import log, e
+    import numpy as np
+    from math import log
 
-    if quantile > 1.0:
-        raise ValueError("{} is not a valid [0, 1] quantile" .format(quantile))
-    elif quantile < 0.0:
-        raise ValueError("{} is not a valid [0, 1] quantile" .format(quantile))
-    elif min_val >= max_val:
+    quantile = check_quantile(quantile)
+    if min_val >= max_val:
         raise ValueError("min value is greater than or the same as the max")
     elif min_val < 0 or max_val < 0:
         raise ValueError("the support of log-unif has to be positive")
     else:
         logunif = quantile * (log(max_val) - log(min_val)) + log(min_val)
-        logunif = e**logunif
+        logunif = np.exp(logunif)
 
-    return logunif
+    return logunif[()]
 
 
-def normal(quantile: float, mu: float=0, sigma: float=1,
-           truncations_level: float=0) -> float:
+def normal(quantile, mu: float=0, sigma: float=1,
+           truncations_level: float=0):
     """Rescale uniform random number into a value from a normal distribution
 
     Rescale the uniformly sampled value [0,1] into a value taken from a
@@ -120,15 +137,19 @@ def normal(quantile: float, mu: float=0, sigma: float=1,
     each side. This is useful for the case of which the value at the design
     matrix include exactly 0.0 and 1.0
 
-    :param quantile: the sample taken from uniform distribution [0,1]
+    :param quantile: the sample taken from uniform distribution [0,1], either
+        a single value or an array (e.g., a column of the design matrix)
     :param mu: the mean of the normal distribution
     :param sigma: the standard deviation of the normal distribution
     :param truncations_level: the symmetric truncation level at both ends
-    :return: the rescaled value in the specified normal distribution
+    :return: the rescaled value(s) in the specified normal distribution, of
+        the same shape as the quantile
     """
+    import numpy as np
     import scipy.special
     from math import sqrt
 
+    quantile = np.asarray(quantile, dtype=float)
     if sigma < 0.:
         raise ValueError("Sigma has to be positive")
     elif truncations_level >= 100:
@@ -143,4 +164,4 @@ def normal(quantile: float, mu: float=0, sigma: float=1,
                                (100 - truncations_level/2)/100.0)
             norm = mu + sigma*sqrt(2) * scipy.special.erfinv(2 * quantile - 1)
 
-    return norm
+    return np.asarray(norm)[()]
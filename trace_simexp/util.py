@@ -5,35 +5,12 @@
 
     Module with utility functions to support the whole trace_simexp package
 """
-import itertools
 import subprocess
 import numpy as np
 
 __author__ = "Damar Wicaksono"
 
 
-def create_iter(num_samples: int, num_processors: int):
-    """Create a list of iterator in batch size.
-
-    The batch size is depending on the number of processors.
-    Batch runs are required to maximize processor occupancy
-
-    **References:**
-    Taken from
-    http://code.activestate.com/recipes/303279-getting-items-in-batches/
-
-    :param num_samples: (int) number of samples to be run
-    :param num_processors: (int) number of available processors, the size
-        of batch
-    :returns: (iterator) an iterator in batch size
-    """
-    iterable = range(0, num_samples)
-    source_iter = iter(iterable)
-    while True:
-        batch_iter = itertools.islice(source_iter, num_processors)
-        yield itertools.chain([next(batch_iter)], batch_iter)
-
-
 def make_dirnames(list_iter: list,
                   dict_inputs: dict,
                   scratch_flag: bool=False) -> list:
@@ -138,7 +115,8 @@ def parse_csv(csv_file) -> np.ndarray:
     """Parse a csv file, sniff the actual delimiter of the file
 
     This is used to load a generic csv file without specifying the actual
-    delimiter
+    delimiter. The file is read in chunks of rows, see
+    design_matrix.iter_csv().
 
     **References:**
     stackoverflow.com/questions/16312104/python-import-csv-file-delimiter-or
@@ -146,17 +124,9 @@ def parse_csv(csv_file) -> np.ndarray:
     :param csv_file: the file of the csv file in string
     :return: a numpy array
     """
-    import re
-    
-    output = list()
+    from . import design_matrix
 
-    lines = csv_file.readlines()
-    for line in lines:
-        output.append(re.split("\t|,| |;", line))
-
-    output = np.array(output).astype(np.float)
-    
-    return output
+    return design_matrix.parse_csv(csv_file)
 
 
 def cmd_exists(cmd: str) -> bool:
@@ -199,8 +169,8 @@ def link_exec(executable: str, directory: str):
     abs_exec = os.path.abspath(executable)
     abs_dir = os.path.abspath(directory)
 
-    # Create symbolic link
-    subprocess.call(["ln", "-s", abs_exec, abs_dir])
+    # Create symbolic link, named after the executable
+    os.symlink(abs_exec, os.path.join(abs_dir, os.path.basename(abs_exec)))
 
 
 def get_name(name: str, incl_ext: bool=False) -> str: